@@ -1,23 +1,58 @@
 """AI module for LangGraph-based interaction processing"""
 from app.ai.agent import get_agent, HCPInteractionAgent
+from app.ai.checkpointer import get_checkpointer, SqlCheckpointSaver
+from app.ai.compliance import get_compliance_engine, ComplianceEngine
+from app.ai.fast_path import get_fast_path_extractor, FastPathExtractor
+from app.ai.json_stream import IncrementalJSONParser, MalformedLLMOutput, parse_llm_json
+from app.ai.llm_cache import get_llm_cache, LLMResponseCache
+from app.ai.scheduler import get_groq_scheduler, GroqScheduler
+from app.ai.hcp_index import get_hcp_index, HcpNameIndex, normalize_hcp_name
 from app.ai.tools import (
     LogInteractionTool,
     EditInteractionTool,
     HcpLookupTool,
     ComplianceCheckTool,
     NextBestActionTool,
+    ToolRegistry,
     execute_tool,
-    get_all_tools
+    get_all_tools,
+    get_tool_registry,
+    register_tool
 )
+from app.ai.tracing import get_tracer, register_exporter, OTLPJsonFileExporter, SpanExporter, Tracer
 
 __all__ = [
     "get_agent",
     "HCPInteractionAgent",
+    "get_checkpointer",
+    "SqlCheckpointSaver",
+    "get_compliance_engine",
+    "ComplianceEngine",
+    "get_fast_path_extractor",
+    "FastPathExtractor",
+    "IncrementalJSONParser",
+    "MalformedLLMOutput",
+    "parse_llm_json",
+    "get_llm_cache",
+    "LLMResponseCache",
+    "get_groq_scheduler",
+    "GroqScheduler",
+    "get_hcp_index",
+    "HcpNameIndex",
+    "normalize_hcp_name",
     "LogInteractionTool",
     "EditInteractionTool",
     "HcpLookupTool",
     "ComplianceCheckTool",
     "NextBestActionTool",
+    "ToolRegistry",
     "execute_tool",
-    "get_all_tools"
+    "get_all_tools",
+    "get_tool_registry",
+    "register_tool",
+    "get_tracer",
+    "register_exporter",
+    "OTLPJsonFileExporter",
+    "SpanExporter",
+    "Tracer"
 ]
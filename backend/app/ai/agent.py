@@ -3,21 +3,29 @@ LangGraph Agent for AI-Powered HCP Interaction Processing
 Orchestrates conversation flow, calls LLM, invokes tools, and manages state
 """
 
+import asyncio
 import json
-from typing import Dict, Any, Annotated, TypedDict, Optional
-from langchain_groq import ChatGroq
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, ToolMessage
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from typing import Dict, Any, Annotated, AsyncIterator, Iterator, List, Tuple, TypedDict, Optional
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, RemoveMessage, ToolMessage
+from langchain_core.callbacks.manager import adispatch_custom_event, dispatch_custom_event
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langgraph.graph import StateGraph, END
+from langgraph.graph.message import add_messages
 import os
 
-from app.ai.tools import (
-    LogInteractionTool,
-    EditInteractionTool,
-    HcpLookupTool,
-    ComplianceCheckTool,
-    NextBestActionTool,
-    execute_tool
-)
+from app.ai.checkpointer import get_checkpointer
+from app.ai.fast_path import get_fast_path_extractor
+from app.ai.json_stream import IncrementalJSONParser, parse_llm_json
+from app.ai.llm_cache import get_llm_cache, make_cache_key
+from app.ai.llm_provider import LLMSettings, create_chat_model
+from app.ai.scheduler import estimate_tokens, get_groq_scheduler
+from app.ai.tools import get_tool_registry, get_tool_timeout, tool_rejected_result, tool_timeout_result
+from app.ai.tracing import Span, get_tracer, set_span_attributes, traced_node
+from app.metrics import observe_llm_call
 
 
 # ============================================================================
@@ -26,11 +34,117 @@ from app.ai.tools import (
 
 class AgentState(TypedDict):
     """LangGraph agent state - maintained across all nodes"""
-    messages: Annotated[list[BaseMessage], lambda x, y: x + y]
+    # Merged by message ID, so nodes may return the full list; RemoveMessage trims
+    messages: Annotated[list[BaseMessage], add_messages]
     conversation_history: list[Dict[str, str]]
     extracted_interaction: Optional[Dict[str, Any]]
     tool_calls: list[Dict[str, Any]]
     final_result: Optional[Dict[str, Any]]
+    extraction: Optional[Dict[str, Any]]
+    prefetched_tools: list[Dict[str, Any]]
+
+
+# Graph nodes, in execution order
+NODE_NAMES = ("receive_input", "process_with_llm", "invoke_tools", "generate_response")
+
+# Session history kept across turns, in estimated tokens; oldest turns are dropped beyond it
+HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "2000"))
+
+# Providers whose API accepts response_format={"type": "json_object"}
+JSON_MODE_PROVIDERS = ("groq",)
+
+# Typical completion size, used with the prompt size to reserve tokens-per-minute quota
+EXPECTED_COMPLETION_TOKENS = 400
+
+class ToolPoolFull(RuntimeError):
+    """Raised by BoundedExecutor.submit when its backlog is at the limit"""
+
+
+class BoundedExecutor(Executor):
+    """
+    Thread pool that refuses work beyond a backlog limit
+    
+    A tool abandoned after its timeout keeps its thread until it returns, so
+    without a limit a few stuck tools would queue every later call behind
+    them. submit() raises ToolPoolFull once max_workers + max_queue calls are
+    unfinished. Running and queued calls are counted here, in submit and the
+    future's callbacks, rather than read from the pool's internals.
+    """
+    
+    def __init__(self, max_workers: int, max_queue: int, thread_name_prefix: str = ""):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._unfinished = 0  # submitted and not yet done (running or queued)
+        self._running = 0
+        self.rejected = 0
+    
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._unfinished >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ToolPoolFull(f"Tool pool busy ({self._unfinished} calls unfinished)")
+            self._unfinished += 1
+        try:
+            future = self._executor.submit(self._run, fn, args, kwargs)
+        except BaseException:
+            with self._lock:
+                self._unfinished -= 1
+            raise
+        # Also fires for calls cancelled before they started
+        future.add_done_callback(self._finished)
+        return future
+    
+    def _run(self, fn, args, kwargs):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+    
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._unfinished -= 1
+    
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+    
+    def stats(self) -> Dict[str, int]:
+        """Running/queued calls, limits and rejections"""
+        with self._lock:
+            return {
+                "running": self._running,
+                "queued": self._unfinished - self._running,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "rejected": self.rejected,
+            }
+
+
+# Shared pool for running tool calls concurrently
+_tool_executor = BoundedExecutor(
+    max_workers=int(os.getenv("TOOL_MAX_WORKERS", "8")),
+    max_queue=int(os.getenv("TOOL_MAX_QUEUE", "32")),
+    thread_name_prefix="hcp-tool"
+)
+
+
+async def _cancel_tasks(tasks) -> None:
+    """Cancel tasks and wait until they have finished"""
+    tasks = list(tasks)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _end_tool_span(span: Span, result: Any) -> None:
+    """Finish a tool span, marking error, timeout and rejected results as failed"""
+    status = result.get("status") if isinstance(result, dict) else None
+    span.set_attributes(**{"tool.status": status})
+    span.end(error=result.get("message") if status in ("error", "timeout", "rejected") else None)
 
 
 # ============================================================================
@@ -40,66 +154,123 @@ class AgentState(TypedDict):
 class HCPInteractionAgent:
     """
     LangGraph-based agent for processing HCP interactions
-    Uses Groq LLM (gemma2-9b-it) to understand conversation and invoke tools
+    Uses the configured LLM provider (Groq by default) to understand conversation and invoke tools
     """
     
-    def __init__(self, groq_api_key: Optional[str] = None):
+    def __init__(self, groq_api_key: Optional[str] = None, settings: Optional[LLMSettings] = None):
         """
         Initialize the agent
         
         Args:
             groq_api_key: Groq API key (uses env variable if not provided)
+            settings: LLM provider settings (read from LLM_* env variables if not provided)
         """
-        self.groq_api_key = groq_api_key or os.getenv("GROQ_API_KEY")
+        settings = settings or LLMSettings(api_key=groq_api_key)
+        self.groq_api_key = settings.api_key
+        self.provider = settings.provider
         
-        if not self.groq_api_key:
-            raise ValueError("GROQ_API_KEY environment variable not set")
+        # Chat model for the configured provider (Groq llama-3.3-70b-versatile by default)
+        self.model_name = settings.model
+        self.llm = create_chat_model(settings)
         
-        # Initialize Groq LLM with llama-3.3-70b-versatile
-        self.llm = ChatGroq(
-            model="llama-3.3-70b-versatile",
-            temperature=0.1,  # Low temperature for structured output
-            groq_api_key=self.groq_api_key,
-            max_tokens=2048
-        )
+        # Shared tool registry (validated dispatch + per-tool metrics)
+        self.tools = get_tool_registry()
         
-        # Initialize tools
-        self.tools = {
-            "log_interaction": LogInteractionTool(),
-            "edit_interaction": EditInteractionTool(),
-            "hcp_lookup": HcpLookupTool(),
-            "compliance_check": ComplianceCheckTool(),
-            "next_best_action": NextBestActionTool(),
-        }
+        # Completions are cached by model + prompt + normalized message content
+        self.cache = get_llm_cache()
         
-        # Build LangGraph
+        # Well-formed notes are extracted by rules and skip the LLM
+        self.fast_path = get_fast_path_extractor()
+        
+        # Build LangGraph: stateless for one-shot calls, checkpointed for chat sessions
         self.graph = self._build_graph()
+        self.session_graph = self._build_graph(get_checkpointer())
     
-    def _build_graph(self):
+    def _build_graph(self, checkpointer=None):
         """Build LangGraph workflow"""
         workflow = StateGraph(AgentState)
         
-        # Define nodes
-        workflow.add_node("receive_input", self._receive_input)
-        workflow.add_node("process_with_llm", self._process_with_llm)
-        workflow.add_node("invoke_tools", self._invoke_tools)
-        workflow.add_node("generate_response", self._generate_response)
+        # Define nodes (each runs in a tracing span named after it)
+        workflow.add_node("receive_input", traced_node("receive_input", self._receive_input))
+        workflow.add_node(
+            "process_with_llm",
+            RunnableLambda(
+                traced_node("process_with_llm", self._process_with_llm),
+                afunc=traced_node("process_with_llm", self._aprocess_with_llm)
+            )
+        )
+        workflow.add_node(
+            "invoke_tools",
+            RunnableLambda(
+                traced_node("invoke_tools", self._invoke_tools),
+                afunc=traced_node("invoke_tools", self._ainvoke_tools)
+            )
+        )
+        workflow.add_node("generate_response", traced_node("generate_response", self._generate_response))
         
         # Define edges
         workflow.set_entry_point("receive_input")
-        workflow.add_edge("receive_input", "process_with_llm")
+        workflow.add_conditional_edges(
+            "receive_input",
+            self._route_after_input,
+            {"invoke_tools": "invoke_tools", "process_with_llm": "process_with_llm"}
+        )
         workflow.add_edge("process_with_llm", "invoke_tools")
         workflow.add_edge("invoke_tools", "generate_response")
         workflow.add_edge("generate_response", END)
         
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
     
     def _receive_input(self, state: AgentState) -> AgentState:
         """
         NODE 1: Receive and validate user input
+        
+        Drops the oldest session turns once history exceeds the token budget,
+        then tries the rule-based fast path; a confident extraction is
+        recorded in state along with the tools to call, and the LLM is skipped.
         """
         # Input is already in messages
-        return state
+        trimmed = self._trim_history(state["messages"])
+        
+        accepted = self.fast_path.accept(str(state["messages"][-1].content))
+        if accepted is None:
+            return {**state, "messages": trimmed} if trimmed else state
+        
+        reply = {
+            "understanding": "Extracted by rules",
+            "extracted_data": accepted["extracted_data"],
+            "tools_to_call": accepted["tools_to_call"]
+        }
+        return {
+            **state,
+            "messages": trimmed + [AIMessage(content=json.dumps(reply))],
+            "extracted_interaction": accepted["extracted_data"],
+            "tool_calls": accepted["tools_to_call"],
+            "extraction": {"source": "rules", "confidence": accepted["confidence"]}
+        }
+    
+    def _trim_history(self, messages: List[BaseMessage]) -> List[RemoveMessage]:
+        """
+        Removals for the oldest whole turns (a human message and everything
+        after it up to the next one) until history fits HISTORY_TOKEN_BUDGET.
+        The current turn is always kept.
+        """
+        sizes = [estimate_tokens(str(message.content)) for message in messages]
+        total = sum(sizes)
+        turn_starts = [i for i, message in enumerate(messages) if isinstance(message, HumanMessage)]
+        
+        cut = 0
+        for next_start in turn_starts[1:]:
+            if total <= HISTORY_TOKEN_BUDGET:
+                break
+            total -= sum(sizes[cut:next_start])
+            cut = next_start
+        return [RemoveMessage(id=message.id) for message in messages[:cut]]
+    
+    def _route_after_input(self, state: AgentState) -> str:
+        """Skip the LLM when the fast path already extracted the interaction"""
+        extraction = state.get("extraction") or {}
+        return "invoke_tools" if extraction.get("source") == "rules" else "process_with_llm"
     
     def _process_with_llm(self, state: AgentState) -> AgentState:
         """
@@ -111,8 +282,133 @@ class HCPInteractionAgent:
         3. Decide which tools to call
         4. Return tool calls and structured data
         """
-        messages = state["messages"]
+        messages = self._llm_messages(state)
+        cache_key = make_cache_key(self.model_name, messages)
+        
+        cached = self.cache.get(cache_key)
+        set_span_attributes(**{"llm.cache_hit": cached is not None})
+        if cached is not None:
+            return self._apply_llm_response(state, AIMessage(content=cached))
         
+        # Blocking call: ask for JSON mode where the provider supports it
+        llm = self.llm
+        if self.provider in JSON_MODE_PROVIDERS:
+            llm = llm.bind(response_format={"type": "json_object"})
+        with self._llm_span() as span:
+            started = time.perf_counter()
+            try:
+                response = llm.invoke(messages)
+            except Exception:
+                observe_llm_call(self.provider, self.model_name, started, error=True)
+                raise
+            observe_llm_call(self.provider, self.model_name, started, response)
+            self._record_usage(span, response)
+        return self._apply_llm_response(state, response, cache_key=cache_key)
+    
+    async def _aprocess_with_llm(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        """
+        NODE 2 (async): stream the completion through the incremental parser
+        
+        Each extracted_data field and tools_to_call entry is reported as soon
+        as it closes in the token stream, and tools start running right away,
+        overlapping with the rest of the generation. invoke_tools reuses the
+        results instead of running those calls again.
+        """
+        messages = self._llm_messages(state)
+        cache_key = make_cache_key(self.model_name, messages)
+        early_tools: Dict[int, asyncio.Task] = {}
+        
+        # Same JSON mode as the blocking call, where the provider supports it
+        llm = self.llm
+        if self.provider in JSON_MODE_PROVIDERS:
+            llm = llm.bind(response_format={"type": "json_object"})
+        
+        async def consume(
+            chunks: AsyncIterator[Any], started_tools: Dict[int, asyncio.Task]
+        ) -> Tuple[Any, IncrementalJSONParser]:
+            parser = IncrementalJSONParser()
+            response = None
+            async for chunk in chunks:
+                response = chunk if response is None else response + chunk
+                for kind, key, value in parser.feed(str(chunk.content)):
+                    if kind == "field":
+                        await adispatch_custom_event("extracted_field", {"field": key, "value": value}, config=config)
+                    elif isinstance(value, dict) and value.get("name"):
+                        started_tools[key] = asyncio.create_task(self._arun_tool(value, config))
+            return response, parser
+        
+        async def replay(text: str) -> AsyncIterator[AIMessage]:
+            yield AIMessage(content=text)
+        
+        async def call_llm() -> Tuple[Any, IncrementalJSONParser]:
+            # Timed per attempt, so scheduler queueing and retries are not counted as latency.
+            # Tools started by a failed attempt (e.g. a 429 mid-stream) are cancelled; a retry
+            # starts its own, so only the successful attempt's tools are reused.
+            nonlocal early_tools
+            attempt_tools: Dict[int, asyncio.Task] = {}
+            succeeded = False
+            try:
+                with self._llm_span() as span:
+                    started = time.perf_counter()
+                    try:
+                        result = await consume(llm.astream(messages), attempt_tools)
+                    except Exception:
+                        observe_llm_call(self.provider, self.model_name, started, error=True)
+                        raise
+                    observe_llm_call(self.provider, self.model_name, started, result[0])
+                    self._record_usage(span, result[0])
+                succeeded = True
+            finally:
+                if not succeeded:
+                    await _cancel_tasks(attempt_tools.values())
+            early_tools = attempt_tools
+            return result
+        
+        cached = self.cache.get(cache_key)
+        set_span_attributes(**{"llm.cache_hit": cached is not None})
+        if cached is not None:
+            response, parser = await consume(replay(cached), early_tools)
+        elif self.provider == "groq":
+            # Async calls share the Groq request/token quota through the scheduler
+            prompt_text = "".join(
+                message["content"] if isinstance(message, dict) else str(message.content)
+                for message in messages
+            )
+            response, parser = await get_groq_scheduler().run(
+                call_llm,
+                estimated_tokens=estimate_tokens(prompt_text) + EXPECTED_COMPLETION_TOKENS,
+                actual_tokens=lambda result: (getattr(result[0], "usage_metadata", None) or {}).get("total_tokens")
+            )
+        else:
+            response, parser = await call_llm()
+        
+        response = AIMessage(content=str(response.content) if response is not None else "")
+        
+        prefetched = []
+        for position, task in sorted(early_tools.items()):
+            prefetched.append({"position": position, **await task})
+        
+        return {
+            **self._apply_llm_response(state, response, parser, cache_key=None if cached is not None else cache_key),
+            "prefetched_tools": prefetched
+        }
+    
+    def _llm_span(self):
+        """Tracing span for one LLM request (each retry gets its own)"""
+        return get_tracer().span("llm.completion", **{"llm.provider": self.provider, "llm.model": self.model_name})
+    
+    @staticmethod
+    def _record_usage(span: Span, response: Any) -> None:
+        """Token counts on the LLM span, when the provider reports them"""
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            span.set_attributes(**{
+                "llm.prompt_tokens": usage.get("input_tokens"),
+                "llm.completion_tokens": usage.get("output_tokens")
+            })
+    
+    def _llm_messages(self, state: AgentState) -> list:
+        """Conversation messages plus the extraction system prompt"""
         # System prompt for the agent
         system_prompt = """You are an AI assistant for healthcare CRM interactions. 
 Your job is to:
@@ -135,38 +431,68 @@ When user describes an interaction, respond with:
     ]
 }"""
         
-        # Call LLM
-        response = self.llm.invoke(
-            messages + [{"role": "system", "content": system_prompt}]
-        )
+        # Tool results stay in state only; the model sees the human/assistant turns.
+        # The current draft carries context forward once older turns are trimmed.
+        history = [message for message in state["messages"] if isinstance(message, (HumanMessage, AIMessage))]
+        draft = state.get("extracted_interaction")
+        if draft:
+            system_prompt += (
+                "\n\nCurrent draft interaction (update it if the user corrects something):\n"
+                + json.dumps(draft)
+            )
+        
+        return history + [{"role": "system", "content": system_prompt}]
+    
+    def _apply_llm_response(
+        self,
+        state: AgentState,
+        response: BaseMessage,
+        parser: Optional[IncrementalJSONParser] = None,
+        cache_key: Optional[str] = None
+    ) -> AgentState:
+        """
+        Parse the LLM reply into extracted data and tool calls
+        
+        Malformed output is reported in extraction["error"] instead of
+        being dropped; whatever fields and tool calls closed before the
+        problem are still used. A fresh reply is stored under cache_key
+        only if it parsed cleanly, so a truncated or non-JSON completion
+        is asked for again rather than replayed for the cache TTL.
+        """
+        messages = state["messages"]
         
         # Update messages
         new_messages = messages + [response]
         
-        # Try to extract tool calls from LLM response
-        tool_calls = []
-        try:
-            content = response.content
-            # Simple parsing - in production, use structured output
-            if "{" in content:
-                json_str = content[content.find("{"):content.rfind("}")+1]
-                parsed = json.loads(json_str)
-                
-                if "extracted_data" in parsed:
-                    state["extracted_interaction"] = parsed["extracted_data"]
-                
-                if "tools_to_call" in parsed:
-                    tool_calls = parsed["tools_to_call"]
-        except:
-            pass
+        if parser is None:
+            parsed, error = parse_llm_json(str(response.content))
+        else:
+            parsed, error = parser.result()
+        
+        extracted = parsed.get("extracted_data")
+        if extracted:
+            state["extracted_interaction"] = extracted
+        
+        tool_calls = parsed.get("tools_to_call") or []
+        if not isinstance(tool_calls, list):
+            tool_calls = []
+            error = error or "tools_to_call is not a list"
+        
+        if cache_key is not None and not error and isinstance(parsed.get("tools_to_call"), list):
+            self.cache.set(cache_key, str(response.content))
+        
+        extraction = {"source": "llm", "confidence": None}
+        if error:
+            extraction["error"] = error
         
         return {
             **state,
             "messages": new_messages,
-            "tool_calls": tool_calls
+            "tool_calls": tool_calls,
+            "extraction": extraction
         }
     
-    def _invoke_tools(self, state: AgentState) -> AgentState:
+    def _invoke_tools(self, state: AgentState, config: RunnableConfig) -> AgentState:
         """
         NODE 3: Execute tools based on LLM recommendations
         
@@ -176,22 +502,112 @@ When user describes an interaction, respond with:
         - hcp_lookup: Search for existing HCPs
         - compliance_check: Validate compliance
         - next_best_action: Suggest follow-ups
+        
+        Independent tool calls run concurrently on a shared thread pool, each
+        with its own timeout (set at registration). A tool that overruns is
+        reported with status "timeout" instead of stalling the graph, and a
+        call the pool has no room for with status "rejected".
+        Results keep the order the LLM requested them in.
         """
         tool_calls = state.get("tool_calls", [])
-        tool_results = []
+        tool_results: List[Optional[Dict[str, Any]]] = [None] * len(tool_calls)
+        
+        for position, tool_result in self._run_tools_concurrently(tool_calls):
+            tool_results[position] = tool_result
+            
+            # Surface each result to streaming consumers as soon as it exists
+            dispatch_custom_event("tool_result", tool_result, config=config)
+        
+        return self._with_tool_results(state, tool_results)
+    
+    async def _ainvoke_tools(self, state: AgentState, config: RunnableConfig) -> AgentState:
+        """NODE 3 (async): same as _invoke_tools, awaiting tools without blocking the event loop"""
+        tool_calls = state.get("tool_calls", [])
+        
+        # Calls already run while the LLM was still streaming (same position, same call)
+        prefetched = {
+            item["position"]: item for item in state.get("prefetched_tools") or []
+        }
+        
+        async def run_or_reuse(position: int, tool_call: Dict[str, Any]) -> Dict[str, Any]:
+            done = prefetched.get(position)
+            if done and done["tool"] == tool_call.get("name") and done["input"] == tool_call.get("input", {}):
+                return {key: done[key] for key in ("tool", "input", "result")}
+            return await self._arun_tool(tool_call, config)
+        
+        tool_results = await asyncio.gather(
+            *(run_or_reuse(position, tool_call) for position, tool_call in enumerate(tool_calls))
+        )
+        set_span_attributes(**{"tools.count": len(tool_calls), "tools.prefetched": len(prefetched)})
+        
+        return {**self._with_tool_results(state, list(tool_results)), "prefetched_tools": []}
+    
+    async def _arun_tool(self, tool_call: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        """Run one tool on the shared pool with its timeout and report the result"""
+        tool_name = tool_call.get("name")
+        tool_input = tool_call.get("input", {})
+        with get_tracer().span(f"tool.{tool_name}", **{"tool.name": tool_name}) as span:
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.get_running_loop().run_in_executor(
+                        _tool_executor, self.tools.execute, tool_name, tool_input
+                    ),
+                    timeout=get_tool_timeout(tool_name)
+                )
+            except asyncio.TimeoutError:
+                result = tool_timeout_result(tool_name)
+            except ToolPoolFull:
+                result = tool_rejected_result(tool_name)
+            _end_tool_span(span, result)
         
-        for tool_call in tool_calls:
+        tool_result = {"tool": tool_name, "input": tool_input, "result": result}
+        await adispatch_custom_event("tool_result", tool_result, config=config)
+        return tool_result
+    
+    def _run_tools_concurrently(
+        self, tool_calls: List[Dict[str, Any]]
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (position, tool_result) as each tool finishes or hits its timeout"""
+        started = time.monotonic()
+        pending = {}
+        spans: Dict[Any, Span] = {}
+        for position, tool_call in enumerate(tool_calls):
             tool_name = tool_call.get("name")
             tool_input = tool_call.get("input", {})
-            
-            # Execute the tool
-            result = execute_tool(tool_name, tool_input)
-            tool_results.append({
-                "tool": tool_name,
-                "input": tool_input,
-                "result": result
-            })
+            try:
+                future = _tool_executor.submit(self.tools.execute, tool_name, tool_input)
+            except ToolPoolFull:
+                yield position, {"tool": tool_name, "input": tool_input, "result": tool_rejected_result(tool_name)}
+                continue
+            pending[future] = (position, tool_name, tool_input, started + get_tool_timeout(tool_name))
+            # Pool threads do not inherit the context, so the span is ended from here
+            spans[future] = get_tracer().start_span(f"tool.{tool_name}", **{"tool.name": tool_name})
         
+        while pending:
+            next_deadline = min(deadline for *_, deadline in pending.values())
+            done, _ = wait(
+                pending,
+                timeout=max(0.0, next_deadline - time.monotonic()),
+                return_when=FIRST_COMPLETED
+            )
+            for future in done:
+                position, tool_name, tool_input, _ = pending.pop(future)
+                result = future.result()
+                _end_tool_span(spans.pop(future), result)
+                yield position, {"tool": tool_name, "input": tool_input, "result": result}
+            
+            now = time.monotonic()
+            for future, (position, tool_name, tool_input, deadline) in list(pending.items()):
+                if deadline <= now:
+                    # Drops it if not started yet; a running tool finishes in the background
+                    future.cancel()
+                    del pending[future]
+                    result = tool_timeout_result(tool_name)
+                    _end_tool_span(spans.pop(future), result)
+                    yield position, {"tool": tool_name, "input": tool_input, "result": result}
+    
+    def _with_tool_results(self, state: AgentState, tool_results: List[Dict[str, Any]]) -> AgentState:
+        """State update carrying tool results and the tool message"""
         # Add tool messages
         new_messages = state["messages"]
         if tool_results:
@@ -218,7 +634,8 @@ When user describes an interaction, respond with:
             "status": "success",
             "extracted_interaction": state.get("extracted_interaction"),
             "tool_results": state.get("tool_calls", []),
-            "conversation_steps": len(state["messages"])
+            "conversation_steps": len(state["messages"]),
+            "extraction": state.get("extraction")
         }
         
         return {
@@ -226,29 +643,122 @@ When user describes an interaction, respond with:
             "final_result": final_result
         }
     
-    def process_conversation(self, user_input: str) -> Dict[str, Any]:
+    @staticmethod
+    def new_session_id() -> str:
+        """Identifier for a new chat session"""
+        return uuid.uuid4().hex
+    
+    def process_conversation(self, user_input: str, session_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Main entry point: Process user input through the graph
         
         Args:
             user_input: User's description of the interaction
+            session_id: Chat session to continue (None = one-shot, nothing stored)
             
         Returns:
             Structured result with extracted interaction data
         """
-        # Initialize state
-        initial_state: AgentState = {
+        # Run graph
+        graph, graph_input, config = self._graph_run(user_input, session_id)
+        with get_tracer().span("chat_turn", **{"session.id": session_id}):
+            final_state = graph.invoke(graph_input, config)
+        
+        return self._session_result(final_state, session_id)
+    
+    async def aprocess_conversation(self, user_input: str, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Async version of process_conversation for async route handlers"""
+        graph, graph_input, config = self._graph_run(user_input, session_id)
+        with get_tracer().span("chat_turn", **{"session.id": session_id}):
+            final_state = await graph.ainvoke(graph_input, config)
+        
+        return self._session_result(final_state, session_id)
+    
+    async def astream_conversation(
+        self, user_input: str, session_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the graph and yield progress events as they happen
+        
+        Yields dicts with an "event" key:
+        - node: {"node", "status": "start" | "end", "elapsed_ms" on end}
+        - token: {"text"} for each LLM token
+        - field: {"field", "value"} as each extracted_data field closes in the stream
+        - tool_result: {"tool", "input", "result"} as each tool finishes
+        - result: {"result"} with the same payload process_conversation returns
+        """
+        node_started: Dict[str, float] = {}
+        final_result: Dict[str, Any] = {}
+        graph, graph_input, config = self._graph_run(user_input, session_id)
+        with get_tracer().span("chat_turn", **{"session.id": session_id, "chat.streamed": True}):
+            async for event in graph.astream_events(graph_input, config, version="v2"):
+                kind = event["event"]
+                name = event["name"]
+                is_node = name in NODE_NAMES and event["metadata"].get("langgraph_node") == name
+                
+                if kind == "on_chain_start" and is_node:
+                    node_started[name] = time.perf_counter()
+                    yield {"event": "node", "node": name, "status": "start"}
+                
+                elif kind == "on_chain_end" and is_node:
+                    elapsed = time.perf_counter() - node_started.pop(name, time.perf_counter())
+                    yield {
+                        "event": "node",
+                        "node": name,
+                        "status": "end",
+                        "elapsed_ms": round(elapsed * 1000, 2)
+                    }
+                    if name == "generate_response":
+                        final_result = self._session_result(event["data"].get("output") or {}, session_id)
+                
+                elif kind == "on_chat_model_stream":
+                    text = event["data"]["chunk"].content
+                    if text:
+                        yield {"event": "token", "text": text}
+                
+                elif kind == "on_custom_event" and name == "tool_result":
+                    yield {"event": "tool_result", **event["data"]}
+                
+                elif kind == "on_custom_event" and name == "extracted_field":
+                    yield {"event": "field", **event["data"]}
+            
+        yield {"event": "result", "result": final_result}
+    
+    def _graph_run(
+        self, user_input: str, session_id: Optional[str]
+    ) -> Tuple[Any, Dict[str, Any], Optional[RunnableConfig]]:
+        """(graph, input, config) for a one-shot call or a turn in a session"""
+        if session_id is None:
+            return self.graph, self._initial_state(user_input), None
+        
+        # The checkpointer supplies earlier turns and the current draft;
+        # only this turn's message and per-turn fields are reset
+        turn_input = {
+            "messages": [HumanMessage(content=user_input)],
+            "tool_calls": [],
+            "final_result": None,
+            "extraction": None,
+            "prefetched_tools": []
+        }
+        return self.session_graph, turn_input, {"configurable": {"thread_id": session_id}}
+    
+    def _session_result(self, final_state: Dict[str, Any], session_id: Optional[str]) -> Dict[str, Any]:
+        final_result = final_state.get("final_result") or {}
+        if session_id is not None:
+            final_result = {**final_result, "session_id": session_id}
+        return final_result
+    
+    def _initial_state(self, user_input: str) -> AgentState:
+        """Fresh graph state for a single user message"""
+        return {
             "messages": [HumanMessage(content=user_input)],
             "conversation_history": [],
             "extracted_interaction": None,
             "tool_calls": [],
-            "final_result": None
+            "final_result": None,
+            "extraction": None,
+            "prefetched_tools": []
         }
-        
-        # Run graph
-        final_state = self.graph.invoke(initial_state)
-        
-        return final_state.get("final_result", {})
 
 
 # ============================================================================
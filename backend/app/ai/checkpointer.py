@@ -0,0 +1,421 @@
+"""
+SQL-backed LangGraph checkpointer
+Stores chat session state in the application database (SQLite or MySQL) so
+multi-turn sessions survive restarts and are shared across worker processes
+"""
+
+import asyncio
+import json
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_serializable_checkpoint_metadata,
+)
+from sqlalchemy import delete, func, select
+
+from app.database import AsyncSessionLocal, AsyncWriteSessionLocal, SessionLocal
+from app.models import ChatCheckpoint, ChatCheckpointWrite
+
+
+# Checkpoints kept per session; older ones (and their writes) are pruned on save
+CHECKPOINTS_PER_SESSION = int(os.getenv("CHAT_CHECKPOINTS_PER_SESSION", "8"))
+
+
+def _thread_config(thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> RunnableConfig:
+    return {
+        "configurable": {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint_id,
+        }
+    }
+
+
+class SqlCheckpointSaver(BaseCheckpointSaver[str]):
+    """
+    Checkpoint saver over the chat_checkpoints / chat_checkpoint_writes tables
+
+    Each checkpoint is stored whole (one serialized blob), so loading a
+    session is a single-row read. Only the newest CHECKPOINTS_PER_SESSION
+    checkpoints of a session are kept; chat history itself is bounded by
+    the agent's token budget, so rows stay small however long a session runs.
+
+    Every write goes through the async writer session. Once attach_loop()
+    has been called with the server's event loop, the sync write methods
+    called from other threads run there too, queued with the async saves
+    on the single writer. Without a running loop (scripts), they use the
+    sync engine.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        async_session_factory=None,
+        async_read_session_factory=None,
+        keep: int = CHECKPOINTS_PER_SESSION
+    ):
+        super().__init__()
+        self.session_factory = session_factory or SessionLocal
+        # Loads go through the reader pool; saves queue on the single writer
+        self.async_session_factory = async_session_factory or AsyncWriteSessionLocal
+        self.async_read_session_factory = async_read_session_factory or AsyncSessionLocal
+        self.keep = keep
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Send sync writes from other threads to the async writer on loop"""
+        self._loop = loop
+
+    def _writer_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        """The attached loop if a sync write should run on it, else None"""
+        loop = self._loop
+        if loop is None or loop.is_closed() or not loop.is_running():
+            return None
+        try:
+            if asyncio.get_running_loop() is loop:
+                # Blocking on the loop from inside it would deadlock
+                return None
+        except RuntimeError:
+            pass
+        return loop
+
+    # ------------------------------------------------------------------
+    # Row <-> tuple conversion shared by the sync and async paths
+    # ------------------------------------------------------------------
+
+    def _select_checkpoints(
+        self,
+        config: Optional[RunnableConfig],
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ):
+        query = select(ChatCheckpoint)
+        if config:
+            configurable = config["configurable"]
+            query = query.where(ChatCheckpoint.thread_id == configurable["thread_id"])
+            if configurable.get("checkpoint_ns") is not None:
+                query = query.where(ChatCheckpoint.checkpoint_ns == configurable["checkpoint_ns"])
+            if checkpoint_id := get_checkpoint_id(config):
+                query = query.where(ChatCheckpoint.checkpoint_id == checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            query = query.where(ChatCheckpoint.checkpoint_id < before_id)
+        # Checkpoint IDs are monotonically increasing, newest first
+        query = query.order_by(ChatCheckpoint.checkpoint_id.desc())
+        if limit:
+            query = query.limit(limit)
+        return query
+
+    def _select_writes(self, row: ChatCheckpoint):
+        return (
+            select(ChatCheckpointWrite)
+            .where(
+                ChatCheckpointWrite.thread_id == row.thread_id,
+                ChatCheckpointWrite.checkpoint_ns == row.checkpoint_ns,
+                ChatCheckpointWrite.checkpoint_id == row.checkpoint_id,
+            )
+            .order_by(ChatCheckpointWrite.task_id, ChatCheckpointWrite.idx)
+        )
+
+    def _to_tuple(self, row: ChatCheckpoint, writes: Sequence[ChatCheckpointWrite]) -> CheckpointTuple:
+        return CheckpointTuple(
+            config=_thread_config(row.thread_id, row.checkpoint_ns, row.checkpoint_id),
+            checkpoint=self.serde.loads_typed((row.type, row.checkpoint)),
+            metadata=json.loads(row.metadata_),
+            parent_config=(
+                _thread_config(row.thread_id, row.checkpoint_ns, row.parent_checkpoint_id)
+                if row.parent_checkpoint_id else None
+            ),
+            pending_writes=[
+                (write.task_id, write.channel, self.serde.loads_typed((write.type, write.value)))
+                for write in writes
+            ],
+        )
+
+    def _checkpoint_row(
+        self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata
+    ) -> ChatCheckpoint:
+        configurable = config["configurable"]
+        type_, serialized = self.serde.dumps_typed(checkpoint)
+        # Metadata minus "writes" is plain JSON (source, step, parents, run config)
+        serialized_metadata = json.dumps(
+            get_serializable_checkpoint_metadata(config, metadata), default=str
+        ).encode("utf-8")
+        return ChatCheckpoint(
+            thread_id=configurable["thread_id"],
+            checkpoint_ns=configurable.get("checkpoint_ns", ""),
+            checkpoint_id=checkpoint["id"],
+            parent_checkpoint_id=configurable.get("checkpoint_id"),
+            type=type_,
+            checkpoint=serialized,
+            metadata_=serialized_metadata,
+        )
+
+    def _write_rows(
+        self, config: RunnableConfig, writes: Sequence[Tuple[str, Any]], task_id: str, task_path: str
+    ) -> List[Tuple[bool, ChatCheckpointWrite]]:
+        """(replace_existing, row) per write; special writes replace, regular ones don't"""
+        configurable = config["configurable"]
+        rows = []
+        for position, (channel, value) in enumerate(writes):
+            idx = WRITES_IDX_MAP.get(channel, position)
+            type_, serialized = self.serde.dumps_typed(value)
+            rows.append((idx < 0, ChatCheckpointWrite(
+                thread_id=configurable["thread_id"],
+                checkpoint_ns=configurable.get("checkpoint_ns", ""),
+                checkpoint_id=configurable["checkpoint_id"],
+                task_id=task_id,
+                idx=idx,
+                channel=channel,
+                type=type_,
+                value=serialized,
+                task_path=task_path,
+            )))
+        return rows
+
+    def _stale_ids_query(self, thread_id: str, checkpoint_ns: str):
+        return (
+            select(ChatCheckpoint.checkpoint_id)
+            .where(ChatCheckpoint.thread_id == thread_id, ChatCheckpoint.checkpoint_ns == checkpoint_ns)
+            .order_by(ChatCheckpoint.checkpoint_id.desc())
+            .offset(self.keep)
+        )
+
+    def _delete_checkpoints(self, thread_id: str, checkpoint_ns: str, checkpoint_ids: List[str]):
+        return [
+            delete(model).where(
+                model.thread_id == thread_id,
+                model.checkpoint_ns == checkpoint_ns,
+                model.checkpoint_id.in_(checkpoint_ids),
+            )
+            for model in (ChatCheckpointWrite, ChatCheckpoint)
+        ]
+
+    # ------------------------------------------------------------------
+    # Sync API
+    # ------------------------------------------------------------------
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        with self.session_factory() as db:
+            row = db.execute(self._select_checkpoints(config, limit=1)).scalars().first()
+            if row is None:
+                return None
+            return self._to_tuple(row, db.execute(self._select_writes(row)).scalars().all())
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[CheckpointTuple]:
+        with self.session_factory() as db:
+            rows = db.execute(self._select_checkpoints(config, before, None if filter else limit)).scalars().all()
+            found = 0
+            for row in rows:
+                checkpoint_tuple = self._to_tuple(row, db.execute(self._select_writes(row)).scalars().all())
+                if filter and any(checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()):
+                    continue
+                yield checkpoint_tuple
+                found += 1
+                if limit and found >= limit:
+                    return
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        if loop := self._writer_loop():
+            return asyncio.run_coroutine_threadsafe(self.aput(config, checkpoint, metadata, new_versions), loop).result()
+        row = self._checkpoint_row(config, checkpoint, metadata)
+        with self.session_factory() as db:
+            db.merge(row)
+            db.flush()
+            stale = db.execute(self._stale_ids_query(row.thread_id, row.checkpoint_ns)).scalars().all()
+            if stale:
+                for statement in self._delete_checkpoints(row.thread_id, row.checkpoint_ns, stale):
+                    db.execute(statement)
+            db.commit()
+        return _thread_config(row.thread_id, row.checkpoint_ns, row.checkpoint_id)
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        if loop := self._writer_loop():
+            return asyncio.run_coroutine_threadsafe(self.aput_writes(config, writes, task_id, task_path), loop).result()
+        with self.session_factory() as db:
+            for replace, row in self._write_rows(config, writes, task_id, task_path):
+                if replace or db.get(ChatCheckpointWrite, self._write_key(row)) is None:
+                    db.merge(row)
+            db.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        if loop := self._writer_loop():
+            return asyncio.run_coroutine_threadsafe(self.adelete_thread(thread_id), loop).result()
+        with self.session_factory() as db:
+            for model in (ChatCheckpointWrite, ChatCheckpoint):
+                db.execute(delete(model).where(model.thread_id == thread_id))
+            db.commit()
+
+    # ------------------------------------------------------------------
+    # Async API (used by graph.ainvoke / astream_events)
+    # ------------------------------------------------------------------
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        async with self.async_read_session_factory() as db:
+            row = (await db.execute(self._select_checkpoints(config, limit=1))).scalars().first()
+            if row is None:
+                return None
+            return self._to_tuple(row, (await db.execute(self._select_writes(row))).scalars().all())
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[CheckpointTuple]:
+        async with self.async_read_session_factory() as db:
+            result = await db.execute(self._select_checkpoints(config, before, None if filter else limit))
+            found = 0
+            for row in result.scalars().all():
+                writes = (await db.execute(self._select_writes(row))).scalars().all()
+                checkpoint_tuple = self._to_tuple(row, writes)
+                if filter and any(checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()):
+                    continue
+                yield checkpoint_tuple
+                found += 1
+                if limit and found >= limit:
+                    return
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions
+    ) -> RunnableConfig:
+        row = self._checkpoint_row(config, checkpoint, metadata)
+        async with self.async_session_factory() as db:
+            await db.merge(row)
+            await db.flush()
+            stale = (await db.execute(self._stale_ids_query(row.thread_id, row.checkpoint_ns))).scalars().all()
+            if stale:
+                for statement in self._delete_checkpoints(row.thread_id, row.checkpoint_ns, stale):
+                    await db.execute(statement)
+            await db.commit()
+        return _thread_config(row.thread_id, row.checkpoint_ns, row.checkpoint_id)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = ""
+    ) -> None:
+        async with self.async_session_factory() as db:
+            for replace, row in self._write_rows(config, writes, task_id, task_path):
+                if replace or await db.get(ChatCheckpointWrite, self._write_key(row)) is None:
+                    await db.merge(row)
+            await db.commit()
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        async with self.async_session_factory() as db:
+            for model in (ChatCheckpointWrite, ChatCheckpoint):
+                await db.execute(delete(model).where(model.thread_id == thread_id))
+            await db.commit()
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _write_key(row: ChatCheckpointWrite) -> Tuple[str, str, str, str, int]:
+        return (row.thread_id, row.checkpoint_ns, row.checkpoint_id, row.task_id, row.idx)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    def _idle_threads_query(self, idle_hours: float):
+        cutoff = datetime.utcnow() - timedelta(hours=idle_hours)
+        return (
+            select(ChatCheckpoint.thread_id)
+            .group_by(ChatCheckpoint.thread_id)
+            .having(func.max(ChatCheckpoint.created_at) < cutoff)
+        )
+
+    @staticmethod
+    def _delete_threads(idle: List[str]):
+        for start in range(0, len(idle), 500):
+            batch = idle[start:start + 500]
+            for model in (ChatCheckpointWrite, ChatCheckpoint):
+                yield delete(model).where(model.thread_id.in_(batch))
+
+    def prune_sessions(self, idle_hours: float) -> int:
+        """
+        Delete sessions with no checkpoint in the last idle_hours
+
+        Returns:
+            Number of sessions removed
+        """
+        if loop := self._writer_loop():
+            return asyncio.run_coroutine_threadsafe(self.aprune_sessions(idle_hours), loop).result()
+        with self.session_factory() as db:
+            idle = db.execute(self._idle_threads_query(idle_hours)).scalars().all()
+            for statement in self._delete_threads(idle):
+                db.execute(statement)
+            db.commit()
+        return len(idle)
+
+    async def aprune_sessions(self, idle_hours: float) -> int:
+        """Async prune_sessions, on the single writer"""
+        async with self.async_session_factory() as db:
+            idle = (await db.execute(self._idle_threads_query(idle_hours))).scalars().all()
+            for statement in self._delete_threads(idle):
+                await db.execute(statement)
+            await db.commit()
+        return len(idle)
+
+
+# ============================================================================
+# CHECKPOINTER INITIALIZATION
+# ============================================================================
+
+# Global checkpointer instance
+_checkpointer_instance: Optional[SqlCheckpointSaver] = None
+
+
+def get_checkpointer() -> SqlCheckpointSaver:
+    """
+    Get or create the global chat session checkpointer
+    Uses the application database (DATABASE_URL / ASYNC_DATABASE_URL)
+    """
+    global _checkpointer_instance
+
+    if _checkpointer_instance is None:
+        _checkpointer_instance = SqlCheckpointSaver()
+
+    return _checkpointer_instance
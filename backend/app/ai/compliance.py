@@ -0,0 +1,247 @@
+"""
+Compliance Lexicon Scanner
+Compiles the compliance lexicon once and scans text in a single pass
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+
+from app.database import AsyncSessionLocal
+from app.models import Interaction, FULLTEXT_COLUMNS
+
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(__file__), "compliance_lexicon.json")
+
+# Seconds between lexicon file mtime checks
+RELOAD_CHECK_INTERVAL = 2.0
+
+_SEPARATOR = re.compile(r"[\s\-]+")
+
+
+def _normalize_phrase(phrase: str) -> str:
+    """Lowercase and treat any run of spaces/hyphens as one separator"""
+    return _SEPARATOR.sub(" ", phrase.strip().lower())
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """
+    Build a regex from a character trie of the phrases
+    Shared prefixes are matched once, so the regex engine walks the text in a
+    single pass instead of retrying every phrase at every position.
+    """
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    return _trie_node_pattern(trie)
+
+
+def _trie_node_pattern(node: Dict[str, Any]) -> str:
+    terminal = "" in node
+    branches = [
+        (r"[\s\-]+" if char == " " else re.escape(char)) + _trie_node_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+    # Greedy optional group prefers the longest phrase, e.g. "unapproved indication"
+    return "(?:" + "|".join(branches) + ")" + ("?" if terminal else "")
+
+
+class _CompiledLexicon:
+    """Immutable compiled form of a lexicon file, swapped in whole on reload"""
+
+    def __init__(self, lexicon: Dict[str, Any]):
+        # normalized phrase -> rules it triggers
+        self.rules: Dict[str, List[Dict[str, str]]] = {}
+        for entry in lexicon.get("phrases", []):
+            self._add_rule(entry["phrase"], {"kind": "phrase", "category": entry["category"]})
+
+        self.pairs = lexicon.get("pairs", [])
+        for pair in self.pairs:
+            self._add_rule(pair["brand"], {"kind": "brand", "category": pair["category"]})
+            self._add_rule(pair["indication"], {"kind": "indication", "category": pair["category"]})
+
+        self.pattern = None
+        if self.rules:
+            self.pattern = re.compile(
+                r"(?<!\w)(?:" + _trie_pattern(self.rules) + r")(?!\w)",
+                re.IGNORECASE
+            )
+
+        self.regexes = [
+            (re.compile(entry["pattern"], re.IGNORECASE), entry["category"], entry.get("name", entry["pattern"]))
+            for entry in lexicon.get("regexes", [])
+        ]
+
+    def _add_rule(self, phrase: str, rule: Dict[str, str]) -> None:
+        key = _normalize_phrase(phrase)
+        if key:
+            self.rules.setdefault(key, []).append({**rule, "rule": phrase})
+
+
+class ComplianceEngine:
+    """
+    Lexicon-driven compliance scanner
+
+    The lexicon (JSON with "phrases", "regexes" and brand/indication "pairs")
+    is compiled once and recompiled automatically when the file changes.
+    Phrases and pair terms share one trie-compiled regex; regexes run as given.
+    """
+
+    def __init__(self, lexicon_path: Optional[str] = None):
+        self.lexicon_path = lexicon_path or os.getenv("COMPLIANCE_LEXICON_PATH", DEFAULT_LEXICON_PATH)
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        # mtime of a lexicon file that failed to load, so it is not re-parsed on every check
+        self._failed_mtime: Optional[float] = None
+        self.reload_error: Optional[str] = None
+        self._last_check = 0.0
+        self._compiled = _CompiledLexicon({})
+        self.reload()
+
+    def reload(self) -> None:
+        """Recompile the lexicon from disk"""
+        with self._lock:
+            mtime = os.path.getmtime(self.lexicon_path)
+            with open(self.lexicon_path, encoding="utf-8") as f:
+                lexicon = json.load(f)
+            self._compiled = _CompiledLexicon(lexicon)
+            self._mtime = mtime
+            self._last_check = time.monotonic()
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if now - self._last_check < RELOAD_CHECK_INTERVAL:
+            return
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.lexicon_path)
+        except OSError:
+            # Missing (e.g. mid-rename): keep serving the last good lexicon
+            return
+        if mtime in (self._mtime, self._failed_mtime):
+            return
+        try:
+            self.reload()
+            self._failed_mtime = self.reload_error = None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError, re.error) as e:
+            # Bad JSON, a missing key, a wrong type or an invalid regex: keep
+            # serving the last good lexicon until the file changes again
+            self._failed_mtime = mtime
+            self.reload_error = f"{type(e).__name__}: {e}"
+            print(f"Compliance lexicon {self.lexicon_path} not reloaded ({self.reload_error})")
+
+    def scan(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Scan text for lexicon hits
+
+        Returns:
+            Matches sorted by offset, each {"start", "end", "text", "category", "rule"}
+        """
+        self._maybe_reload()
+        compiled = self._compiled
+        if not text:
+            return []
+
+        matches: List[Dict[str, Any]] = []
+        brands: Dict[str, re.Match] = {}
+        indications = set()
+
+        if compiled.pattern is not None:
+            for found in compiled.pattern.finditer(text):
+                for rule in compiled.rules.get(_normalize_phrase(found.group(0)), []):
+                    if rule["kind"] == "phrase":
+                        matches.append({
+                            "start": found.start(),
+                            "end": found.end(),
+                            "text": found.group(0),
+                            "category": rule["category"],
+                            "rule": rule["rule"],
+                        })
+                    elif rule["kind"] == "brand":
+                        brands.setdefault(_normalize_phrase(rule["rule"]), found)
+                    else:
+                        indications.add(_normalize_phrase(rule["rule"]))
+
+        for pair in compiled.pairs:
+            brand = brands.get(_normalize_phrase(pair["brand"]))
+            if brand is not None and _normalize_phrase(pair["indication"]) in indications:
+                matches.append({
+                    "start": brand.start(),
+                    "end": brand.end(),
+                    "text": brand.group(0),
+                    "category": pair["category"],
+                    "rule": f"{pair['brand']} + {pair['indication']}",
+                })
+
+        for regex, category, rule_name in compiled.regexes:
+            for found in regex.finditer(text):
+                matches.append({
+                    "start": found.start(),
+                    "end": found.end(),
+                    "text": found.group(0),
+                    "category": category,
+                    "rule": rule_name,
+                })
+
+        matches.sort(key=lambda match: (match["start"], match["end"]))
+        return matches
+
+    def scan_many(self, texts: Iterable[str]) -> List[List[Dict[str, Any]]]:
+        """Scan several texts against the same compiled lexicon"""
+        return [self.scan(text) for text in texts]
+
+    async def rescan_interactions(self, batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Re-scan every stored interaction's free-text fields
+
+        Yields:
+            {"id", "hcp_name", "matches": {column: [...]}} for each flagged row
+        """
+        columns = [getattr(Interaction, name) for name in FULLTEXT_COLUMNS]
+        query = select(Interaction.id, Interaction.hcp_name, *columns).order_by(Interaction.id)
+
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(query.execution_options(yield_per=batch_size))
+            async for rows in result.partitions():
+                for row in rows:
+                    found = {}
+                    for name in FULLTEXT_COLUMNS:
+                        column_matches = self.scan(getattr(row, name) or "")
+                        if column_matches:
+                            found[name] = column_matches
+                    if found:
+                        yield {"id": row.id, "hcp_name": row.hcp_name, "matches": found}
+
+
+# ============================================================================
+# ENGINE INITIALIZATION
+# ============================================================================
+
+# Global engine instance
+_engine_instance: Optional[ComplianceEngine] = None
+
+
+def get_compliance_engine() -> ComplianceEngine:
+    """
+    Get or create the global compliance engine
+    Uses lazy initialization
+    """
+    global _engine_instance
+
+    if _engine_instance is None:
+        _engine_instance = ComplianceEngine()
+
+    return _engine_instance
@@ -0,0 +1,183 @@
+"""
+Rule-based fast-path extractor
+Pulls hcp_name / interaction_type / notes out of well-formed notes without an LLM call
+"""
+
+import os
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from app.ai.hcp_index import get_hcp_index, normalize_hcp_name
+
+
+# Keyword patterns per interaction type; a note must hit exactly one type
+_TYPE_PATTERNS = {
+    "Visit": re.compile(
+        r"\b(?:visit(?:ed|ing)?|met|meeting|in[\s\-]person|stopped by|dropped by|face[\s\-]to[\s\-]face)\b",
+        re.IGNORECASE
+    ),
+    "Call": re.compile(
+        r"\b(?:call(?:ed|ing)?|phoned?|phone call|rang|spoke on the phone|over the phone)\b",
+        re.IGNORECASE
+    ),
+    "Virtual": re.compile(
+        r"\b(?:virtual(?:ly)?|video|zoom|teams|webex|webinar|online meeting|video call)\b",
+        re.IGNORECASE
+    ),
+}
+
+# "Video call" / "virtual meeting" mention the other types' keywords too
+_TYPE_OVERRIDES = ("Virtual",)
+
+_NAME_WORD = r"[A-Z][A-Za-z'\-]*\.?"
+_TITLED_NAME = re.compile(
+    r"\b(?:Dr|Doctor|Prof|Professor)\.?\s+(" + _NAME_WORD + r"(?:\s+" + _NAME_WORD + r"){0,2})"
+)
+_CAPITALIZED_RUN = re.compile(_NAME_WORD + r"(?:\s+" + _NAME_WORD + r"){1,3}")
+
+# Capitalized words that follow a name but aren't part of it
+_NOT_NAME_WORDS = {
+    "today", "yesterday", "tomorrow", "this", "last", "next", "re", "about",
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+    "january", "february", "march", "april", "may", "june", "july", "august",
+    "september", "october", "november", "december",
+}
+
+# Evidence that the note carries discussion content worth logging
+_DISCUSSION = re.compile(
+    r"\b(?:discussed|talked about|went over|reviewed|covered|presented|about|regarding|re:)\s+\S",
+    re.IGNORECASE
+)
+
+# Score awarded for each piece of evidence; the total is the confidence.
+# Without a known-HCP match the most a note can score is
+# TYPE + TITLED + DISCUSSION = 0.7, below the default 0.8 threshold, so an
+# unknown or misspelled name ("Dr. Sarah Jonson") always goes to the LLM
+# instead of being logged under a new spelling.
+TYPE_WEIGHT = 0.35
+KNOWN_HCP_WEIGHT = 0.4
+TITLED_HCP_WEIGHT = 0.1
+DISCUSSION_WEIGHT = 0.25
+
+# Minimum index score for a name to count as a known HCP
+KNOWN_MATCH_SCORE = 0.85
+
+
+def _trim_name(name: str) -> str:
+    """Drop trailing non-name words ("Smith Today" -> "Smith")"""
+    words = name.split()
+    while words and words[-1].rstrip(".").lower() in _NOT_NAME_WORDS:
+        words.pop()
+    return " ".join(words)
+
+
+class FastPathExtractor:
+    """
+    Deterministic extractor for notes like "Visit with Dr. X today, discussed Y"
+
+    Confidence is the sum of the evidence weights: one unambiguous
+    interaction type, an HCP name (known from the DB, or introduced by a
+    title), and discussion content. Only notes naming a known HCP can
+    reach min_confidence and skip the LLM entirely.
+    """
+
+    def __init__(self, min_confidence: float = 0.8):
+        self.min_confidence = min_confidence
+
+    def _interaction_type(self, text: str) -> Optional[str]:
+        found = [name for name, pattern in _TYPE_PATTERNS.items() if pattern.search(text)]
+        for override in _TYPE_OVERRIDES:
+            if override in found:
+                return override
+        return found[0] if len(found) == 1 else None
+
+    def _hcp_name(self, text: str) -> Tuple[Optional[str], float]:
+        """(name, weight) for the single HCP the note is about, or (None, 0)"""
+        index = get_hcp_index()
+        titled = [_trim_name(match.group(0)) for match in _TITLED_NAME.finditer(text)]
+        titled = [name for name in titled if len(name.split()) > 1]
+
+        if titled:
+            keys = {normalize_hcp_name(name) for name in titled}
+            if len(keys) > 1:
+                # Several different doctors: leave it to the LLM
+                return None, 0.0
+            name = titled[0]
+            matches = index.lookup(name, limit=1)
+            if matches and matches[0]["score"] >= KNOWN_MATCH_SCORE:
+                return matches[0]["name"], KNOWN_HCP_WEIGHT
+            return name, TITLED_HCP_WEIGHT
+
+        # Untitled names only count when they're already in the DB
+        best = None
+        for run in _CAPITALIZED_RUN.finditer(text):
+            words = _trim_name(run.group(0)).split()
+            for start in range(len(words) - 1):
+                for matched in index.lookup(" ".join(words[start:]), limit=1):
+                    if matched["score"] >= KNOWN_MATCH_SCORE and (best is None or matched["score"] > best["score"]):
+                        best = matched
+        if best is not None:
+            return best["name"], KNOWN_HCP_WEIGHT
+        return None, 0.0
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        """
+        Extract an interaction from a note
+
+        Returns:
+            {"extracted_data": {...} or None, "confidence": 0..1,
+             "tools_to_call": [...]} where tools_to_call matches what the
+            LLM would request for the same note
+        """
+        text = text.strip()
+        interaction_type = self._interaction_type(text)
+        hcp_name, name_weight = self._hcp_name(text)
+
+        confidence = name_weight
+        if interaction_type:
+            confidence += TYPE_WEIGHT
+        if _DISCUSSION.search(text):
+            confidence += DISCUSSION_WEIGHT
+
+        if not (hcp_name and interaction_type):
+            return {"extracted_data": None, "confidence": round(confidence, 2), "tools_to_call": []}
+
+        extracted = {"hcp_name": hcp_name, "interaction_type": interaction_type, "notes": text}
+        return {
+            "extracted_data": extracted,
+            "confidence": round(min(confidence, 1.0), 2),
+            "tools_to_call": [
+                {"name": "compliance_check", "input": {"text": text}},
+                {"name": "next_best_action", "input": dict(extracted)},
+            ],
+        }
+
+    def accept(self, text: str) -> Optional[Dict[str, Any]]:
+        """The extraction if it clears min_confidence, else None"""
+        result = self.extract(text)
+        if result["extracted_data"] and result["confidence"] >= self.min_confidence:
+            return result
+        return None
+
+
+# ============================================================================
+# EXTRACTOR INITIALIZATION
+# ============================================================================
+
+# Global extractor instance
+_extractor_instance: Optional[FastPathExtractor] = None
+
+
+def get_fast_path_extractor() -> FastPathExtractor:
+    """
+    Get or create the global fast-path extractor
+    Threshold from FAST_PATH_MIN_CONFIDENCE (above 1 disables the fast path)
+    """
+    global _extractor_instance
+
+    if _extractor_instance is None:
+        _extractor_instance = FastPathExtractor(
+            min_confidence=float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.8"))
+        )
+
+    return _extractor_instance
@@ -0,0 +1,169 @@
+"""
+In-process fuzzy index over HCP names
+Trigram matching that tolerates typos, titles ("Dr.", "Prof.") and case
+"""
+
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import func, select
+
+from app.database import SessionLocal
+from app.models import Interaction
+
+
+# Honorifics and suffixes that don't distinguish one HCP from another
+_TITLES = {"dr", "doctor", "prof", "professor", "mr", "mrs", "ms", "md", "mbbs", "do", "phd", "rn", "np", "pa"}
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+def normalize_hcp_name(name: str) -> str:
+    """
+    Canonical comparison key for an HCP name
+    "Dr. Sarah  Johnson, MD" -> "sarah johnson"
+    """
+    words = _NON_WORD.sub(" ", name.lower()).split()
+    kept = [word for word in words if word not in _TITLES]
+    return " ".join(kept or words)
+
+
+def _trigrams(key: str) -> Set[str]:
+    """Character trigrams of a normalized key, padded so short names still match"""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class HcpNameIndex:
+    """
+    Trigram index over distinct HCP names
+
+    Each normalized key remembers every spelling seen for it, with counts,
+    and reports the most common spelling as the canonical name.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spellings: Dict[str, Dict[str, int]] = {}
+        self._trigram_keys: Dict[str, Set[str]] = defaultdict(set)
+        self._key_trigrams: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._spellings)
+
+    def add(self, name: str, count: int = 1) -> None:
+        """Record count occurrences of an HCP name"""
+        key = normalize_hcp_name(name)
+        if not key:
+            return
+        with self._lock:
+            spellings = self._spellings.get(key)
+            if spellings is None:
+                spellings = self._spellings[key] = {}
+                grams = _trigrams(key)
+                self._key_trigrams[key] = grams
+                for gram in grams:
+                    self._trigram_keys[gram].add(key)
+            spellings[name] = spellings.get(name, 0) + count
+
+    def remove(self, name: str) -> None:
+        """Forget one occurrence of an HCP name (e.g. after a delete)"""
+        key = normalize_hcp_name(name)
+        with self._lock:
+            spellings = self._spellings.get(key)
+            if not spellings or name not in spellings:
+                return
+            spellings[name] -= 1
+            if spellings[name] <= 0:
+                del spellings[name]
+            if not spellings:
+                del self._spellings[key]
+                for gram in self._key_trigrams.pop(key):
+                    keys = self._trigram_keys[gram]
+                    keys.discard(key)
+                    if not keys:
+                        del self._trigram_keys[gram]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spellings.clear()
+            self._trigram_keys.clear()
+            self._key_trigrams.clear()
+
+    def lookup(self, name: str, limit: int = 5, min_score: float = 0.3) -> List[Dict[str, object]]:
+        """
+        Rank known HCPs by similarity to name
+
+        Returns:
+            List of {"name", "score", "variants"} sorted best first; score is
+            the Dice coefficient of the trigram sets (1.0 = same normalized name)
+        """
+        key = normalize_hcp_name(name)
+        if not key:
+            return []
+        grams = _trigrams(key)
+
+        with self._lock:
+            # Counter.update over the posting sets counts shared trigrams in C
+            shared: Counter = Counter()
+            for gram in grams:
+                postings = self._trigram_keys.get(gram)
+                if postings:
+                    shared.update(postings)
+
+            scored = []
+            for candidate, common in shared.items():
+                score = 2 * common / (len(grams) + len(self._key_trigrams[candidate]))
+                if score >= min_score:
+                    scored.append((score, candidate))
+            scored.sort(key=lambda item: (-item[0], item[1]))
+
+            results = []
+            for score, candidate in scored[:limit]:
+                spellings = self._spellings[candidate]
+                results.append({
+                    "name": max(spellings, key=lambda spelling: (spellings[spelling], spelling)),
+                    "score": round(score, 3),
+                    "variants": sorted(spellings),
+                })
+        return results
+
+    def rebuild(self, session_factory=None) -> int:
+        """
+        Reload the index from interactions.hcp_name
+
+        Returns:
+            Number of distinct normalized HCP names indexed
+        """
+        session_factory = session_factory or SessionLocal
+        with session_factory() as db:
+            rows = db.execute(
+                select(Interaction.hcp_name, func.count()).group_by(Interaction.hcp_name)
+            ).all()
+
+        self.clear()
+        for hcp_name, count in rows:
+            self.add(hcp_name, count)
+        return len(self)
+
+
+# ============================================================================
+# INDEX INITIALIZATION
+# ============================================================================
+
+# Global index instance, built from the DB on startup
+_index_instance: Optional[HcpNameIndex] = None
+
+
+def get_hcp_index() -> HcpNameIndex:
+    """
+    Get or create the global HCP name index
+    Empty until rebuild() is called (done at application startup)
+    """
+    global _index_instance
+
+    if _index_instance is None:
+        _index_instance = HcpNameIndex()
+
+    return _index_instance
@@ -0,0 +1,199 @@
+"""
+Incremental JSON parser for streamed LLM output
+Reports each extracted_data field and tools_to_call entry the moment it
+closes in the token stream (at its closing brace or quote; numbers and
+literals at the next delimiter), so work can start before the completion ends
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class MalformedLLMOutput(ValueError):
+    """The model's reply is not the JSON object the prompt asks for"""
+
+
+class _Frame:
+    """An open object or array"""
+
+    __slots__ = ("kind", "path", "state", "key", "key_start", "index", "value_start")
+
+    def __init__(self, kind: str, path: Tuple[Any, ...]):
+        self.kind = kind  # "object" | "array"
+        self.path = path
+        self.state = "key" if kind == "object" else "value"
+        self.key: Optional[str] = None
+        self.key_start = 0
+        self.index = 0
+        self.value_start: Optional[int] = None
+
+    def child_path(self) -> Tuple[Any, ...]:
+        return self.path + ((self.key,) if self.kind == "object" else (self.index,))
+
+
+class IncrementalJSONParser:
+    """
+    Streaming parser for the agent's reply format
+
+    feed() takes text chunks and returns the events completed by them:
+    - ("field", name, value): an extracted_data field closed
+    - ("tool_call", index, call): a tools_to_call entry closed
+
+    Text before the first "{" (prose, code fences) and after the top-level
+    object is ignored. finish() returns the whole object or raises
+    MalformedLLMOutput describing what was wrong.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self.errors: List[str] = []
+        # Everything emitted so far, usable even if the reply is later cut off
+        self.fields: Dict[str, Any] = {}
+        self.tool_calls: List[Any] = []
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any, Any]]:
+        """Consume a chunk of model output"""
+        events: List[Tuple[str, Any, Any]] = []
+        if self._end is not None or not chunk:
+            return events
+
+        self._text += chunk
+        text = self._text
+        while self._pos < len(text) and self._end is None:
+            i = self._pos
+            char = text[i]
+            self._pos += 1
+
+            if self._start is None:
+                if char == "{":
+                    self._start = i
+                    self._stack.append(_Frame("object", ()))
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    frame = self._stack[-1]
+                    if frame.kind == "object" and frame.state == "in_key":
+                        try:
+                            frame.key = json.loads(text[frame.key_start:i + 1])
+                        except json.JSONDecodeError as e:
+                            # Keep scanning with the raw key; finish() reports the object as invalid
+                            self.errors.append(f"key {text[frame.key_start:i + 1]}: {e.msg}")
+                            frame.key = text[frame.key_start + 1:i]
+                        frame.state = "colon"
+                    else:
+                        # A string value is whole at its closing quote
+                        self._complete_child(frame, i + 1, events)
+                continue
+
+            if char in " \t\r\n":
+                continue
+
+            frame = self._stack[-1]
+            if char == '"':
+                self._in_string = True
+                if frame.kind == "object" and frame.state == "key":
+                    frame.state = "in_key"
+                    frame.key_start = i
+                else:
+                    self._begin_value(frame, i)
+            elif char == ":":
+                frame.state = "value"
+            elif char in "{[":
+                self._begin_value(frame, i)
+                self._stack.append(_Frame("object" if char == "{" else "array", frame.child_path()))
+            elif char in "}]":
+                self._complete_child(frame, i, events)
+                self._stack.pop()
+                if not self._stack:
+                    self._end = i
+                else:
+                    # The closed object/array is whole now, not at the next "," or "]"
+                    self._complete_child(self._stack[-1], i + 1, events)
+            elif char == ",":
+                self._complete_child(frame, i, events)
+                if frame.kind == "object":
+                    frame.state = "key"
+                else:
+                    frame.index += 1
+            else:
+                # Numbers, true/false/null
+                self._begin_value(frame, i)
+        return events
+
+    @staticmethod
+    def _begin_value(frame: _Frame, position: int) -> None:
+        if frame.value_start is None:
+            frame.value_start = position
+            if frame.kind == "object":
+                frame.state = "in_value"
+
+    def _complete_child(self, frame: _Frame, end: int, events: List[Tuple[str, Any, Any]]) -> None:
+        """The value that started at frame.value_start ended just before end"""
+        if frame.value_start is None:
+            return
+        path = frame.child_path()
+        raw = self._text[frame.value_start:end].strip()
+        frame.value_start = None
+
+        if len(path) != 2 or path[0] not in ("extracted_data", "tools_to_call"):
+            return
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError as e:
+            self.errors.append(f"{'.'.join(map(str, path))}: {e.msg}")
+            return
+        if path[0] == "extracted_data" and frame.kind == "object":
+            self.fields[path[1]] = value
+            events.append(("field", path[1], value))
+        elif path[0] == "tools_to_call" and frame.kind == "array":
+            self.tool_calls.append(value)
+            events.append(("tool_call", path[1], value))
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Parse the complete reply
+
+        Raises:
+            MalformedLLMOutput: No object, truncated output or invalid JSON
+        """
+        if self._start is None:
+            raise MalformedLLMOutput("model output contains no JSON object")
+        if self._end is None:
+            raise MalformedLLMOutput("model output ended inside the JSON object (truncated?)")
+        try:
+            parsed = json.loads(self._text[self._start:self._end + 1])
+        except json.JSONDecodeError as e:
+            raise MalformedLLMOutput(f"invalid JSON in model output: {e.msg} at char {e.pos}") from e
+        if not isinstance(parsed, dict):
+            raise MalformedLLMOutput("model output is not a JSON object")
+        return parsed
+
+    def partial(self) -> Dict[str, Any]:
+        """The fields and tool calls that closed before the output went wrong"""
+        return {"extracted_data": self.fields or None, "tools_to_call": list(self.tool_calls)}
+
+    def result(self) -> Tuple[Dict[str, Any], Optional[str]]:
+        """(parsed reply, None), or (partial reply, error message) if malformed"""
+        try:
+            return self.finish(), None
+        except MalformedLLMOutput as e:
+            return self.partial(), str(e)
+
+
+def parse_llm_json(content: str) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Parse a complete reply with the same rules as the streaming path"""
+    parser = IncrementalJSONParser()
+    parser.feed(content)
+    return parser.result()
@@ -0,0 +1,97 @@
+"""
+LLM Provider Selection
+Builds the agent's chat model from configuration so the backend can be swapped
+(Groq in production, the local stand-in server for offline load tests)
+"""
+
+import os
+from typing import Callable, Dict, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_groq import ChatGroq
+
+
+DEFAULT_PROVIDER = "groq"
+DEFAULT_MODEL = "llama-3.3-70b-versatile"
+
+# Where the local stand-in (benchmarks/llm_standin.py) listens by default
+DEFAULT_LOCAL_BASE_URL = "http://127.0.0.1:8001"
+
+
+class LLMSettings:
+    """Resolved provider configuration"""
+
+    def __init__(
+        self,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        temperature: float = 0.1,
+        max_tokens: int = 2048
+    ):
+        self.provider = (provider or os.getenv("LLM_PROVIDER", DEFAULT_PROVIDER)).lower()
+        self.model = model or os.getenv("LLM_MODEL", DEFAULT_MODEL)
+        self.api_key = api_key or os.getenv("GROQ_API_KEY")
+        self.base_url = base_url or os.getenv("LLM_BASE_URL") or None
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+
+
+def _groq_model(settings: LLMSettings) -> BaseChatModel:
+    if not settings.api_key:
+        raise ValueError("GROQ_API_KEY environment variable not set")
+    return ChatGroq(
+        model=settings.model,
+        temperature=settings.temperature,  # Low temperature for structured output
+        groq_api_key=settings.api_key,
+        base_url=settings.base_url,
+        max_tokens=settings.max_tokens,
+        # The SDK's own retries would bypass the scheduler's quota buckets and
+        # backoff; GroqScheduler.run retries 429s and server errors instead
+        max_retries=0
+    )
+
+
+def _local_model(settings: LLMSettings) -> BaseChatModel:
+    # The stand-in speaks the Groq (OpenAI-compatible) protocol, so the same
+    # client is used end to end; only the endpoint and key differ
+    return ChatGroq(
+        model=settings.model,
+        temperature=settings.temperature,
+        groq_api_key=settings.api_key or "local",
+        base_url=settings.base_url or DEFAULT_LOCAL_BASE_URL,
+        max_tokens=settings.max_tokens,
+        max_retries=0
+    )
+
+
+# provider name -> factory(settings) -> chat model
+_providers: Dict[str, Callable[[LLMSettings], BaseChatModel]] = {
+    "groq": _groq_model,
+    "local": _local_model,
+}
+
+
+def register_llm_provider(name: str, factory: Callable[[LLMSettings], BaseChatModel]) -> None:
+    """Make a provider selectable via LLM_PROVIDER=name"""
+    _providers[name.lower()] = factory
+
+
+def create_chat_model(settings: Optional[LLMSettings] = None) -> BaseChatModel:
+    """
+    Build the configured chat model
+
+    Configured by LLM_PROVIDER (groq | local | any registered name),
+    LLM_MODEL and LLM_BASE_URL.
+
+    Raises:
+        ValueError: Unknown provider, or missing credentials for it
+    """
+    settings = settings or LLMSettings()
+    factory = _providers.get(settings.provider)
+    if factory is None:
+        raise ValueError(
+            f"Unknown LLM_PROVIDER '{settings.provider}'. Available: {', '.join(sorted(_providers))}"
+        )
+    return factory(settings)
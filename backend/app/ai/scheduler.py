@@ -0,0 +1,179 @@
+"""
+Rate-limit-aware scheduler for Groq calls
+Token buckets for requests/minute and tokens/minute, bounded concurrency and 429 backoff
+"""
+
+import asyncio
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at capacity per minute
+
+    Waiters are served in arrival order. The balance may go negative after
+    adjust() when a call turns out to cost more than estimated; later callers
+    then wait until the debt is repaid.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float) -> None:
+        """Wait until amount tokens are available, then take them"""
+        # A request larger than the whole bucket could never be served otherwise
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, delta: float) -> None:
+        """Charge (positive) or refund (negative) tokens after the fact"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    return getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    return _status_code(error) == 429 or "rate limit" in str(error).lower()
+
+
+def _is_transient(error: Exception) -> bool:
+    """Server errors and dropped connections, worth retrying like a 429"""
+    status_code = _status_code(error)
+    if isinstance(status_code, int) and status_code >= 500:
+        return True
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Server-suggested wait from a Retry-After header, if present"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+class GroqScheduler:
+    """
+    Admits LLM calls within the account's request and token quotas
+
+    Every call takes one request token and its estimated prompt+completion
+    tokens before it starts, runs under a concurrency cap, and is retried
+    with exponential backoff (or the server's Retry-After) on HTTP 429,
+    5xx and connection errors. The client is built with max_retries=0, so
+    every attempt goes through the buckets here.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float,
+        tokens_per_minute: float,
+        max_concurrency: int,
+        max_retries: int = 5,
+        base_backoff: float = 1.0
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._stats = {"calls": 0, "retries": 0, "rate_limited": 0, "failures": 0}
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        estimated_tokens: int,
+        actual_tokens: Optional[Callable[[Any], Optional[int]]] = None
+    ) -> Any:
+        """
+        Run call() once quota allows, retrying on rate-limit and transient errors
+
+        Args:
+            call: Zero-argument coroutine factory making the LLM request
+            estimated_tokens: Prompt + expected completion tokens
+            actual_tokens: Optional function reading real usage from the result,
+                used to settle the difference with the token bucket
+        """
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                await self.requests.acquire(1)
+                await self.tokens.acquire(estimated_tokens)
+                self._stats["calls"] += 1
+                try:
+                    result = await call()
+                except Exception as e:
+                    rate_limited = _is_rate_limited(e)
+                    if not (rate_limited or _is_transient(e)) or attempt == self.max_retries:
+                        self._stats["failures"] += 1
+                        raise
+                    if rate_limited:
+                        self._stats["rate_limited"] += 1
+                    self._stats["retries"] += 1
+                    delay = _retry_after(e) or self.base_backoff * (2 ** attempt)
+                    await asyncio.sleep(delay + random.uniform(0, delay / 4))
+                    continue
+
+                used = actual_tokens(result) if actual_tokens else None
+                if used:
+                    self.tokens.adjust(used - estimated_tokens)
+                return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Call/retry counters and the current bucket balances"""
+        return {
+            **self._stats,
+            "requests_available": round(self.requests.tokens, 2),
+            "tokens_available": round(self.tokens.tokens, 2),
+        }
+
+
+# ============================================================================
+# SCHEDULER INITIALIZATION
+# ============================================================================
+
+# Global scheduler instance
+_scheduler_instance: Optional[GroqScheduler] = None
+
+
+def get_groq_scheduler() -> GroqScheduler:
+    """
+    Get or create the global Groq scheduler
+    Quotas come from GROQ_RPM, GROQ_TPM, GROQ_MAX_CONCURRENCY and GROQ_MAX_RETRIES
+    """
+    global _scheduler_instance
+
+    if _scheduler_instance is None:
+        _scheduler_instance = GroqScheduler(
+            requests_per_minute=float(os.getenv("GROQ_RPM", "30")),
+            tokens_per_minute=float(os.getenv("GROQ_TPM", "6000")),
+            max_concurrency=int(os.getenv("GROQ_MAX_CONCURRENCY", "4")),
+            max_retries=int(os.getenv("GROQ_MAX_RETRIES", "5")),
+        )
+
+    return _scheduler_instance
@@ -3,9 +3,38 @@ LangGraph Tools for AI-Powered HCP Interaction Logging
 Provides 5+ tools for interaction processing, compliance, and follow-up
 """
 
-from typing import Optional, Dict, List, Any
-from pydantic import BaseModel, Field
+from typing import Optional, Dict, List, Any, Callable, Type
+from pydantic import BaseModel, Field, ValidationError
+from datetime import datetime, timezone
+import bisect
 import json
+import os
+import threading
+import time
+
+from app.ai.compliance import get_compliance_engine
+from app.ai.hcp_index import get_hcp_index
+from app.database import SessionLocal
+# Module import: app.hcps imports app.ai (for hcp_index), which loads this module
+from app import hcps
+
+
+def _hcp_record(hcp_name: str, history_limit: int) -> Optional[Dict[str, Any]]:
+    """HCP entity for a name plus its latest interactions (index range scan), JSON-ready"""
+    with SessionLocal() as db:
+        hcp = hcps.find_hcp(db, hcp_name)
+        if hcp is None:
+            return None
+        history = hcps.hcp_history(db, hcp["id"], limit=history_limit)
+    return {
+        "hcp_id": hcp["id"],
+        "canonical_name": hcp["canonical_name"],
+        "aliases": hcp["aliases"],
+        "history": [
+            {key: value.isoformat() if hasattr(value, "isoformat") else value for key, value in item.items()}
+            for item in history
+        ],
+    }
 
 
 # ============================================================================
@@ -34,7 +63,8 @@ class EditInteractionInput(BaseModel):
 
 class HcpLookupInput(BaseModel):
     """Input schema for HcpLookupTool"""
-    hcp_name: str = Field(..., description="Name to search for")
+    hcp_name: Optional[str] = Field(None, description="Name to search for")
+    text: Optional[str] = Field(None, description="Alternative parameter name for hcp_name")
 
 
 class ComplianceCheckInput(BaseModel):
@@ -157,6 +187,9 @@ class HcpLookupTool:
         self.name = "hcp_lookup"
         self.description = "Search for existing HCP records by name"
     
+    # Minimum similarity for a candidate to count as the same HCP
+    MATCH_SCORE = 0.85
+    
     def execute(self, hcp_name: str = None, text: str = None) -> Dict[str, Any]:
         """
         Look up HCP by name
@@ -171,17 +204,22 @@ class HcpLookupTool:
         # Handle both parameter names
         search_term = hcp_name or text or "Unknown"
         
-        # Simulate lookup (in real scenario, queries DB)
+        candidates = get_hcp_index().lookup(search_term)
+        found = bool(candidates) and candidates[0]["score"] >= self.MATCH_SCORE
+        
+        # Entity record and last interaction for the match
+        record = _hcp_record(candidates[0]["name"], history_limit=1) if found else None
+        
         return {
             "status": "success",
             "message": f"HCP lookup for '{search_term}'",
             "data": {
-                "found": False,
-                "suggestions": [
-                    "Dr. Sarah Johnson",
-                    "Dr. John Smith",
-                    "Dr. Michael Chen"
-                ]
+                "found": found,
+                "match": candidates[0]["name"] if found else None,
+                "hcp_id": record["hcp_id"] if record else None,
+                "last_interaction": record["history"][0] if record and record["history"] else None,
+                "suggestions": [candidate["name"] for candidate in candidates],
+                "candidates": candidates
             }
         }
 
@@ -207,9 +245,9 @@ class ComplianceCheckTool:
         Returns:
             Dict with compliance status and suggestions
         """
-        # Simulate compliance check
-        risky_keywords = ["off-label", "experimental", "unlicensed", "unapproved"]
-        found_issues = [kw for kw in risky_keywords if kw.lower() in text.lower()]
+        # Single pass over the compiled compliance lexicon
+        matches = get_compliance_engine().scan(text)
+        found_issues = list(dict.fromkeys(match["rule"] for match in matches))
         
         if found_issues:
             return {
@@ -218,6 +256,8 @@ class ComplianceCheckTool:
                 "data": {
                     "compliant": False,
                     "issues": found_issues,
+                    "categories": sorted({match["category"] for match in matches}),
+                    "matches": matches,
                     "suggestion": "Consider rephrasing to avoid regulatory concerns"
                 }
             }
@@ -243,6 +283,10 @@ class NextBestActionTool:
         self.name = "next_best_action"
         self.description = "Suggest recommended follow-up actions"
     
+    # Latest interactions considered, and days without contact before re-engaging
+    HISTORY_SIZE = 5
+    REENGAGE_DAYS = 60
+    
     def execute(self, hcp_name: str, interaction_type: str, notes: str) -> Dict[str, Any]:
         """
         Get next recommended actions
@@ -274,11 +318,28 @@ class NextBestActionTool:
         if "issues" in notes.lower() or "problem" in notes.lower():
             actions.append("Escalate to support team if needed")
         
+        # History-based actions from the HCP's timeline
+        record = _hcp_record(hcp_name, history_limit=self.HISTORY_SIZE)
+        history = record["history"] if record else []
+        if not history:
+            actions.append("First recorded interaction: share introductory materials")
+        else:
+            last = history[0]
+            days_since = (
+                datetime.now(timezone.utc).replace(tzinfo=None) - datetime.fromisoformat(last["created_at"])
+            ).days
+            if days_since >= self.REENGAGE_DAYS:
+                actions.append(f"Re-engage: previous contact was {days_since} days ago")
+            if last["hcp_sentiment"] == "Negative":
+                actions.append("Address concerns from the last interaction (negative sentiment)")
+        
         return {
             "status": "success",
             "message": f"Generated recommendations for {hcp_name}",
             "data": {
                 "hcp_name": hcp_name,
+                "hcp_id": record["hcp_id"] if record else None,
+                "recent_interactions": history,
                 "recommended_actions": actions,
                 "priority": "High" if len(actions) > 2 else "Normal"
             }
@@ -289,20 +350,248 @@ class NextBestActionTool:
 # TOOL REGISTRY
 # ============================================================================
 
-def get_all_tools(db_session=None) -> Dict[str, Any]:
+# Seconds a tool may run before the agent gives up on it
+DEFAULT_TOOL_TIMEOUT = float(os.getenv("TOOL_TIMEOUT_SECONDS", "5"))
+
+# Upper bounds (seconds) of the per-tool latency histogram buckets
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class _ToolMetrics:
+    """Call/error/timeout/rejection counters and a latency histogram for one tool"""
+    
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+    
+    def observe(self, seconds: float, error: bool) -> None:
+        self.calls += 1
+        if error:
+            self.errors += 1
+        self.latency_sum += seconds
+        self.latency_max = max(self.latency_max, seconds)
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        # Cumulative counts per upper bound, Prometheus-style
+        cumulative, buckets = 0, {}
+        for bound, count in zip(list(LATENCY_BUCKETS) + ["+Inf"], self.bucket_counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "latency_seconds": {
+                "sum": round(self.latency_sum, 6),
+                "max": round(self.latency_max, 6),
+                "avg": round(self.latency_sum / self.calls, 6) if self.calls else 0.0,
+                "buckets": buckets
+            }
+        }
+
+
+class ToolRegistry:
     """
-    Get all available tools
-    Returns dict mapping tool names to tool instances
+    Long-lived registry of tool instances and their input schemas
+    
+    Dispatch validates input through the tool's pydantic schema before
+    calling execute(), and records per-tool call metrics. A tool that can
+    work on a caller's database session registers a session factory; the
+    others always run as the registered instance.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tools: Dict[str, Any] = {}
+        self._session_factories: Dict[str, Callable[[Any], Any]] = {}
+        self._schemas: Dict[str, Type[BaseModel]] = {}
+        self._timeouts: Dict[str, float] = {}
+        self._metrics: Dict[str, _ToolMetrics] = {}
+    
+    def register(
+        self,
+        tool: Any,
+        input_schema: Type[BaseModel],
+        timeout: Optional[float] = None,
+        session_factory: Optional[Callable[[Any], Any]] = None
+    ) -> None:
+        """
+        Register a tool instance under tool.name (replaces any previous one)
+        
+        Args:
+            tool: Long-lived instance used for every call
+            input_schema: Pydantic model validating the tool input
+            timeout: Seconds before the agent gives up (DEFAULT_TOOL_TIMEOUT if None)
+            session_factory: Optional callable(db_session) returning an instance
+                bound to that session, used when a caller supplies one
+        """
+        with self._lock:
+            self._tools[tool.name] = tool
+            if session_factory is not None:
+                self._session_factories[tool.name] = session_factory
+            else:
+                self._session_factories.pop(tool.name, None)
+            self._schemas[tool.name] = input_schema
+            self._timeouts[tool.name] = timeout if timeout is not None else DEFAULT_TOOL_TIMEOUT
+            self._metrics.setdefault(tool.name, _ToolMetrics())
+    
+    def __contains__(self, tool_name: str) -> bool:
+        return tool_name in self._tools
+    
+    @property
+    def tools(self) -> Dict[str, Any]:
+        return dict(self._tools)
+    
+    def schema(self, tool_name: str) -> Optional[Type[BaseModel]]:
+        return self._schemas.get(tool_name)
+    
+    def timeout(self, tool_name: str) -> float:
+        return self._timeouts.get(tool_name, DEFAULT_TOOL_TIMEOUT)
+    
+    def bound_tool(self, tool_name: str, db_session: Any = None) -> Any:
+        """Instance to run for a call: bound to db_session if the tool has a factory, else the registered one"""
+        factory = self._session_factories.get(tool_name)
+        if db_session is not None and factory is not None:
+            return factory(db_session)
+        return self._tools.get(tool_name)
+    
+    def execute(self, tool_name: str, tool_input: Dict[str, Any], tool: Any = None) -> Dict[str, Any]:
+        """
+        Validate input against the tool's schema and run it
+        
+        Args:
+            tool_name: Registered tool name
+            tool_input: Raw input (usually from the LLM)
+            tool: Optional instance to run instead of the registered one
+            
+        Returns:
+            Tool result, or an error result for unknown tools / invalid input
+        """
+        if tool_name not in self._tools:
+            return {
+                "status": "error",
+                "message": f"Tool '{tool_name}' not found",
+                "data": None
+            }
+        
+        started = time.perf_counter()
+        try:
+            validated = self._schemas[tool_name].model_validate(tool_input or {})
+            result = (tool or self._tools[tool_name]).execute(**validated.model_dump())
+        except ValidationError as e:
+            result = {
+                "status": "error",
+                "message": f"Invalid input for tool '{tool_name}': " + "; ".join(
+                    f"{'.'.join(str(loc) for loc in err['loc']) or 'input'}: {err['msg']}"
+                    for err in e.errors()
+                ),
+                "data": None
+            }
+        except Exception as e:
+            result = {
+                "status": "error",
+                "message": f"Tool execution failed: {str(e)}",
+                "data": None
+            }
+        elapsed = time.perf_counter() - started
+        
+        with self._lock:
+            self._metrics[tool_name].observe(elapsed, error=result.get("status") == "error")
+        return result
+    
+    def record_timeout(self, tool_name: str) -> None:
+        """Count a call the caller abandoned after its timeout"""
+        with self._lock:
+            if tool_name in self._metrics:
+                self._metrics[tool_name].timeouts += 1
+    
+    def record_rejected(self, tool_name: str) -> None:
+        """Count a call refused because the tool pool's backlog was full"""
+        with self._lock:
+            if tool_name in self._metrics:
+                self._metrics[tool_name].rejected += 1
+    
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-tool metrics snapshot"""
+        with self._lock:
+            return {name: metrics.snapshot() for name, metrics in self._metrics.items()}
+
+
+# Global registry; built-in tools are registered below, plugins call register_tool()
+_registry = ToolRegistry()
+
+
+def get_tool_registry() -> ToolRegistry:
+    """Get the global tool registry"""
+    return _registry
+
+
+def register_tool(
+    tool: Any,
+    input_schema: Type[BaseModel],
+    timeout: Optional[float] = None,
+    session_factory: Optional[Callable[[Any], Any]] = None
+) -> None:
+    """
+    Register a tool (any object with name and execute()) with the global registry
+    
+    Pass session_factory (callable taking a db_session) if the tool should
+    use a caller's session in execute_tool(); without one the registered
+    instance, with its own configuration, serves every call.
     """
+    _registry.register(tool, input_schema, timeout, session_factory)
+
+
+register_tool(LogInteractionTool(), LogInteractionInput, timeout=1.0, session_factory=LogInteractionTool)
+register_tool(EditInteractionTool(), EditInteractionInput, timeout=2.0, session_factory=EditInteractionTool)
+register_tool(HcpLookupTool(), HcpLookupInput, timeout=2.0, session_factory=HcpLookupTool)
+register_tool(ComplianceCheckTool(), ComplianceCheckInput, timeout=2.0, session_factory=ComplianceCheckTool)
+register_tool(NextBestActionTool(), NextBestActionInput, session_factory=NextBestActionTool)
+
+
+def get_tool_timeout(tool_name: str) -> float:
+    """Timeout in seconds for a tool, DEFAULT_TOOL_TIMEOUT if not configured"""
+    return _registry.timeout(tool_name)
+
+
+def tool_timeout_result(tool_name: str) -> Dict[str, Any]:
+    """Partial result reported when a tool exceeds its timeout"""
+    _registry.record_timeout(tool_name)
     return {
-        "log_interaction": LogInteractionTool(db_session),
-        "edit_interaction": EditInteractionTool(db_session),
-        "hcp_lookup": HcpLookupTool(db_session),
-        "compliance_check": ComplianceCheckTool(db_session),
-        "next_best_action": NextBestActionTool(db_session),
+        "status": "timeout",
+        "message": f"Tool '{tool_name}' timed out after {get_tool_timeout(tool_name)}s",
+        "data": None
     }
 
 
+def tool_rejected_result(tool_name: str) -> Dict[str, Any]:
+    """Result reported when the tool pool is too backed up to take the call"""
+    _registry.record_rejected(tool_name)
+    return {
+        "status": "rejected",
+        "message": f"Tool '{tool_name}' not run: too many tool calls are still running",
+        "data": None
+    }
+
+
+def get_all_tools(db_session=None) -> Dict[str, Any]:
+    """
+    Get all available tools
+    Returns dict mapping tool names to tool instances; with db_session,
+    tools registered with a session_factory are bound to it
+    """
+    if db_session is None:
+        return _registry.tools
+    return {name: _registry.bound_tool(name, db_session) for name in _registry.tools}
+
+
 def execute_tool(tool_name: str, tool_input: Dict[str, Any], db_session=None) -> Dict[str, Any]:
     """
     Execute a tool by name with given input
@@ -310,27 +599,11 @@ def execute_tool(tool_name: str, tool_input: Dict[str, Any], db_session=None) ->
     Args:
         tool_name: Name of tool to execute
         tool_input: Input parameters for tool
-        db_session: Database session for tools that need it
+        db_session: Database session for tools registered with a session_factory
         
     Returns:
         Tool execution result
     """
-    tools = get_all_tools(db_session)
+    tool = _registry.bound_tool(tool_name, db_session) if db_session is not None else None
     
-    if tool_name not in tools:
-        return {
-            "status": "error",
-            "message": f"Tool '{tool_name}' not found",
-            "data": None
-        }
-    
-    tool = tools[tool_name]
-    
-    try:
-        return tool.execute(**tool_input)
-    except Exception as e:
-        return {
-            "status": "error",
-            "message": f"Tool execution failed: {str(e)}",
-            "data": None
-        }
+    return _registry.execute(tool_name, tool_input, tool=tool)
@@ -0,0 +1,352 @@
+"""
+Agent Tracing
+Timing spans for each chat turn: the graph nodes, the LLM completion and
+every tool call, nested under one trace. Finished traces go to pluggable
+exporters; the built-in one appends OTLP/JSON to a local file, so traces
+can be collected offline and summarized for tail latency
+(benchmarks/summarize_traces.py).
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import os
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+SERVICE_NAME = "hcp-crm-api"
+
+# OTLP span status codes
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("hcp_current_span", default=None)
+
+
+class Span:
+    """One timed operation; nested spans share their root's Trace"""
+
+    __slots__ = ("name", "trace", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "status", "error")
+
+    def __init__(self, name: str, trace: "Trace", parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = STATUS_UNSET
+        self.error: Optional[str] = None
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def end(self, error: Optional[str] = None) -> None:
+        """Finish the span (only the first call counts); ending the root finishes the trace"""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        if error:
+            self.status, self.error = STATUS_ERROR, error
+        elif self.status == STATUS_UNSET:
+            self.status = STATUS_OK
+        self.trace.finish_span(self)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+
+class Trace:
+    """Spans of one chat turn, handed to the exporters when the root span ends"""
+
+    def __init__(self, tracer: "Tracer"):
+        self.tracer = tracer
+        self.trace_id = os.urandom(16).hex()
+        self.root: Optional[Span] = None
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def finish_span(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+        if span is self.root:
+            self.tracer.export(self)
+
+    def timings(self) -> Dict[str, Any]:
+        """Span breakdown relative to the root's start (the debug=timings payload)"""
+        start = self.root.start_ns if self.root else 0
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start_ns)
+        return {
+            "trace_id": self.trace_id,
+            "total_ms": round(self.root.duration_ms, 2) if self.root else None,
+            "spans": [
+                {
+                    "name": span.name,
+                    "span_id": span.span_id,
+                    "parent_id": span.parent_id,
+                    "start_ms": round((span.start_ns - start) / 1e6, 2),
+                    "duration_ms": round(span.duration_ms, 2),
+                    "attributes": span.attributes,
+                    **({"error": span.error} if span.error else {})
+                }
+                for span in spans
+            ]
+        }
+
+
+# ============================================================================
+# EXPORTERS
+# ============================================================================
+
+class SpanExporter(ABC):
+    """
+    Receives every finished trace; subclass and pass to register_exporter()
+
+    export() is called on the thread that ended the root span, usually the
+    event loop, so it must not block: hand slow work (I/O, network) to a
+    background thread as OTLPJsonFileExporter does.
+    """
+
+    @abstractmethod
+    def export(self, trace: Trace) -> None:
+        """Accept one finished trace"""
+
+    def shutdown(self) -> None:
+        """Flush anything buffered (called once at application shutdown)"""
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        # OTLP/JSON encodes 64-bit integers as strings
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(item) for item in value]}}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+def to_otlp_json(trace: Trace) -> Dict[str, Any]:
+    """A trace as an OTLP/JSON ExportTraceServiceRequest"""
+    spans = []
+    for span in trace.spans:
+        record = {
+            "traceId": trace.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": _otlp_attributes(span.attributes),
+            "status": {"code": span.status, **({"message": span.error} if span.error else {})}
+        }
+        if span.parent_id:
+            record["parentSpanId"] = span.parent_id
+        spans.append(record)
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{"scope": {"name": "app.ai.tracing"}, "spans": spans}]
+        }]
+    }
+
+
+class OTLPJsonFileExporter(SpanExporter):
+    """
+    Appends one OTLP/JSON request per trace to a file (JSON Lines)
+
+    The format is what the OpenTelemetry Collector's file exporter writes,
+    so the file can be replayed into any OTLP backend later, or summarized
+    directly with benchmarks/summarize_traces.py. export() only queues the
+    trace; a writer thread serializes and appends it, so the event loop
+    never waits on disk. Traces beyond max_queue are dropped and counted.
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: str, max_queue: int = 10000):
+        self.path = path
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+        self.write_errors = 0
+
+    def export(self, trace: Trace) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trace-file-exporter", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # Append everything already waiting with one open()
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is self._STOP for item in batch)
+            lines = [
+                json.dumps(to_otlp_json(item), default=str, separators=(",", ":")) + "\n"
+                for item in batch if item is not self._STOP
+            ]
+            if lines:
+                try:
+                    with open(self.path, "a", encoding="utf-8") as handle:
+                        handle.writelines(lines)
+                except Exception:
+                    self.write_errors += len(lines)
+            if stop:
+                return
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Write out the queued traces and stop the writer thread"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(self._STOP)
+        thread.join(timeout)
+        self._thread = None
+
+
+# ============================================================================
+# TRACER
+# ============================================================================
+
+class Tracer:
+    """Creates spans in the current context and fans finished traces out to exporters"""
+
+    def __init__(self):
+        self.exporters: List[SpanExporter] = []
+        self._stats = {"traces": 0, "export_errors": 0}
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        self.exporters.append(exporter)
+
+    def start_span(self, name: str, parent: Optional[Span] = None, **attributes: Any) -> Span:
+        """
+        Start a span without making it current (for work handed to threads)
+
+        Its parent is the given span, else the current one; without either
+        it is the root of a new trace.
+        """
+        parent = parent or _current_span.get()
+        if parent is None:
+            trace = Trace(self)
+            span = Span(name, trace, None, attributes)
+            trace.root = span
+            return span
+        return Span(name, parent.trace, parent.span_id, attributes)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Run a block inside a new current span; an exception marks it as failed"""
+        span = self.start_span(name, **attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.end(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            try:
+                _current_span.reset(token)
+            except ValueError:
+                # A streaming generator closed from another context; its own copy is dropped anyway
+                pass
+            span.end()
+
+    def export(self, trace: Trace) -> None:
+        self._stats["traces"] += 1
+        for exporter in self.exporters:
+            try:
+                exporter.export(trace)
+            except Exception:
+                # Tracing must never fail the request it measures
+                self._stats["export_errors"] += 1
+
+    def shutdown(self) -> None:
+        """Flush every exporter (blocking; run off the event loop)"""
+        for exporter in self.exporters:
+            try:
+                exporter.shutdown()
+            except Exception:
+                self._stats["export_errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self._stats, "exporters": [type(exporter).__name__ for exporter in self.exporters]}
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def set_span_attributes(**attributes: Any) -> None:
+    """Add attributes to the current span, if any"""
+    span = _current_span.get()
+    if span is not None:
+        span.set_attributes(**attributes)
+
+
+def traced_node(name: str, func: Callable) -> Callable:
+    """
+    Wrap a graph node (sync or async) in a span named after it
+
+    functools.wraps keeps the signature visible, so LangGraph still passes
+    config to nodes that accept it.
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_node(*args, **kwargs):
+            with get_tracer().span(name, **{"graph.node": name}):
+                return await func(*args, **kwargs)
+        return async_node
+
+    @functools.wraps(func)
+    def node(*args, **kwargs):
+        with get_tracer().span(name, **{"graph.node": name}):
+            return func(*args, **kwargs)
+    return node
+
+
+# Global tracer instance
+_tracer_instance: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """
+    Get or create the agent tracer
+    TRACE_EXPORT_FILE enables the OTLP/JSON file exporter
+    """
+    global _tracer_instance
+    if _tracer_instance is None:
+        _tracer_instance = Tracer()
+        path = os.getenv("TRACE_EXPORT_FILE")
+        if path:
+            _tracer_instance.add_exporter(OTLPJsonFileExporter(path))
+    return _tracer_instance
+
+
+def register_exporter(exporter: SpanExporter) -> None:
+    """Send every finished trace to exporter as well"""
+    get_tracer().add_exporter(exporter)
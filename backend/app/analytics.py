@@ -0,0 +1,82 @@
+"""
+Interaction analytics served from the interaction_rollups table
+Counts by HCP, interaction type, sentiment, day or week cost one indexed
+read of the rollup rows, however many interactions are stored.
+
+Rebuild (backfill or repair) the rollups from the command line:
+    python -m app.analytics rebuild
+"""
+
+import argparse
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import asc, desc, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Hcp, InteractionRollup, rebuild_interaction_rollups
+
+# Dimensions whose buckets are ISO dates, listed in date order
+DATE_DIMENSIONS = ("day", "week")
+
+
+async def rollup_counts(
+    db: AsyncSession,
+    dimension: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = 100
+) -> List[Dict[str, Any]]:
+    """
+    {"bucket", "count"} rows for one dimension
+
+    Date dimensions are returned oldest first and can be bounded by
+    date_from / date_to; the others are returned largest count first.
+    HCP buckets are labelled with the canonical name and carry the hcp_id.
+    """
+    query = select(InteractionRollup.bucket, InteractionRollup.interaction_count).where(
+        InteractionRollup.dimension == dimension,
+        InteractionRollup.interaction_count > 0
+    )
+    if dimension in DATE_DIMENSIONS:
+        if date_from:
+            query = query.where(InteractionRollup.bucket >= date_from.isoformat())
+        if date_to:
+            query = query.where(InteractionRollup.bucket <= date_to.isoformat())
+        query = query.order_by(asc(InteractionRollup.bucket))
+    else:
+        query = query.order_by(desc(InteractionRollup.interaction_count), asc(InteractionRollup.bucket))
+    
+    rows = [{"bucket": bucket, "count": count} for bucket, count in (await db.execute(query.limit(limit))).all()]
+    if dimension == "hcp":
+        await _label_hcp_buckets(db, rows)
+    return rows
+
+
+async def _label_hcp_buckets(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """Replace hcps.id buckets with the canonical name (one primary-key lookup for the page)"""
+    ids = [int(row["bucket"]) for row in rows if row["bucket"].isdigit()]
+    names = {}
+    if ids:
+        names = dict((await db.execute(select(Hcp.id, Hcp.canonical_name).where(Hcp.id.in_(ids)))).all())
+    for row in rows:
+        if row["bucket"].isdigit():
+            row["hcp_id"] = int(row["bucket"])
+            row["bucket"] = names.get(row["hcp_id"], row["bucket"])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Interaction analytics rollups")
+    parser.add_argument("command", choices=["rebuild"], help="rebuild: recompute all rollups from interactions")
+    parser.parse_args(argv)
+
+    from app.database import create_tables, engine
+
+    create_tables()
+    with engine.begin() as connection:
+        buckets = rebuild_interaction_rollups(connection)
+    print(f"Interaction rollups rebuilt ({buckets} buckets)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Group commit for interaction inserts
+Concurrent saves are collected for a short window (or until the batch is
+full) and written in one transaction with INSERT ... RETURNING, so a burst
+of confirms costs one commit instead of one per request.
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import AsyncWriteSessionLocal, PoolTimeoutError, async_write_engine
+from app.hcps import assign_hcp_ids_async
+from app.models import Interaction
+from app.read_cache import get_read_cache
+
+
+class GroupCommitWriter:
+    """
+    Batches single-row interaction inserts from concurrent requests
+
+    insert() only returns once the transaction holding the row has
+    committed, so each caller gets the same durability as its own
+    commit. While one batch is committing, new rows queue for the next.
+    """
+
+    def __init__(self, window_ms: float = 2.0, max_batch: int = 64):
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flusher: Optional[asyncio.Task] = None
+        self._full: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Counters
+        self.batches = 0
+        self.rows = 0
+        self.largest_batch = 0
+        self.fallbacks = 0
+
+    async def insert(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Queue one interaction row and wait for its commit
+
+        Returns:
+            The row with the assigned id and created_at
+
+        Raises:
+            SQLAlchemyError: The row itself was rejected by the database
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # First use, or a new event loop (e.g. test clients); nothing carries over
+            self._loop = loop
+            self._pending = []
+            self._flusher = None
+
+        future = loop.create_future()
+        self._pending.append((row, future))
+
+        if self._flusher is None:
+            self._full = asyncio.Event()
+            self._flusher = loop.create_task(self._flush())
+        elif len(self._pending) >= self.max_batch:
+            self._full.set()
+
+        return await future
+
+    async def _flush(self) -> None:
+        """Wait out the window, then write batches until the queue is empty"""
+        batch: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        try:
+            if self.window > 0 and len(self._pending) < self.max_batch:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.window)
+                except asyncio.TimeoutError:
+                    pass
+
+            while self._pending:
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+                await self._write_batch(batch)
+        except BaseException as e:
+            # Cancelled (e.g. at shutdown) or crashed: no caller may be left waiting
+            # on a row that will never be written. Rows of an interrupted batch may
+            # or may not have committed, so they fail rather than being retried.
+            error = e if isinstance(e, Exception) else RuntimeError("interaction writer stopped before the row was saved")
+            pending, self._pending = self._pending, []
+            self._fail(batch + pending, error)
+            raise
+        finally:
+            self._flusher = None
+
+    async def _write_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """Commit a batch; if it is rejected, retry row by row so only bad rows fail"""
+        rows = [row for row, _ in batch]
+        try:
+            async with AsyncWriteSessionLocal() as db:
+                assigned = await self._insert_returning(db, rows)
+                await db.commit()
+            get_read_cache().record_write()
+        except PoolTimeoutError as e:
+            # The writer is saturated; retrying row by row would only queue longer
+            self._fail(batch, e)
+            return
+        except SQLAlchemyError:
+            assigned = None
+        except Exception as e:
+            self._fail(batch, e)
+            return
+
+        if assigned is not None:
+            self.batches += 1
+            self.rows += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+            for (row, future), (row_id, created_at) in zip(batch, assigned):
+                if not future.done():
+                    future.set_result({**row, "id": row_id, "created_at": created_at})
+            return
+
+        self.fallbacks += 1
+        for row, future in batch:
+            try:
+                async with AsyncWriteSessionLocal() as db:
+                    [(row_id, created_at)] = await self._insert_returning(db, [row])
+                    await db.commit()
+                get_read_cache().record_write()
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.rows += 1
+            if not future.done():
+                future.set_result({**row, "id": row_id, "created_at": created_at})
+
+    @staticmethod
+    def _fail(batch: List[Tuple[Dict[str, Any], asyncio.Future]], error: BaseException) -> None:
+        """Raise error in every caller of batch still waiting"""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+    
+    @staticmethod
+    async def _insert_returning(db: AsyncSession, rows: List[Dict[str, Any]]) -> List[Tuple[int, datetime]]:
+        """Insert rows (linked to their HCP) and return their (id, created_at), in input order"""
+        table = Interaction.__table__
+        await assign_hcp_ids_async(db, rows)
+
+        if async_write_engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+            result = await db.execute(
+                insert(table).returning(table.c.id, table.c.created_at, sort_by_parameter_order=True),
+                rows
+            )
+            return [tuple(record) for record in result.all()]
+
+        # No RETURNING for executemany (MySQL): insert one by one in the same
+        # transaction and read created_at back in one query before the commit
+        ids = []
+        for row in rows:
+            result = await db.execute(insert(table), row)
+            ids.append(result.inserted_primary_key[0])
+        created = dict((await db.execute(
+            select(table.c.id, table.c.created_at).where(table.c.id.in_(ids))
+        )).all())
+        return [(row_id, created[row_id]) for row_id in ids]
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch counters"""
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "avg_batch_size": round(self.rows / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "fallbacks": self.fallbacks,
+            "pending": len(self._pending),
+            "window_ms": self.window * 1000,
+            "max_batch": self.max_batch
+        }
+
+
+# Global writer instance
+_writer_instance: Optional[GroupCommitWriter] = None
+
+
+def get_interaction_writer() -> GroupCommitWriter:
+    """Get or create the group-commit writer for interactions"""
+    global _writer_instance
+    if _writer_instance is None:
+        _writer_instance = GroupCommitWriter(
+            window_ms=float(os.getenv("WRITE_BATCH_WINDOW_MS", "2")),
+            max_batch=int(os.getenv("WRITE_BATCH_MAX_SIZE", "64"))
+        )
+    return _writer_instance
@@ -0,0 +1,131 @@
+"""
+HCP entity resolution
+Maps free-text HCP names onto rows of the hcps table, so every spelling
+variant of a person ("Dr. Sarah Johnson", "sarah johnson, MD") shares one
+hcp_id and their interactions sit together in the (hcp_id, created_at) index.
+"""
+
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import func, insert, select, update
+
+from app.ai.hcp_index import normalize_hcp_name
+from app.database import engine
+from app.models import Hcp, Interaction
+
+
+def _resolve_names(db, names: Iterable[str]) -> Dict[str, int]:
+    """
+    hcp_id for each name, creating hcps rows for new people and recording
+    new spellings as aliases. db is a sync Session or Connection.
+    """
+    by_key: Dict[str, List[str]] = defaultdict(list)
+    for name in dict.fromkeys(names):
+        # Missing names are left for the NOT NULL constraint to reject
+        key = normalize_hcp_name(name) if isinstance(name, str) else ""
+        if key:
+            by_key[key].append(name)
+    if not by_key:
+        return {}
+
+    table = Hcp.__table__
+    missing = set(by_key) - set(db.execute(
+        select(table.c.normalized_name).where(table.c.normalized_name.in_(list(by_key)))
+    ).scalars())
+    if missing:
+        # A concurrent writer may create the same HCP first; keep its row
+        db.execute(
+            insert(table).prefix_with("OR IGNORE", dialect="sqlite").prefix_with("IGNORE", dialect="mysql"),
+            [
+                {"canonical_name": by_key[key][0], "normalized_name": key, "aliases": by_key[key]}
+                for key in missing
+            ]
+        )
+
+    ids: Dict[str, int] = {}
+    for hcp_id, key, aliases in db.execute(
+        select(table.c.id, table.c.normalized_name, table.c.aliases)
+        .where(table.c.normalized_name.in_(list(by_key)))
+    ).all():
+        new_aliases = [name for name in by_key[key] if name not in aliases]
+        if new_aliases:
+            db.execute(update(table).where(table.c.id == hcp_id).values(aliases=list(aliases) + new_aliases))
+        for name in by_key[key]:
+            ids[name] = hcp_id
+    return ids
+
+
+def assign_hcp_ids(db, rows: List[Dict[str, Any]]) -> None:
+    """Set row["hcp_id"] on interaction rows about to be inserted (sync Session or Connection)"""
+    ids = _resolve_names(db, (row["hcp_name"] for row in rows))
+    for row in rows:
+        row["hcp_id"] = ids.get(row["hcp_name"])
+
+
+async def assign_hcp_ids_async(db, rows: List[Dict[str, Any]]) -> None:
+    """assign_hcp_ids on an AsyncSession, inside the caller's transaction"""
+    await db.run_sync(lambda session: assign_hcp_ids(session, rows))
+
+
+def backfill_hcp_ids(batch_size: int = 1000) -> int:
+    """
+    Link interactions without an hcp_id to hcps rows (the one-off migration
+    for existing databases, a no-op afterwards)
+
+    Spelling variants are de-duplicated through normalize_hcp_name; the most
+    common spelling becomes the canonical name of a new HCP.
+
+    Returns:
+        Number of interactions linked
+    """
+    table = Interaction.__table__
+    with engine.begin() as connection:
+        counts = connection.execute(
+            select(table.c.hcp_name, func.count())
+            .where(table.c.hcp_id.is_(None))
+            .group_by(table.c.hcp_name)
+        ).all()
+        if not counts:
+            return 0
+
+        # Most common spelling first, so it is the one that names a new HCP
+        spellings = Counter(dict(counts))
+        names = [name for name, _ in spellings.most_common()]
+        ids: Dict[str, int] = {}
+        for start in range(0, len(names), batch_size):
+            ids.update(_resolve_names(connection, names[start:start + batch_size]))
+
+        by_id: Dict[int, List[str]] = defaultdict(list)
+        for name, hcp_id in ids.items():
+            by_id[hcp_id].append(name)
+        for hcp_id, hcp_names in by_id.items():
+            connection.execute(
+                update(table)
+                .where(table.c.hcp_id.is_(None), table.c.hcp_name.in_(hcp_names))
+                .values(hcp_id=hcp_id)
+            )
+        return sum(spellings[name] for name in ids)
+
+
+def hcp_history(db, hcp_id: int, limit: int = 5) -> List[Dict[str, Any]]:
+    """Latest interactions of one HCP (sync Session), newest first, from the timeline index"""
+    table = Interaction.__table__
+    rows = db.execute(
+        select(table.c.id, table.c.interaction_type, table.c.date, table.c.hcp_sentiment, table.c.created_at)
+        .where(table.c.hcp_id == hcp_id)
+        .order_by(table.c.created_at.desc(), table.c.id.desc())
+        .limit(limit)
+    ).all()
+    return [dict(row._mapping) for row in rows]
+
+
+def find_hcp(db, name: str) -> Optional[Dict[str, Any]]:
+    """The hcps row a name resolves to, without creating one (sync Session)"""
+    key = normalize_hcp_name(name)
+    if not key:
+        return None
+    row = db.execute(
+        select(Hcp.__table__).where(Hcp.__table__.c.normalized_name == key)
+    ).first()
+    return dict(row._mapping) if row else None
@@ -1,10 +1,33 @@
+import asyncio
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
-from app.database import create_tables
+from app import metrics
+from app.database import (
+    WRITE_RETRY_AFTER_SECONDS,
+    PoolTimeoutError,
+    async_engine,
+    async_write_engine,
+    create_tables,
+    engine
+)
+from app.ai.agent import _tool_executor
+from app.ai.checkpointer import get_checkpointer
+from app.ai.hcp_index import get_hcp_index
+from app.ai.tools import get_tool_registry
+from app.ai.tracing import get_tracer
+from app.hcps import backfill_hcp_ids
 from app.routes import interaction
 from app.routes import ai_chat
+from app.routes import analytics
+from app.routes import hcps
+
+# Idle chat sessions are removed at startup and then every CHAT_SESSION_PRUNE_MINUTES
+CHAT_SESSION_TTL_HOURS = float(os.getenv("CHAT_SESSION_TTL_HOURS", "72"))
+CHAT_SESSION_PRUNE_MINUTES = float(os.getenv("CHAT_SESSION_PRUNE_MINUTES", "60"))
 
 # Create FastAPI application
 app = FastAPI(
@@ -20,8 +43,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
+# Request latency by route and status, plus DB/LLM/tool/pool metrics for GET /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+_engines = {"sync": engine, "read": async_engine.sync_engine}
+if async_write_engine is not async_engine:
+    # One shared engine on MySQL; a second listener would count each query twice
+    _engines["write"] = async_write_engine.sync_engine
+for _role, _engine in _engines.items():
+    metrics.instrument_engine(_engine, _role)
+metrics.registry.add_collector(metrics.pool_collector(_engines))
+metrics.registry.add_collector(metrics.threadpool_collector({"tools": _tool_executor}))
+metrics.registry.add_collector(metrics.tool_collector(get_tool_registry()))
+
 
 # Create database tables on startup
 @app.on_event("startup")
@@ -30,6 +66,45 @@ def startup_event():
     print("Initializing database tables...")
     create_tables()
     print("Database tables created successfully!")
+    linked = backfill_hcp_ids()
+    if linked:
+        print(f"Linked {linked} interactions to HCP records")
+    hcp_count = get_hcp_index().rebuild()
+    print(f"HCP name index loaded ({hcp_count} HCPs)")
+
+
+async def _prune_sessions_periodically():
+    """Remove idle chat sessions every CHAT_SESSION_PRUNE_MINUTES while the server runs"""
+    while True:
+        await asyncio.sleep(CHAT_SESSION_PRUNE_MINUTES * 60)
+        try:
+            await get_checkpointer().aprune_sessions(CHAT_SESSION_TTL_HOURS)
+        except Exception as e:
+            print(f"Chat session pruning failed: {e}")
+
+
+@app.on_event("startup")
+async def start_session_pruning():
+    """Put chat session writes on the single writer, prune idle sessions and start the pruner"""
+    checkpointer = get_checkpointer()
+    checkpointer.attach_loop(asyncio.get_running_loop())
+    expired = await checkpointer.aprune_sessions(CHAT_SESSION_TTL_HOURS)
+    print(f"Expired chat sessions removed: {expired}")
+    app.state.session_pruner = asyncio.create_task(_prune_sessions_periodically())
+
+
+@app.on_event("shutdown")
+async def stop_session_pruning():
+    """Stop the background session pruner"""
+    pruner = getattr(app.state, "session_pruner", None)
+    if pruner is not None:
+        pruner.cancel()
+
+
+@app.on_event("shutdown")
+async def flush_traces():
+    """Write out traces still queued for the exporters"""
+    await asyncio.to_thread(get_tracer().shutdown)
 
 
 # Health check endpoint
@@ -42,9 +117,28 @@ def health_check():
     )
 
 
+# A write that waited too long for a database connection is retryable, not a server fault
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request, exc):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database is busy with other writes, please retry"},
+        headers={"Retry-After": str(WRITE_RETRY_AFTER_SECONDS)}
+    )
+
+
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Metrics in the Prometheus text exposition format"""
+    return Response(content=metrics.render_metrics(), media_type=metrics.CONTENT_TYPE)
+
+
 # Include routers
 app.include_router(interaction.router)
 app.include_router(ai_chat.router)
+app.include_router(analytics.router)
+app.include_router(hcps.router)
 
 
 # Root endpoint
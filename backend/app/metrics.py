@@ -0,0 +1,321 @@
+"""
+Prometheus metrics
+Counters and histograms in the text exposition format (served at /metrics),
+with no client library. Recording is a lock, a dict lookup and a bisect;
+pool and threadpool depth and tool metrics are read only when /metrics
+is scraped.
+"""
+
+import bisect
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+LLM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels: Any, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}"
+
+
+class Histogram:
+    """Bucketed distribution per label set (cumulative buckets on export)"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = HTTP_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # labels -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple, List[float]] = {}
+
+    def observe(self, seconds: float, *labels: Any) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += seconds
+            series[-1] += 1
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = [(labels, list(series)) for labels, series in self._values.items()]
+        for labels, series in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(series[-2])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {series[-1]}"
+
+
+class MetricsRegistry:
+    """
+    Metrics registered by name, plus collectors called at scrape time
+
+    A collector yields (name, kind, help, samples) families, where samples
+    are (sample name, labels dict, value) tuples; use it for values that are
+    cheaper to read on demand than to track (pool depth, existing stats).
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._collectors: List[Callable[[], Iterable[Tuple[str, str, str, Iterable[Tuple[str, Dict[str, Any], float]]]]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = HTTP_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        for collector in self._collectors:
+            try:
+                families = list(collector())
+            except Exception:
+                # A failing collector must not take the whole scrape down
+                continue
+            for name, kind, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {kind}")
+                for sample, labels, value in samples:
+                    lines.append(f"{sample}{_labels(list(labels), list(labels.values()))} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# ============================================================================
+# APPLICATION METRICS
+# ============================================================================
+
+registry = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency (until the last body chunk is sent)",
+    ("method", "route", "status")
+)
+DB_QUERY_DURATION = registry.histogram(
+    "db_query_duration_seconds", "SQL statement execution time", ("engine", "statement"), DB_BUCKETS
+)
+DB_QUERY_ERRORS = registry.counter("db_query_errors_total", "SQL statements that raised", ("engine",))
+LLM_REQUEST_DURATION = registry.histogram(
+    "llm_request_duration_seconds", "LLM completion latency (excluding rate-limit queueing)",
+    ("provider", "model", "outcome"), LLM_BUCKETS
+)
+LLM_PROMPT_TOKENS = registry.counter("llm_prompt_tokens_total", "Prompt tokens reported by the provider", ("provider", "model"))
+LLM_COMPLETION_TOKENS = registry.counter(
+    "llm_completion_tokens_total", "Completion tokens reported by the provider", ("provider", "model")
+)
+
+
+def observe_llm_call(provider: str, model: str, started: float, response: Any = None, error: bool = False) -> None:
+    """Record one LLM call that began at started (time.perf_counter())"""
+    LLM_REQUEST_DURATION.observe(time.perf_counter() - started, provider, model, "error" if error else "ok")
+    usage = getattr(response, "usage_metadata", None) or {}
+    if usage.get("input_tokens"):
+        LLM_PROMPT_TOKENS.inc(provider, model, amount=usage["input_tokens"])
+    if usage.get("output_tokens"):
+        LLM_COMPLETION_TOKENS.inc(provider, model, amount=usage["output_tokens"])
+
+
+def _statement_kind(statement: str) -> str:
+    head = statement.lstrip()[:8].upper()
+    for kind in ("SELECT", "INSERT", "UPDATE", "DELETE"):
+        if head.startswith(kind):
+            return kind.lower()
+    return "other"
+
+
+def instrument_engine(engine, role: str) -> None:
+    """Time every statement on a (sync) engine and count failures"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        DB_QUERY_DURATION.observe(time.perf_counter() - started, role, _statement_kind(statement))
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+        DB_QUERY_ERRORS.inc(role)
+
+
+def pool_collector(engines: Dict[str, Any]) -> Callable:
+    """Collector for connection pool depth of each named engine"""
+
+    def collect():
+        gauges = {
+            "db_pool_size": ("Connections the pool keeps open", "size"),
+            "db_pool_checked_out": ("Connections currently in use", "checkedout"),
+            "db_pool_checked_in": ("Idle connections in the pool", "checkedin"),
+            "db_pool_overflow": ("Connections opened beyond the pool size", "overflow"),
+        }
+        for name, (documentation, method) in gauges.items():
+            samples = [
+                (name, {"engine": role}, getattr(engine.pool, method)())
+                for role, engine in engines.items()
+                if callable(getattr(engine.pool, method, None))
+            ]
+            yield name, "gauge", documentation, samples
+
+    return collect
+
+
+def threadpool_collector(executors: Dict[str, Any]) -> Callable:
+    """
+    Collector for running and queued work of BoundedExecutors (their stats(),
+    counted around submit), plus the anyio pool
+    """
+
+    def collect():
+        snapshots = {name: executor.stats() for name, executor in executors.items()}
+        in_use = [("threadpool_in_use", {"pool": name}, stats["running"]) for name, stats in snapshots.items()]
+        limit = [("threadpool_limit", {"pool": name}, stats["max_workers"]) for name, stats in snapshots.items()]
+        try:
+            # Sync routes and run_in_threadpool share anyio's default limiter
+            from anyio import to_thread
+            limiter = to_thread.current_default_thread_limiter()
+            in_use.append(("threadpool_in_use", {"pool": "anyio"}, limiter.borrowed_tokens))
+            limit.append(("threadpool_limit", {"pool": "anyio"}, limiter.total_tokens))
+        except Exception:
+            pass
+        yield "threadpool_queue_depth", "gauge", "Work items waiting for a thread", [
+            ("threadpool_queue_depth", {"pool": name}, stats["queued"]) for name, stats in snapshots.items()
+        ]
+        yield "threadpool_in_use", "gauge", "Threads running a work item", in_use
+        yield "threadpool_limit", "gauge", "Threads in the pool", limit
+        yield "threadpool_rejected_total", "counter", "Work items refused while the backlog was full", [
+            ("threadpool_rejected_total", {"pool": name}, stats["rejected"]) for name, stats in snapshots.items()
+        ]
+
+    return collect
+
+
+def tool_collector(tool_registry) -> Callable:
+    """Per-tool latency histogram and error/timeout counts from the ToolRegistry's own metrics"""
+
+    def collect():
+        snapshot = tool_registry.metrics()
+        latency = []
+        for tool, metrics in snapshot.items():
+            histogram = metrics["latency_seconds"]
+            for bound, cumulative in histogram["buckets"].items():
+                latency.append(("tool_call_duration_seconds_bucket", {"tool": tool, "le": bound}, cumulative))
+            latency.append(("tool_call_duration_seconds_sum", {"tool": tool}, histogram["sum"]))
+            latency.append(("tool_call_duration_seconds_count", {"tool": tool}, metrics["calls"]))
+        yield "tool_call_duration_seconds", "histogram", "Tool call latency", latency
+        yield "tool_errors_total", "counter", "Tool calls that returned an error", [
+            ("tool_errors_total", {"tool": tool}, metrics["errors"]) for tool, metrics in snapshot.items()
+        ]
+        yield "tool_timeouts_total", "counter", "Tool calls abandoned after their timeout", [
+            ("tool_timeouts_total", {"tool": tool}, metrics["timeouts"]) for tool, metrics in snapshot.items()
+        ]
+        yield "tool_rejected_total", "counter", "Tool calls refused while the tool pool was full", [
+            ("tool_rejected_total", {"tool": tool}, metrics["rejected"]) for tool, metrics in snapshot.items()
+        ]
+
+    return collect
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing each HTTP request by route template and status
+
+    Pure ASGI (no BaseHTTPMiddleware), so streaming responses pass through
+    untouched; the route label is the matched path template, never the raw
+    URL, to keep label cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                getattr(route, "path", None) or "unmatched",
+                status_code
+            )
+
+
+def render_metrics() -> str:
+    return registry.render()
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Date, Time
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Date, Time, Index, LargeBinary, DDL, JSON, ForeignKey, event, text
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.sql import func
 from app.database import Base
 import enum
@@ -13,12 +15,50 @@ class InteractionType(str, enum.Enum):
     MEETING = "Meeting"
 
 
+# SQLite stores CURRENT_TIMESTAMP without microseconds; bind parameters must use
+# the same text format or keyset comparisons on created_at break on ties.
+CreatedAtType = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
+
+class Hcp(Base):
+    """
+    A healthcare professional, one row per distinct person.
+    Spelling variants of the name resolve to the same row through
+    normalized_name (see app.hcps.assign_hcp_ids).
+    """
+    __tablename__ = "hcps"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    canonical_name = Column(String(255), nullable=False)
+    normalized_name = Column(String(255), nullable=False, unique=True)
+    aliases = Column(JSON, nullable=False, default=list)  # every spelling seen, canonical included
+    created_at = Column(CreatedAtType, server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<Hcp(id={self.id}, canonical_name={self.canonical_name})>"
+
+
 class Interaction(Base):
     """SQLAlchemy model for HCP interactions"""
     __tablename__ = "interactions"
+    __table_args__ = (
+        # Keyset pagination walks this index newest-first, no sort or offset scan
+        Index("ix_interactions_created_at_id", "created_at", "id"),
+        # Per-HCP timeline: one range scan, already in (created_at, id) order
+        Index("ix_interactions_hcp_id_created_at", "hcp_id", "created_at", "id"),
+        # List filters: equality on the column, then the newest-first sort
+        Index("ix_interactions_type_created_at", "interaction_type", "created_at", "id"),
+        Index("ix_interactions_sentiment_created_at", "hcp_sentiment", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     hcp_name = Column(String(255), nullable=False, index=True)
+    hcp_id = Column(Integer, ForeignKey("hcps.id"), nullable=True)
     interaction_type = Column(String(50), nullable=False)  # Visit, Call, Virtual, Meeting
     date = Column(Date, nullable=True)
     time = Column(Time, nullable=True)
@@ -30,10 +70,458 @@ class Interaction(Base):
     outcomes = Column(Text, nullable=True)
     follow_up_actions = Column(Text, nullable=True)
     notes = Column(Text, nullable=True)
-    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    created_at = Column(CreatedAtType, server_default=func.now(), nullable=False)
 
     class Config:
         from_attributes = True
 
     def __repr__(self):
         return f"<Interaction(id={self.id}, hcp_name={self.hcp_name}, type={self.interaction_type})>"
+
+
+# The day an interaction happened: its date, else the day it was logged.
+# date_from/date_to filters and the day/week rollups both bucket by it; the
+# ix_interactions_day expression index bounds a filtered COUNT to the rows
+# inside the range, and list pages add the created_at range it implies
+# (InteractionDaySpread) so they are read in created_at order.
+INTERACTION_DAY = func.coalesce(Interaction.date, func.date(Interaction.created_at))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _ensure_interaction_day_index(target, connection, **kw):
+    """
+    Create the expression index on INTERACTION_DAY if missing (runs on every
+    create_all; reflection does not see expression indexes, so it is kept
+    out of __table_args__ and create_tables()' checkfirst)
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_interactions_day ON interactions (COALESCE(date, DATE(created_at)))"
+        ))
+    elif dialect == "mysql":
+        exists = connection.execute(
+            text(
+                "SELECT 1 FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = 'interactions' "
+                "AND index_name = 'ix_interactions_day'"
+            )
+        ).first()
+        if not exists:
+            # Functional key part (MySQL 8.0.13+)
+            connection.execute(text(
+                "CREATE INDEX ix_interactions_day ON interactions ((COALESCE(date, DATE(created_at))))"
+            ))
+
+
+class TableRowCount(Base):
+    """
+    Row counts maintained by triggers on insert/delete.
+    Lets list endpoints report a total without running COUNT(*).
+    """
+    __tablename__ = "table_row_counts"
+
+    table_name = Column(String(64), primary_key=True)
+    row_count = Column(Integer, nullable=False, default=0)
+
+
+# Counter table is seeded from the existing rows and wired to triggers when it
+# is first created, so older databases pick it up on the next startup.
+TableRowCount.__table__.add_is_dependent_on(Interaction.__table__)
+
+_ROW_COUNT_DDL = [
+    DDL(
+        "INSERT INTO table_row_counts (table_name, row_count) "
+        "SELECT 'interactions', COUNT(*) FROM interactions"
+    ),
+    DDL(
+        "CREATE TRIGGER interactions_row_count_insert AFTER INSERT ON interactions "
+        "BEGIN UPDATE table_row_counts SET row_count = row_count + 1 "
+        "WHERE table_name = 'interactions'; END"
+    ).execute_if(dialect="sqlite"),
+    DDL(
+        "CREATE TRIGGER interactions_row_count_delete AFTER DELETE ON interactions "
+        "BEGIN UPDATE table_row_counts SET row_count = row_count - 1 "
+        "WHERE table_name = 'interactions'; END"
+    ).execute_if(dialect="sqlite"),
+    DDL(
+        "CREATE TRIGGER interactions_row_count_insert AFTER INSERT ON interactions "
+        "FOR EACH ROW UPDATE table_row_counts SET row_count = row_count + 1 "
+        "WHERE table_name = 'interactions'"
+    ).execute_if(dialect="mysql"),
+    DDL(
+        "CREATE TRIGGER interactions_row_count_delete AFTER DELETE ON interactions "
+        "FOR EACH ROW UPDATE table_row_counts SET row_count = row_count - 1 "
+        "WHERE table_name = 'interactions'"
+    ).execute_if(dialect="mysql"),
+]
+
+for _ddl in _ROW_COUNT_DDL:
+    event.listen(TableRowCount.__table__, "after_create", _ddl)
+
+
+class TableVersion(Base):
+    """
+    Change counter per table, bumped by triggers on every insert, update
+    and delete. Read caches compare it on each lookup, so a write from any
+    worker process or script invalidates every cache.
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+TableVersion.__table__.add_is_dependent_on(Interaction.__table__)
+
+event.listen(
+    TableVersion.__table__, "after_create",
+    DDL("INSERT INTO table_versions (table_name, version) VALUES ('interactions', 0)")
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _ensure_version_triggers(target, connection, **kw):
+    """Create the table_versions triggers if missing (runs on every create_all)"""
+    dialect = connection.dialect.name
+    if dialect not in ("sqlite", "mysql"):
+        return
+    
+    body = "UPDATE table_versions SET version = version + 1 WHERE table_name = 'interactions'"
+    for operation in ("INSERT", "UPDATE", "DELETE"):
+        trigger = f"interactions_version_{operation.lower()}"
+        if dialect == "sqlite":
+            connection.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {trigger} AFTER {operation} ON interactions "
+                f"BEGIN {body}; END"
+            ))
+        else:
+            exists = connection.execute(
+                text(
+                    "SELECT 1 FROM information_schema.triggers "
+                    "WHERE trigger_schema = DATABASE() AND trigger_name = :name"
+                ),
+                {"name": trigger}
+            ).first()
+            if not exists:
+                connection.execute(text(
+                    f"CREATE TRIGGER {trigger} AFTER {operation} ON interactions FOR EACH ROW {body}"
+                ))
+
+
+class InteractionDaySpread(Base):
+    """
+    How far an interaction's explicit date has ever been from the day it was
+    logged, widened by triggers on insert and update (never narrowed, so the
+    bounds stay safe after deletes). List queries turn a date_from/date_to
+    range into a created_at range with it (see app.pagination.list_query).
+    """
+    __tablename__ = "interaction_day_spread"
+
+    table_name = Column(String(64), primary_key=True)
+    days_before = Column(Integer, nullable=False, default=0)  # date earlier than the logged day
+    days_after = Column(Integer, nullable=False, default=0)  # date later than the logged day
+
+
+InteractionDaySpread.__table__.add_is_dependent_on(Interaction.__table__)
+
+
+def _day_offsets(dialect: str, row: str) -> tuple:
+    """SQL for (logged day - date, date - logged day) in days of a row, 0 without a date"""
+    if dialect == "mysql":
+        before = f"DATEDIFF(DATE({row}.created_at), {row}.date)"
+        after = f"DATEDIFF({row}.date, DATE({row}.created_at))"
+    else:
+        before = f"CAST(julianday(date({row}.created_at)) - julianday({row}.date) AS INTEGER)"
+        after = f"CAST(julianday({row}.date) - julianday(date({row}.created_at)) AS INTEGER)"
+    return f"COALESCE({before}, 0)", f"COALESCE({after}, 0)"
+
+
+@event.listens_for(InteractionDaySpread.__table__, "after_create")
+def _seed_day_spread(target, connection, **kw):
+    """Seed the spread from the existing rows when the table is first created"""
+    before, after = _day_offsets(connection.dialect.name, "interactions")
+    connection.execute(text(
+        f"INSERT INTO interaction_day_spread (table_name, days_before, days_after) "
+        f"SELECT 'interactions', COALESCE(MAX({before}), 0), COALESCE(MAX({after}), 0) FROM interactions"
+    ))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _ensure_day_spread_triggers(target, connection, **kw):
+    """Create the interaction_day_spread triggers if missing (runs on every create_all)"""
+    dialect = connection.dialect.name
+    if dialect not in ("sqlite", "mysql"):
+        return
+    
+    before, after = _day_offsets(dialect, "new")
+    greatest = "GREATEST" if dialect == "mysql" else "MAX"
+    body = (
+        f"UPDATE interaction_day_spread SET days_before = {greatest}(days_before, {before}), "
+        f"days_after = {greatest}(days_after, {after}) WHERE table_name = 'interactions'"
+    )
+    events = {"insert": "INSERT", "update": "UPDATE OF date, created_at"}
+    for name, operation in events.items():
+        trigger = f"interactions_day_spread_{name}"
+        if dialect == "sqlite":
+            connection.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {trigger} AFTER {operation} ON interactions "
+                f"BEGIN {body}; END"
+            ))
+        else:
+            exists = connection.execute(
+                text(
+                    "SELECT 1 FROM information_schema.triggers "
+                    "WHERE trigger_schema = DATABASE() AND trigger_name = :name"
+                ),
+                {"name": trigger}
+            ).first()
+            if not exists:
+                # MySQL has no column list on UPDATE triggers
+                connection.execute(text(
+                    f"CREATE TRIGGER {trigger} AFTER {operation.split(' OF ')[0]} ON interactions "
+                    f"FOR EACH ROW {body}"
+                ))
+
+
+# Serialized LangGraph state can exceed MySQL's 64KB BLOB
+CheckpointBlobType = LargeBinary().with_variant(mysql.LONGBLOB(), "mysql")
+
+
+class ChatCheckpoint(Base):
+    """
+    LangGraph checkpoint for a multi-turn AI chat session (thread_id = session ID).
+    Written by app.ai.checkpointer.SqlCheckpointSaver.
+    """
+    __tablename__ = "chat_checkpoints"
+    __table_args__ = (
+        Index("ix_chat_checkpoints_created_at", "created_at"),
+    )
+
+    thread_id = Column(String(64), primary_key=True)
+    checkpoint_ns = Column(String(255), primary_key=True, default="")
+    checkpoint_id = Column(String(64), primary_key=True)
+    parent_checkpoint_id = Column(String(64), nullable=True)
+    type = Column(String(32), nullable=True)
+    checkpoint = Column(CheckpointBlobType, nullable=False)
+    metadata_ = Column("metadata", CheckpointBlobType, nullable=False)
+    created_at = Column(CreatedAtType, server_default=func.now(), nullable=False)
+
+
+class ChatCheckpointWrite(Base):
+    """Pending channel writes recorded against a chat checkpoint"""
+    __tablename__ = "chat_checkpoint_writes"
+
+    thread_id = Column(String(64), primary_key=True)
+    checkpoint_ns = Column(String(255), primary_key=True, default="")
+    checkpoint_id = Column(String(64), primary_key=True)
+    task_id = Column(String(64), primary_key=True)
+    idx = Column(Integer, primary_key=True, autoincrement=False)
+    channel = Column(String(255), nullable=False)
+    type = Column(String(32), nullable=True)
+    value = Column(CheckpointBlobType, nullable=True)
+    task_path = Column(String(255), nullable=False, default="")
+
+
+# Free-text columns covered by full-text search (FTS5 on SQLite, FULLTEXT on MySQL)
+FULLTEXT_COLUMNS = ["notes", "topics_discussed", "outcomes", "follow_up_actions"]
+FTS_TABLE_NAME = "interactions_fts"
+
+_FTS_COLUMN_LIST = ", ".join(FULLTEXT_COLUMNS)
+_FTS_NEW_VALUES = ", ".join(f"new.{column}" for column in FULLTEXT_COLUMNS)
+_FTS_OLD_VALUES = ", ".join(f"old.{column}" for column in FULLTEXT_COLUMNS)
+
+_SQLITE_FTS_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_insert AFTER INSERT ON interactions BEGIN "
+    f"INSERT INTO {FTS_TABLE_NAME} (rowid, {_FTS_COLUMN_LIST}) VALUES (new.id, {_FTS_NEW_VALUES}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_delete AFTER DELETE ON interactions BEGIN "
+    f"INSERT INTO {FTS_TABLE_NAME} ({FTS_TABLE_NAME}, rowid, {_FTS_COLUMN_LIST}) "
+    f"VALUES ('delete', old.id, {_FTS_OLD_VALUES}); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE_NAME}_update AFTER UPDATE ON interactions BEGIN "
+    f"INSERT INTO {FTS_TABLE_NAME} ({FTS_TABLE_NAME}, rowid, {_FTS_COLUMN_LIST}) "
+    f"VALUES ('delete', old.id, {_FTS_OLD_VALUES}); "
+    f"INSERT INTO {FTS_TABLE_NAME} (rowid, {_FTS_COLUMN_LIST}) VALUES (new.id, {_FTS_NEW_VALUES}); END",
+]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _ensure_fulltext_index(target, connection, **kw):
+    """
+    Create the full-text index if missing and backfill it from existing rows.
+    Runs on every create_all, so databases created before search existed get it.
+    """
+    dialect = connection.dialect.name
+    
+    if dialect == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE_NAME}
+        ).first()
+        if not exists:
+            # External-content table: stores only the index, rows stay in interactions
+            connection.execute(text(
+                f"CREATE VIRTUAL TABLE {FTS_TABLE_NAME} USING fts5("
+                f"{_FTS_COLUMN_LIST}, content='interactions', content_rowid='id')"
+            ))
+            connection.execute(text(
+                f"INSERT INTO {FTS_TABLE_NAME} ({FTS_TABLE_NAME}) VALUES ('rebuild')"
+            ))
+        for trigger in _SQLITE_FTS_TRIGGERS:
+            connection.execute(text(trigger))
+    
+    elif dialect == "mysql":
+        # InnoDB keeps FULLTEXT indexes in sync on its own, no triggers needed
+        exists = connection.execute(
+            text(
+                "SELECT 1 FROM information_schema.statistics "
+                "WHERE table_schema = DATABASE() AND table_name = 'interactions' "
+                "AND index_name = 'ix_interactions_fulltext'"
+            )
+        ).first()
+        if not exists:
+            connection.execute(text(
+                f"CREATE FULLTEXT INDEX ix_interactions_fulltext ON interactions ({_FTS_COLUMN_LIST})"
+            ))
+
+
+class InteractionRollup(Base):
+    """
+    Interaction counts per bucket of one dimension (hcp, interaction_type,
+    hcp_sentiment, day, week); hcp buckets are hcps.id values. Kept current
+    by triggers in the same transaction as each insert, update and delete
+    on interactions.
+    """
+    __tablename__ = "interaction_rollups"
+
+    dimension = Column(String(32), primary_key=True)
+    bucket = Column(String(255), primary_key=True)
+    interaction_count = Column(Integer, nullable=False, default=0)
+
+
+InteractionRollup.__table__.add_is_dependent_on(Interaction.__table__)
+
+ROLLUP_DIMENSIONS = ["hcp", "interaction_type", "hcp_sentiment", "day", "week"]
+
+# hcp bucket of interactions not (yet) linked to an hcps row
+UNLINKED_HCP_BUCKET = "Unlinked"
+
+
+def _rollup_buckets(dialect: str, row: str) -> dict:
+    """SQL expression for each dimension's bucket of a row (new / old / interactions)"""
+    if dialect == "mysql":
+        day = f"COALESCE({row}.date, DATE({row}.created_at))"
+        week = f"DATE_SUB({day}, INTERVAL WEEKDAY({day}) DAY)"
+        day, week = f"CAST({day} AS CHAR(10))", f"CAST({week} AS CHAR(10))"
+        hcp = f"CAST({row}.hcp_id AS CHAR(20))"
+    else:
+        day = f"COALESCE({row}.date, date({row}.created_at))"
+        week = f"date({day}, '-6 days', 'weekday 1')"  # Monday of the week
+        hcp = f"CAST({row}.hcp_id AS TEXT)"
+    return {
+        # Keyed on the HCP entity, so every spelling of a name counts together
+        "hcp": f"COALESCE({hcp}, '{UNLINKED_HCP_BUCKET}')",
+        "interaction_type": f"{row}.interaction_type",
+        "hcp_sentiment": f"COALESCE({row}.hcp_sentiment, 'Unspecified')",
+        "day": day,
+        "week": week,
+    }
+
+
+def _rollup_trigger_body(dialect: str) -> dict:
+    """Statements run by the insert / delete / update triggers"""
+    if dialect == "mysql":
+        upsert = "ON DUPLICATE KEY UPDATE interaction_count = interaction_count + 1"
+    else:
+        upsert = "ON CONFLICT (dimension, bucket) DO UPDATE SET interaction_count = interaction_count + 1"
+    increment = [
+        f"INSERT INTO interaction_rollups (dimension, bucket, interaction_count) "
+        f"VALUES ('{dimension}', {bucket}, 1) {upsert};"
+        for dimension, bucket in _rollup_buckets(dialect, "new").items()
+    ]
+    decrement = [
+        f"UPDATE interaction_rollups SET interaction_count = interaction_count - 1 "
+        f"WHERE dimension = '{dimension}' AND bucket = {bucket};"
+        for dimension, bucket in _rollup_buckets(dialect, "old").items()
+    ]
+    return {
+        "insert": " ".join(increment),
+        "delete": " ".join(decrement),
+        "update": " ".join(decrement + increment),
+    }
+
+
+def rebuild_interaction_rollups(connection) -> int:
+    """
+    Recompute every rollup from the interactions table (backfill / repair).
+    Run inside a transaction; returns the number of buckets written.
+    """
+    connection.execute(text("DELETE FROM interaction_rollups"))
+    for dimension, bucket in _rollup_buckets(connection.dialect.name, "interactions").items():
+        connection.execute(text(
+            f"INSERT INTO interaction_rollups (dimension, bucket, interaction_count) "
+            f"SELECT '{dimension}', {bucket}, COUNT(*) FROM interactions GROUP BY {bucket}"
+        ))
+    return connection.execute(text("SELECT COUNT(*) FROM interaction_rollups")).scalar()
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _ensure_interactions_hcp_id(target, connection, **kw):
+    """
+    Add interactions.hcp_id to databases created before the hcps table.
+    Runs before create_tables() adds the indexes that use the column;
+    app.hcps.backfill_hcp_ids() then links the existing rows.
+    """
+    columns = {column["name"] for column in sa_inspect(connection).get_columns("interactions")}
+    if "hcp_id" in columns:
+        return
+    if connection.dialect.name == "mysql":
+        connection.execute(text(
+            "ALTER TABLE interactions ADD COLUMN hcp_id INTEGER NULL, "
+            "ADD CONSTRAINT fk_interactions_hcp_id FOREIGN KEY (hcp_id) REFERENCES hcps (id)"
+        ))
+    else:
+        connection.execute(text("ALTER TABLE interactions ADD COLUMN hcp_id INTEGER REFERENCES hcps (id)"))
+
+
+# Rollups are backfilled when the table is first created, so older databases
+# start with correct counts on the next startup. The rebuild itself runs in
+# _ensure_rollup_triggers, once _ensure_interactions_hcp_id has added the
+# hcp_id column it groups by.
+event.listen(
+    InteractionRollup.__table__, "after_create",
+    lambda target, connection, **kw: connection.info.__setitem__("rebuild_rollups", True)
+)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _ensure_rollup_triggers(target, connection, **kw):
+    """Create the rollup triggers if missing (runs on every create_all) and backfill a new rollup table"""
+    dialect = connection.dialect.name
+    if dialect not in ("sqlite", "mysql"):
+        return
+    
+    events = {"insert": "INSERT", "delete": "DELETE", "update": "UPDATE OF hcp_id, interaction_type, hcp_sentiment, date, created_at"}
+    for name, body in _rollup_trigger_body(dialect).items():
+        trigger = f"interaction_rollups_{name}"
+        if dialect == "sqlite":
+            connection.execute(text(
+                f"CREATE TRIGGER IF NOT EXISTS {trigger} AFTER {events[name]} ON interactions "
+                f"BEGIN {body} END"
+            ))
+        else:
+            exists = connection.execute(
+                text(
+                    "SELECT 1 FROM information_schema.triggers "
+                    "WHERE trigger_schema = DATABASE() AND trigger_name = :name"
+                ),
+                {"name": trigger}
+            ).first()
+            if not exists:
+                # MySQL has no column list on UPDATE triggers
+                connection.execute(text(
+                    f"CREATE TRIGGER {trigger} AFTER {events[name].split(' OF ')[0]} ON interactions "
+                    f"FOR EACH ROW BEGIN {body} END"
+                ))
+    
+    if connection.info.pop("rebuild_rollups", False):
+        rebuild_interaction_rollups(connection)
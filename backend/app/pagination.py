@@ -0,0 +1,140 @@
+"""
+Interaction list queries and keyset pagination
+Shared by the list endpoints (/interactions, /hcps/{id}/interactions), the
+export and search routes, and benchmarks/check_query_plans.py, so they all
+filter, sort and page interactions the same way.
+"""
+
+import base64
+from datetime import date, datetime, time, timedelta
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, desc, func, or_, select
+
+from app.models import INTERACTION_DAY, Interaction
+
+# Columns in the default list response (the InteractionResponse fields)
+LIST_DEFAULT_FIELDS = ("id", "hcp_name", "hcp_id", "interaction_type", "notes", "created_at")
+
+# Columns returned by fields=summary (what the list view renders)
+LIST_SUMMARY_FIELDS = ("id", "hcp_name", "hcp_id", "interaction_type", "date", "hcp_sentiment", "notes", "created_at")
+
+# Characters of notes kept in projected list rows unless full_notes=true
+NOTE_PREVIEW_CHARS = 200
+
+
+def encode_cursor(interaction: Interaction) -> str:
+    """Encode the (created_at, id) keyset position of a row as an opaque token"""
+    raw = f"{interaction.created_at.isoformat()}|{interaction.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor (400 if it is not one)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, interaction_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(interaction_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def after_cursor(query, cursor: str):
+    """Continue a newest-first (created_at, id) query after the row a cursor points at"""
+    cursor_created_at, cursor_id = decode_cursor(cursor)
+    return query.where(or_(
+        Interaction.created_at < cursor_created_at,
+        and_(
+            Interaction.created_at == cursor_created_at,
+            Interaction.id < cursor_id
+        )
+    ))
+
+
+def apply_filters(
+    query,
+    interaction_type: Optional[str],
+    date_from: Optional[date],
+    date_to: Optional[date],
+    hcp_id: Optional[int] = None,
+    hcp_sentiment: Optional[str] = None
+):
+    """
+    Restrict a select() on interactions by HCP, type, sentiment and date range
+    (inclusive, on INTERACTION_DAY so counts match the day/week analytics)
+    """
+    if hcp_id is not None:
+        query = query.where(Interaction.hcp_id == hcp_id)
+    if interaction_type is not None:
+        query = query.where(Interaction.interaction_type == interaction_type)
+    if hcp_sentiment is not None:
+        query = query.where(Interaction.hcp_sentiment == hcp_sentiment)
+    if date_from is not None:
+        query = query.where(INTERACTION_DAY >= date_from)
+    if date_to is not None:
+        query = query.where(INTERACTION_DAY <= date_to)
+    return query
+
+
+def created_at_range(
+    date_from: Optional[date],
+    date_to: Optional[date],
+    day_spread: Tuple[int, int]
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """
+    [start, end) of created_at for rows whose INTERACTION_DAY is in the range,
+    given the (days_before, days_after) bounds of InteractionDaySpread
+    """
+    days_before, days_after = day_spread
+    start = end = None
+    if date_from is not None:
+        start = datetime.combine(date_from - timedelta(days=days_after), time.min)
+    if date_to is not None:
+        end = datetime.combine(date_to + timedelta(days=days_before + 1), time.min)
+    return start, end
+
+
+def list_query(
+    columns: Tuple[str, ...],
+    preview_notes: bool = False,
+    day_spread: Optional[Tuple[int, int]] = None,
+    **filters
+):
+    """
+    Newest-first select of list columns with the given apply_filters filters.
+    An equality filter plus this sort matches one of the (column, created_at, id)
+    indexes, so the page is read in index order without a sort step. A date
+    range also becomes a created_at range when day_spread is given, so it is
+    read the same way, stopping once the page is full.
+    """
+    # Select only the needed columns as plain rows (no ORM objects, no
+    # pydantic pass); previews cut notes in SQL so long text is never loaded
+    selected = [
+        func.substr(Interaction.notes, 1, NOTE_PREVIEW_CHARS + 1).label("notes")
+        if name == "notes" and preview_notes else Interaction.__table__.c[name]
+        for name in columns
+    ]
+    
+    # Ordered by most recent first (id breaks created_at ties)
+    query = select(*selected).order_by(
+        desc(Interaction.created_at), desc(Interaction.id)
+    )
+    if day_spread is not None:
+        # Implied by the day filter, which still applies to rows near the edges
+        start, end = created_at_range(filters.get("date_from"), filters.get("date_to"), day_spread)
+        if start is not None:
+            query = query.where(Interaction.created_at >= start)
+        if end is not None:
+            query = query.where(Interaction.created_at < end)
+    return apply_filters(
+        query,
+        filters.get("interaction_type"),
+        filters.get("date_from"),
+        filters.get("date_to"),
+        hcp_id=filters.get("hcp_id"),
+        hcp_sentiment=filters.get("hcp_sentiment")
+    )
@@ -0,0 +1,165 @@
+"""
+Read-through cache for interaction reads
+Serialized list pages and single interactions keyed by request, valid until
+the interactions table version changes. The version lives in the database
+(table_versions), so writes from other workers and scripts invalidate the
+cache too. It is re-read at most every version_check_seconds, and right
+after any write from this process, so cache hits usually cost no query.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches etag (RFC 9110 weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+class ReadThroughCache:
+    """
+    Response cache invalidated by the database's table version
+
+    Callers read the version (table_versions, bumped by triggers on every
+    write) before running their query, look the key up under it and store
+    the result under the same version. A write committed by any process
+    changes the version, so older entries are never served; seeing a newer
+    version drops them all. Entries also expire after ttl_seconds.
+
+    known_version() saves the version read: it returns the last version read
+    from the database for version_check_seconds, unless this process has
+    written since (record_write). Writes by other processes are therefore
+    seen up to version_check_seconds late; 0 reads the version every time.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 30, version_check_seconds: float = 1.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        self._lock = threading.Lock()
+        # Newest version seen; entries are only ever stored under it
+        self._version: Optional[int] = None
+        # When the version was last read from the database (monotonic clock)
+        self._checked_at = float("-inf")
+        # Local commits; a version read that overlapped one is not trusted
+        self._writes = 0
+        # key -> (version, expires_at, etag, body)
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, str, bytes]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0, "version_reads": 0}
+
+    def _observe(self, version: int) -> None:
+        """Drop every entry once a newer version shows up (caller holds the lock)"""
+        if self._version is None or version > self._version:
+            if self._entries:
+                self._entries.clear()
+                self._stats["invalidations"] += 1
+            self._version = version
+
+    def known_version(self) -> Tuple[Optional[int], int]:
+        """
+        (version, writes): the current version if it was read from the database
+        recently and nothing was written here since, else None. Pass writes to
+        record_version after reading the version from the database.
+        """
+        with self._lock:
+            fresh = time.monotonic() - self._checked_at < self.version_check_seconds
+            return (self._version if fresh else None), self._writes
+
+    def record_version(self, version: int, writes: int) -> None:
+        """Note a version read from the database (writes as from known_version)"""
+        with self._lock:
+            self._observe(version)
+            self._stats["version_reads"] += 1
+            # A local commit during the read may not be in it: read again next time
+            if writes == self._writes and version == self._version:
+                self._checked_at = time.monotonic()
+
+    def record_write(self) -> None:
+        """A write to interactions committed in this process: re-read the version"""
+        with self._lock:
+            self._writes += 1
+            self._checked_at = float("-inf")
+
+    def get(self, key: Hashable, version: int) -> Optional[Tuple[str, bytes]]:
+        """(etag, body) for an entry stored at version, or None on a miss"""
+        now = time.time()
+        with self._lock:
+            self._observe(version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, expires_at, etag, body = entry
+                if entry_version == version and expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return etag, body
+                del self._entries[key]
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: Hashable, version: int, body: bytes) -> str:
+        """Store a body read at version and return its ETag"""
+        etag = make_etag(body)
+        with self._lock:
+            self._observe(version)
+            if version == self._version:
+                self._entries[key] = (version, time.time() + self.ttl_seconds, etag, body)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return etag
+
+    def record_not_modified(self) -> None:
+        with self._lock:
+            self._stats["not_modified"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "version": self._version,
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "version_check_seconds": self.version_check_seconds,
+            }
+
+
+# Global cache instance
+_read_cache_instance: Optional[ReadThroughCache] = None
+
+
+def get_read_cache() -> ReadThroughCache:
+    """
+    Get or create the interaction read cache
+    Configured by READ_CACHE_MAX_ENTRIES, READ_CACHE_TTL_SECONDS and
+    READ_CACHE_VERSION_CHECK_SECONDS
+
+    Each worker process keeps its own entries, checked against the shared
+    table version, so the cache is safe with workers > 1; a write through
+    another worker shows up within READ_CACHE_VERSION_CHECK_SECONDS.
+    """
+    global _read_cache_instance
+    if _read_cache_instance is None:
+        _read_cache_instance = ReadThroughCache(
+            max_entries=int(os.getenv("READ_CACHE_MAX_ENTRIES", "512")),
+            ttl_seconds=float(os.getenv("READ_CACHE_TTL_SECONDS", "30")),
+            version_check_seconds=float(os.getenv("READ_CACHE_VERSION_CHECK_SECONDS", "1"))
+        )
+    return _read_cache_instance
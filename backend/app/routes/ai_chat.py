@@ -3,14 +3,26 @@ AI Chat API Routes
 Endpoint for conversational interaction logging using LangGraph and Groq
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
-from typing import Optional, Dict, Any
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Dict, Any, List, Literal
+import asyncio
+import json
 
-from app.database import get_db
-from app.models import Interaction
-from app.ai import get_agent
+from app.database import PoolTimeoutError, get_async_db
+from app.group_commit import get_interaction_writer
+from app.ai import (
+    get_agent,
+    get_checkpointer,
+    get_compliance_engine,
+    get_groq_scheduler,
+    get_hcp_index,
+    get_llm_cache,
+    get_tool_registry,
+    get_tracer
+)
 
 
 # ============================================================================
@@ -20,6 +32,22 @@ from app.ai import get_agent
 class AIChatRequest(BaseModel):
     """Request schema for AI chat"""
     user_message: str = Field(..., description="User's description of interaction")
+    session_id: Optional[str] = Field(
+        None, max_length=64,
+        description="Chat session to continue"
+    )
+    start_session: bool = Field(
+        False,
+        description="Without session_id: start a new session (its id is returned); otherwise the call is one-shot and stores nothing"
+    )
+
+
+class AIChatBatchRequest(BaseModel):
+    """Request schema for batch AI extraction"""
+    notes: List[str] = Field(
+        ..., min_length=1, max_length=200,
+        description="Free-text call notes, one interaction each"
+    )
 
 
 class InteractionExtract(BaseModel):
@@ -36,6 +64,13 @@ class AIChatResponse(BaseModel):
     extracted_interaction: Optional[InteractionExtract] = None
     tool_results: list[Dict[str, Any]] = []
     conversation_steps: int = 0
+    session_id: Optional[str] = None
+    extraction: Optional[Dict[str, Any]] = Field(
+        None, description='How the interaction was extracted: {"source": "rules" | "llm", "confidence"}'
+    )
+    timings: Optional[Dict[str, Any]] = Field(
+        None, description="Span breakdown of the turn (graph nodes, LLM, tools); only with debug=timings"
+    )
 
 
 # ============================================================================
@@ -45,10 +80,69 @@ class AIChatResponse(BaseModel):
 router = APIRouter(prefix="/ai", tags=["ai"])
 
 
+def _build_chat_response(result: Dict[str, Any]) -> AIChatResponse:
+    """Turn the agent's final result into an AIChatResponse"""
+    # Extract the interaction data
+    extracted_data = result.get("extracted_interaction")
+    
+    parse_error = (result.get("extraction") or {}).get("error")
+    
+    if not extracted_data:
+        return AIChatResponse(
+            status="error" if parse_error else "incomplete",
+            message=f"Model returned malformed output: {parse_error}" if parse_error
+            else "Could not extract interaction data. Please provide more details.",
+            extracted_interaction=None,
+            tool_results=result.get("tool_results", []),
+            conversation_steps=result.get("conversation_steps", 0),
+            session_id=result.get("session_id"),
+            extraction=result.get("extraction")
+        )
+    
+    # Validate extracted data
+    try:
+        interaction_extract = InteractionExtract(**extracted_data)
+    except Exception as e:
+        return AIChatResponse(
+            status="error",
+            message=f"Extracted data validation failed: {str(e)}",
+            extracted_interaction=None,
+            tool_results=result.get("tool_results", []),
+            conversation_steps=result.get("conversation_steps", 0),
+            session_id=result.get("session_id"),
+            extraction=result.get("extraction")
+        )
+    
+    return AIChatResponse(
+        status="success",
+        message="Interaction processed successfully. Please review and confirm before saving.",
+        extracted_interaction=interaction_extract,
+        tool_results=result.get("tool_results", []),
+        conversation_steps=result.get("conversation_steps", 0),
+        session_id=result.get("session_id"),
+        extraction=result.get("extraction")
+    )
+
+
+def _session_id(request: AIChatRequest) -> Optional[str]:
+    """Session to run the turn in; None runs it one-shot, without checkpoints"""
+    if request.session_id:
+        return request.session_id
+    return get_agent().new_session_id() if request.start_session else None
+
+
+def _sse(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
 @router.post("/chat", response_model=AIChatResponse)
-def ai_chat(
+async def ai_chat(
     request: AIChatRequest,
-    db: Session = Depends(get_db)
+    debug: Optional[Literal["timings"]] = Query(
+        None, description="timings: include the per-node/tool span breakdown in the response"
+    ),
+    db: AsyncSession = Depends(get_async_db)
 ) -> AIChatResponse:
     """
     AI-powered conversational interaction logging
@@ -59,8 +153,13 @@ def ai_chat(
     3. Check compliance with regulatory tools
     4. Suggest next actions
     
+    Turns are kept per session_id, so follow-ups ("actually it was a call")
+    amend the current draft without re-sending earlier messages. Calls with
+    neither session_id nor start_session are one-shot and store nothing.
+    
     Args:
         request: User message describing the interaction
+        debug: "timings" adds the span breakdown of this turn
         db: Database session
         
     Returns:
@@ -71,40 +170,17 @@ def ai_chat(
         # Get LangGraph agent
         agent = get_agent()
         
-        # Process user input through agent graph
-        result = agent.process_conversation(request.user_message)
-        
-        # Extract the interaction data
-        extracted_data = result.get("extracted_interaction")
-        
-        if not extracted_data:
-            return AIChatResponse(
-                status="incomplete",
-                message="Could not extract interaction data. Please provide more details.",
-                extracted_interaction=None,
-                tool_results=result.get("tool_results", []),
-                conversation_steps=result.get("conversation_steps", 0)
+        # Process user input through agent graph (traced from here, so the spans cover the whole request)
+        with get_tracer().span("ai.chat", **{"http.route": "/ai/chat"}) as span:
+            result = await agent.aprocess_conversation(
+                request.user_message,
+                session_id=_session_id(request)
             )
+            response = _build_chat_response(result)
         
-        # Validate extracted data
-        try:
-            interaction_extract = InteractionExtract(**extracted_data)
-        except Exception as e:
-            return AIChatResponse(
-                status="error",
-                message=f"Extracted data validation failed: {str(e)}",
-                extracted_interaction=None,
-                tool_results=result.get("tool_results", []),
-                conversation_steps=result.get("conversation_steps", 0)
-            )
-        
-        return AIChatResponse(
-            status="success",
-            message="Interaction processed successfully. Please review and confirm before saving.",
-            extracted_interaction=interaction_extract,
-            tool_results=result.get("tool_results", []),
-            conversation_steps=result.get("conversation_steps", 0)
-        )
+        if debug == "timings":
+            response.timings = span.trace.timings()
+        return response
     
     except ValueError as e:
         if "GROQ_API_KEY" in str(e):
@@ -123,11 +199,123 @@ def ai_chat(
         )
 
 
+@router.post("/chat/stream")
+async def ai_chat_stream(request: AIChatRequest) -> StreamingResponse:
+    """
+    Streaming variant of /ai/chat over Server-Sent Events
+    
+    Events, in order of arrival:
+    - `node`: a graph node started or finished (with elapsed_ms)
+    - `token`: a chunk of LLM output
+    - `field`: an extracted field, as soon as it is complete in the LLM output
+    - `tool_result`: one tool's result, as soon as it finishes
+    - `result`: the same payload /ai/chat returns
+    - `error`: processing failed; the stream ends
+    
+    Args:
+        request: User message describing the interaction
+        
+    Returns:
+        text/event-stream response
+    """
+    try:
+        agent = get_agent()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="GROQ_API_KEY not configured. Set environment variable to enable AI features."
+            if "GROQ_API_KEY" in str(e) else str(e)
+        )
+    
+    session_id = _session_id(request)
+    
+    async def event_stream():
+        try:
+            async for event in agent.astream_conversation(request.user_message, session_id=session_id):
+                name = event.pop("event")
+                if name == "result":
+                    yield _sse(name, _build_chat_response(event["result"]).model_dump())
+                else:
+                    yield _sse(name, event)
+        except Exception as e:
+            yield _sse("error", {"detail": f"AI processing failed: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.delete("/chat/sessions/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_chat_session(session_id: str) -> None:
+    """
+    Discard a chat session's stored history
+    
+    Args:
+        session_id: Session to delete (deleting an unknown session is a no-op)
+    """
+    await get_checkpointer().adelete_thread(session_id)
+
+
+@router.post("/chat/batch")
+async def ai_chat_batch(request: AIChatBatchRequest) -> StreamingResponse:
+    """
+    Extract interactions from a batch of call notes
+    
+    Notes run concurrently through the agent; Groq calls are admitted by the
+    rate-limit-aware scheduler (requests/min, tokens/min, bounded concurrency,
+    429 backoff). Results stream back as NDJSON, one line per note in
+    completion order, each tagged with the note's index.
+    
+    Args:
+        request: Up to 200 notes
+        
+    Returns:
+        application/x-ndjson response of {"index", ...AIChatResponse}
+    """
+    try:
+        agent = get_agent()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="GROQ_API_KEY not configured. Set environment variable to enable AI features."
+            if "GROQ_API_KEY" in str(e) else str(e)
+        )
+    
+    async def process(index: int, note: str) -> Dict[str, Any]:
+        try:
+            result = await agent.aprocess_conversation(note)
+            return {"index": index, **_build_chat_response(result).model_dump()}
+        except Exception as e:
+            return {"index": index, "status": "error", "message": f"AI processing failed: {str(e)}"}
+    
+    async def result_stream():
+        tasks = [asyncio.create_task(process(index, note)) for index, note in enumerate(request.notes)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield json.dumps(await finished, default=str) + "\n"
+        finally:
+            # Client went away: don't keep spending quota on abandoned notes
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(result_stream(), media_type="application/x-ndjson")
+
+
+@router.get("/scheduler/stats", response_model=Dict[str, Any])
+def scheduler_stats() -> Dict[str, Any]:
+    """
+    Groq scheduler statistics
+    
+    Returns:
+        Call/retry/rate-limit counters and remaining request/token quota
+    """
+    return get_groq_scheduler().stats()
+
+
 @router.post("/chat/confirm", response_model=Dict[str, Any])
-def confirm_and_save_interaction(
-    interaction_data: InteractionExtract,
-    db: Session = Depends(get_db)
-) -> Dict[str, Any]:
+async def confirm_and_save_interaction(interaction_data: InteractionExtract) -> Dict[str, Any]:
     """
     Confirm extracted interaction and save to database
     
@@ -136,7 +324,6 @@ def confirm_and_save_interaction(
     
     Args:
         interaction_data: Confirmed interaction data
-        db: Database session
         
     Returns:
         Saved interaction with ID and timestamp
@@ -151,33 +338,80 @@ def confirm_and_save_interaction(
                 detail=f"Invalid interaction_type. Must be one of: {valid_types}"
             )
         
-        # Create and save interaction
-        db_interaction = Interaction(
-            hcp_name=interaction_data.hcp_name,
-            interaction_type=interaction_data.interaction_type,
-            notes=interaction_data.notes
-        )
-        
-        db.add(db_interaction)
-        db.commit()
-        db.refresh(db_interaction)
+        # Create and save interaction; concurrent confirms share one commit
+        saved = await get_interaction_writer().insert({
+            "hcp_name": interaction_data.hcp_name,
+            "interaction_type": interaction_data.interaction_type,
+            "notes": interaction_data.notes
+        })
+        get_hcp_index().add(saved["hcp_name"])
         
         return {
             "status": "success",
             "message": "Interaction saved successfully",
-            "interaction_id": db_interaction.id,
-            "created_at": db_interaction.created_at.isoformat(),
+            "interaction_id": saved["id"],
+            "created_at": saved["created_at"].isoformat(),
             "data": {
-                "id": db_interaction.id,
-                "hcp_name": db_interaction.hcp_name,
-                "interaction_type": db_interaction.interaction_type,
-                "notes": db_interaction.notes
+                "id": saved["id"],
+                "hcp_name": saved["hcp_name"],
+                "interaction_type": saved["interaction_type"],
+                "notes": saved["notes"]
             }
         }
     
+    except PoolTimeoutError:
+        # Writer busy: answered with 503 + Retry-After by the app-level handler
+        raise
     except Exception as e:
-        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to save interaction: {str(e)}"
         )
+
+
+@router.post("/compliance/rescan")
+async def rescan_compliance() -> StreamingResponse:
+    """
+    Re-scan every stored interaction against the current compliance lexicon
+    
+    Useful after the compliance team updates the lexicon file. Rows are read
+    through a server-side cursor and flagged interactions stream back as NDJSON
+    while the scan runs, so the whole result set is never held in memory.
+    
+    Returns:
+        application/x-ndjson response of {"id", "hcp_name", "matches"} per
+        flagged interaction; a failed scan ends with a {"status": "error"} line
+    """
+    engine = get_compliance_engine()
+    
+    async def result_stream():
+        try:
+            async for row in engine.rescan_interactions():
+                yield json.dumps(row, default=str) + "\n"
+        except Exception as e:
+            # Headers are already sent, so the failure is reported in-band
+            yield json.dumps({"status": "error", "message": f"Compliance re-scan failed: {str(e)}"}) + "\n"
+    
+    return StreamingResponse(result_stream(), media_type="application/x-ndjson")
+
+
+@router.get("/cache/stats", response_model=Dict[str, Any])
+def llm_cache_stats() -> Dict[str, Any]:
+    """
+    LLM response cache statistics
+    
+    Returns:
+        Hit/miss/eviction counters, hit rate and current size
+    """
+    return get_llm_cache().stats()
+
+
+@router.get("/tools/metrics", response_model=Dict[str, Any])
+def tool_metrics() -> Dict[str, Any]:
+    """
+    Per-tool call metrics
+    
+    Returns:
+        Call, error, timeout and rejection counts plus a latency histogram for each tool
+    """
+    return get_tool_registry().metrics()
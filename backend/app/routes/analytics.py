@@ -0,0 +1,42 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
+from datetime import date
+
+from app.analytics import DATE_DIMENSIONS, rollup_counts
+from app.database import get_async_db
+from app.schemas import AnalyticsBucket, AnalyticsResponse
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+
+@router.get("/interactions", response_model=AnalyticsResponse)
+async def interaction_counts(
+    group_by: Literal["hcp", "interaction_type", "hcp_sentiment", "day", "week"],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+) -> AnalyticsResponse:
+    """
+    Interaction counts grouped by one dimension, read from the rollup table.
+    
+    - **group_by**: hcp, interaction_type, hcp_sentiment, day or week (weeks start on Monday)
+    - **date_from** / **date_to**: Inclusive bounds for day and week buckets
+    - **limit**: Maximum buckets returned (default 100, max 1000)
+    
+    Days use the interaction date, or the day it was logged when no date was given.
+    HCP buckets count every spelling of a name together under the canonical name.
+    """
+    if (date_from or date_to) and group_by not in DATE_DIMENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from/date_to only apply to group_by=day or week"
+        )
+    
+    counts = await rollup_counts(db, group_by, date_from, date_to, limit)
+    return AnalyticsResponse(
+        group_by=group_by,
+        total=sum(row["count"] for row in counts),
+        buckets=[AnalyticsBucket(**row) for row in counts]
+    )
@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, select
+from typing import Optional
+
+from app.database import get_async_db
+from app.models import Hcp, Interaction
+from app.pagination import LIST_DEFAULT_FIELDS, after_cursor, encode_cursor
+from app.schemas import HcpResponse, HcpTimelineResponse, InteractionResponse
+
+router = APIRouter(prefix="/hcps", tags=["hcps"])
+
+
+async def _get_hcp(db: AsyncSession, hcp_id: int) -> Hcp:
+    hcp = await db.get(Hcp, hcp_id)
+    if not hcp:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"HCP with id {hcp_id} not found"
+        )
+    return hcp
+
+
+@router.get("/{hcp_id}", response_model=HcpResponse)
+async def get_hcp(
+    hcp_id: int,
+    db: AsyncSession = Depends(get_async_db)
+) -> HcpResponse:
+    """Get an HCP with its canonical name and known spellings"""
+    return await _get_hcp(db, hcp_id)
+
+
+@router.get("/{hcp_id}/interactions", response_model=HcpTimelineResponse)
+async def get_hcp_interactions(
+    hcp_id: int,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+) -> HcpTimelineResponse:
+    """
+    Interaction timeline of one HCP, newest first, across every spelling of the name.
+    
+    - **limit**: Number of records to return (default 50, max 100)
+    - **cursor**: `next_cursor` from the previous page
+    
+    Served by one range scan of the (hcp_id, created_at, id) index.
+    """
+    hcp = await _get_hcp(db, hcp_id)
+    
+    table = Interaction.__table__
+    query = select(*(table.c[name] for name in LIST_DEFAULT_FIELDS)).where(
+        table.c.hcp_id == hcp_id
+    ).order_by(desc(table.c.created_at), desc(table.c.id))
+    
+    if cursor:
+        query = after_cursor(query, cursor)
+    
+    # Fetch one extra row to know whether another page exists
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+    
+    return HcpTimelineResponse(
+        hcp=HcpResponse.model_validate(hcp),
+        interactions=[InteractionResponse.model_validate(dict(row._mapping)) for row in rows],
+        next_cursor=next_cursor
+    )
@@ -1,20 +1,123 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import desc, func, insert, select, literal_column, table, column, text
+from sqlalchemy.dialects.mysql import match as mysql_match
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional, Tuple
+from datetime import date, time
+import csv
+import io
+import json
+import re
 
-from app.database import get_db
-from app.models import Interaction, InteractionType
-from app.schemas import InteractionCreate, InteractionResponse, InteractionListResponse
+import orjson
+
+from app.ai.hcp_index import get_hcp_index, normalize_hcp_name
+from app.group_commit import get_interaction_writer
+from app.hcps import assign_hcp_ids_async
+from app.read_cache import etag_matches, get_read_cache
+from app.database import (
+    AsyncSessionLocal,
+    AsyncWriteSessionLocal,
+    PoolTimeoutError,
+    get_async_db,
+    get_async_write_db,
+    is_sqlite
+)
+from app.models import Hcp, Interaction, InteractionDaySpread, InteractionType, TableRowCount, TableVersion, FULLTEXT_COLUMNS, FTS_TABLE_NAME
+from app.pagination import (
+    LIST_DEFAULT_FIELDS,
+    LIST_SUMMARY_FIELDS,
+    NOTE_PREVIEW_CHARS,
+    after_cursor,
+    apply_filters,
+    encode_cursor,
+    list_query
+)
+from app.schemas import (
+    InteractionCreate,
+    InteractionResponse,
+    InteractionListResponse,
+    BulkRowError,
+    BulkInsertResponse,
+    InteractionSearchHit,
+    InteractionSearchResponse,
+)
 
 router = APIRouter(prefix="/interactions", tags=["interactions"])
 
+# Rows validated and inserted per transaction in bulk loads
+BULK_BATCH_SIZE = 500
+
+# Rows fetched per round trip from the server-side cursor during exports
+EXPORT_BATCH_SIZE = 1000
+
+
+def _cached_json_response(request: Request, etag: str, body: bytes) -> Response:
+    """JSON body with a strong ETag, or 304 when If-None-Match already has it"""
+    # no-cache: browsers keep the body but revalidate every time
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        get_read_cache().record_not_modified()
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _list_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """Resolve the fields= parameter to column names in table order"""
+    if fields is None:
+        return LIST_DEFAULT_FIELDS
+    requested = LIST_SUMMARY_FIELDS if fields.strip() == "summary" else [
+        name.strip() for name in fields.split(",") if name.strip()
+    ]
+    columns = Interaction.__table__.columns
+    unknown = [name for name in requested if name not in columns]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}. Valid fields: summary or {', '.join(columns.keys())}"
+        )
+    # id and created_at are always returned; next_cursor is built from them
+    wanted = set(requested) | {"id", "created_at"}
+    return tuple(name for name in columns.keys() if name in wanted)
+
+
+async def _interactions_version(db: AsyncSession) -> int:
+    """
+    Trigger-maintained change counter of the interactions table (read cache key)
+    Served by the read cache while its last read is fresh, otherwise one
+    primary-key lookup in table_versions.
+    """
+    cache = get_read_cache()
+    version, writes = cache.known_version()
+    if version is None:
+        version = await db.scalar(
+            select(TableVersion.version).where(TableVersion.table_name == Interaction.__tablename__)
+        ) or 0
+        cache.record_version(version, writes)
+    return version
+
+
+async def _day_spread(db: AsyncSession) -> Optional[Tuple[int, int]]:
+    """Trigger-maintained (days_before, days_after) bounds of explicit dates, if tracked"""
+    spread = await db.get(InteractionDaySpread, Interaction.__tablename__)
+    if spread is None:
+        return None
+    return spread.days_before, spread.days_after
+
+
+async def _total_interactions(db: AsyncSession) -> int:
+    """Total row count from the trigger-maintained counter, COUNT(*) as fallback"""
+    counter = await db.get(TableRowCount, Interaction.__tablename__)
+    if counter is not None:
+        return counter.row_count
+    return await db.scalar(select(func.count()).select_from(Interaction))
+
 
 @router.post("", response_model=InteractionResponse, status_code=status.HTTP_201_CREATED)
-def create_interaction(
-    interaction: InteractionCreate,
-    db: Session = Depends(get_db)
-) -> InteractionResponse:
+async def create_interaction(interaction: InteractionCreate) -> InteractionResponse:
     """
     Create a new HCP interaction.
     
@@ -30,59 +133,488 @@ def create_interaction(
             detail=f"Invalid interaction_type. Must be one of: {', '.join(valid_types)}"
         )
     
-    # Create new interaction object
-    db_interaction = Interaction(
-        hcp_name=interaction.hcp_name,
-        interaction_type=interaction.interaction_type,
-        notes=interaction.notes
-    )
+    # Save to database; concurrent saves share one commit
+    saved = await get_interaction_writer().insert({
+        "hcp_name": interaction.hcp_name,
+        "interaction_type": interaction.interaction_type,
+        "notes": interaction.notes
+    })
+    get_hcp_index().add(saved["hcp_name"])
+    
+    return InteractionResponse(**saved)
+
+
+def _validate_bulk_rows(
+    batch: List[Tuple[int, Any]]
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[BulkRowError]]:
+    """Validate a batch of raw rows against InteractionCreate and InteractionType"""
+    valid_types = {t.value for t in InteractionType}
+    rows, errors = [], []
+    
+    for index, raw in batch:
+        if isinstance(raw, BulkRowError):
+            errors.append(raw)
+            continue
+        try:
+            row = InteractionCreate.model_validate(raw)
+        except ValidationError as e:
+            detail = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc']) or 'row'}: {err['msg']}"
+                for err in e.errors()
+            )
+            errors.append(BulkRowError(index=index, error=detail))
+            continue
+        if row.interaction_type not in valid_types:
+            errors.append(BulkRowError(
+                index=index,
+                error=f"interaction_type: Invalid interaction_type '{row.interaction_type}'"
+            ))
+            continue
+        rows.append((index, row.model_dump()))
+    
+    return rows, errors
+
+
+async def _insert_bulk_rows(rows: List[Tuple[int, Dict[str, Any]]]) -> List[BulkRowError]:
+    """
+    Insert validated rows with one executemany in a single transaction.
+    If the batch is rejected, retry row by row so only the bad rows fail.
+    """
+    if not rows:
+        return []
+    
+    # A writer session per batch, so a slow upload never holds the writer between batches
+    async with AsyncWriteSessionLocal() as db:
+        return await _insert_bulk_batch(db, rows)
+
+
+async def _insert_bulk_batch(db: AsyncSession, rows: List[Tuple[int, Dict[str, Any]]]) -> List[BulkRowError]:
+    """Insert one batch on an open session, isolating bad rows on failure"""
+    try:
+        await assign_hcp_ids_async(db, [row for _, row in rows])
+        await db.execute(insert(Interaction.__table__), [row for _, row in rows])
+        await db.commit()
+        get_read_cache().record_write()
+        for _, row in rows:
+            get_hcp_index().add(row["hcp_name"])
+        return []
+    except PoolTimeoutError:
+        # No writer connection: not a problem with these rows (503 to the client)
+        raise
+    except SQLAlchemyError:
+        await db.rollback()
+    
+    errors = []
+    for index, row in rows:
+        try:
+            # HCP rows created by the rejected batch were rolled back with it
+            await assign_hcp_ids_async(db, [row])
+            await db.execute(insert(Interaction.__table__), [row])
+            await db.commit()
+            get_read_cache().record_write()
+            get_hcp_index().add(row["hcp_name"])
+        except SQLAlchemyError as e:
+            await db.rollback()
+            errors.append(BulkRowError(index=index, error=str(getattr(e, "orig", e))))
+    return errors
+
+
+async def _iter_bulk_body(request: Request):
+    """
+    Yield (index, row) pairs from a JSON array or a streamed NDJSON body.
+    Unparseable NDJSON lines are yielded as BulkRowError so they are reported.
+    """
+    content_type = request.headers.get("content-type", "")
+    
+    if "ndjson" in content_type or "jsonl" in content_type:
+        index = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    yield index, json.loads(line)
+                except ValueError as e:
+                    yield index, BulkRowError(index=index, error=f"Invalid JSON: {e}")
+                index += 1
+        if buffer.strip():
+            try:
+                yield index, json.loads(buffer)
+            except ValueError as e:
+                yield index, BulkRowError(index=index, error=f"Invalid JSON: {e}")
+        return
+    
+    try:
+        payload = json.loads(await request.body())
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid JSON body: {e}"
+        )
+    if not isinstance(payload, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Body must be a JSON array of interactions or NDJSON"
+        )
+    for index, raw in enumerate(payload):
+        yield index, raw
+
+
+@router.post("/bulk", response_model=BulkInsertResponse)
+async def bulk_create_interactions(request: Request) -> BulkInsertResponse:
+    """
+    Bulk-load HCP interactions.
+    
+    Accepts a JSON array (`application/json`) or newline-delimited JSON
+    (`application/x-ndjson`, streamed). Rows are validated and inserted in
+    batches of BULK_BATCH_SIZE, one transaction per batch. Invalid rows are
+    reported by index and never abort the rest of the load.
+    """
+    received = 0
+    inserted = 0
+    errors: List[BulkRowError] = []
+    batch: List[Tuple[int, Any]] = []
     
-    # Save to database
-    db.add(db_interaction)
-    db.commit()
-    db.refresh(db_interaction)
+    async def flush():
+        nonlocal inserted
+        rows, batch_errors = _validate_bulk_rows(batch)
+        insert_errors = await _insert_bulk_rows(rows)
+        inserted += len(rows) - len(insert_errors)
+        errors.extend(batch_errors)
+        errors.extend(insert_errors)
+        batch.clear()
     
-    return db_interaction
+    async for index, raw in _iter_bulk_body(request):
+        received += 1
+        batch.append((index, raw))
+        if len(batch) >= BULK_BATCH_SIZE:
+            await flush()
+    if batch:
+        await flush()
+    
+    errors.sort(key=lambda err: err.index)
+    return BulkInsertResponse(
+        received=received,
+        inserted=inserted,
+        failed=len(errors),
+        errors=errors
+    )
+
+
+async def _find_hcp_id(db: AsyncSession, hcp_name: str) -> Optional[int]:
+    """hcps.id for any spelling of a name, None if unknown"""
+    key = normalize_hcp_name(hcp_name)
+    if not key:
+        return None
+    return await db.scalar(select(Hcp.id).where(Hcp.normalized_name == key))
 
 
-@router.get("", response_model=InteractionListResponse)
-def get_interactions(
+@router.get(
+    "",
+    response_class=Response,
+    responses={
+        status.HTTP_200_OK: {"model": InteractionListResponse, "content": {"application/json": {}}},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Unchanged since the ETag in If-None-Match"},
+    },
+)
+async def get_interactions(
+    request: Request,
     limit: int = 50,
     offset: int = 0,
-    db: Session = Depends(get_db)
-) -> InteractionListResponse:
+    cursor: Optional[str] = None,
+    include_count: bool = True,
+    fields: Optional[str] = None,
+    full_notes: bool = False,
+    hcp_id: Optional[int] = None,
+    hcp_name: Optional[str] = Query(None, description="Any spelling of the HCP's name"),
+    interaction_type: Optional[str] = None,
+    hcp_sentiment: Optional[Literal["Positive", "Neutral", "Negative"]] = None,
+    date_from: Optional[date] = Query(None, description="Happened on or after this date (logged date if none was given)"),
+    date_to: Optional[date] = Query(None, description="Happened on or before this date (logged date if none was given)"),
+    db: AsyncSession = Depends(get_async_db)
+) -> Response:
     """
     Fetch all HCP interactions with pagination.
     
     - **limit**: Number of records to return (default 50, max 100)
-    - **offset**: Number of records to skip (default 0)
+    - **offset**: Number of records to skip (default 0, ignored when a cursor is given)
+    - **cursor**: `next_cursor` from the previous page; pages in constant time
+    - **include_count**: Include the total interaction count (default true; with filters, on the first page only)
+    - **fields**: `summary` or comma-separated columns to return (id and created_at always included)
+    - **full_notes**: With `fields`, return notes in full instead of a preview
+    - **hcp_id** / **hcp_name**: Only this HCP (a name matches every spelling variant)
+    - **interaction_type** / **hcp_sentiment**: Only this type / sentiment
+    - **date_from** / **date_to**: Inclusive range of interaction dates (the day it was logged if no date was given)
+    
+    Each filter (with the newest-first sort) is a range scan of a composite
+    index. Responses carry an ETag; send it back in If-None-Match to get 304
+    when nothing changed.
     """
     # Validate limit
-    limit = min(limit, 100)  # Max 100 per request
+    limit = max(1, min(limit, 100))  # Max 100 per request
+    _validate_interaction_type(interaction_type)
+    columns = _list_fields(fields)
+    # Projections preview notes; the default response keeps them whole
+    preview_notes = fields is not None and not full_notes and "notes" in columns
+    
+    # Unchanged pages come from the read cache after one primary-key lookup
+    cache = get_read_cache()
+    filters = {
+        "hcp_id": hcp_id,
+        "interaction_type": interaction_type,
+        "hcp_sentiment": hcp_sentiment,
+        "date_from": date_from,
+        "date_to": date_to,
+    }
+    cache_key = (
+        "list", limit, None if cursor else offset, cursor, include_count, columns, preview_notes,
+        hcp_name, *filters.values()
+    )
+    version = await _interactions_version(db)
+    cached = cache.get(cache_key, version)
+    if cached is not None:
+        return _cached_json_response(request, *cached)
+    
+    if hcp_name is not None:
+        resolved = await _find_hcp_id(db, hcp_name)
+        if resolved is None or (hcp_id is not None and hcp_id != resolved):
+            # No such HCP: an empty page, without scanning interactions
+            body = orjson.dumps({"count": 0 if include_count else None, "interactions": [], "next_cursor": None})
+            return _cached_json_response(request, cache.set(cache_key, version, body), body)
+        filters["hcp_id"] = resolved
+    
+    day_spread = None
+    if date_from is not None or date_to is not None:
+        day_spread = await _day_spread(db)
+    query = list_query(columns, preview_notes, day_spread, **filters)
+    
+    if cursor:
+        query = after_cursor(query, cursor)
+    elif offset:
+        query = query.offset(offset)
+    
+    # Fetch one extra row to know whether another page exists
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1])
+    
+    interactions = [dict(row._mapping) for row in rows]
+    if preview_notes:
+        for interaction in interactions:
+            notes = interaction["notes"]
+            interaction["notes_truncated"] = notes is not None and len(notes) > NOTE_PREVIEW_CHARS
+            if interaction["notes_truncated"]:
+                interaction["notes"] = notes[:NOTE_PREVIEW_CHARS].rstrip() + "…"
+    
+    count = None
+    if include_count:
+        if not any(value is not None for value in filters.values()):
+            count = await _total_interactions(db)
+        elif not cursor:
+            # A filtered COUNT reads every match, so cursor pages skip it and
+            # clients keep the first page's count
+            count = await db.scalar(
+                apply_filters(select(func.count()).select_from(Interaction), **filters)
+            )
+    
+    body = orjson.dumps({
+        "count": count,
+        "interactions": interactions,
+        "next_cursor": next_cursor
+    })
+    return _cached_json_response(request, cache.set(cache_key, version, body), body)
+
+
+def _validate_interaction_type(interaction_type: Optional[str]) -> None:
+    """Reject interaction_type filters that are not an InteractionType value"""
+    valid_types = [t.value for t in InteractionType]
+    if interaction_type is not None and interaction_type not in valid_types:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid interaction_type. Must be one of: {', '.join(valid_types)}"
+        )
+
+
+def _export_value(value: Any) -> Any:
+    """Render dates and times as ISO strings for CSV/NDJSON"""
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return value
+
+
+async def _stream_export(query, export_format: str) -> AsyncIterator[str]:
+    """
+    Stream query rows as CSV or NDJSON, one chunk per cursor batch.
+    Opens its own session because it outlives the request dependencies.
+    """
+    columns = [column.name for column in Interaction.__table__.columns]
     
-    # Query interactions, ordered by most recent first
-    interactions = db.query(Interaction).order_by(
-        desc(Interaction.created_at)
-    ).offset(offset).limit(limit).all()
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue()
     
-    # Count total interactions
-    total_count = db.query(Interaction).count()
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            if export_format == "csv":
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([_export_value(value) for value in row] for row in rows)
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps({name: _export_value(value) for name, value in zip(columns, row)}) + "\n"
+                    for row in rows
+                )
+
+
+@router.get("/export")
+async def export_interactions(
+    format: Literal["csv", "ndjson"] = "csv",
+    interaction_type: Optional[str] = None,
+    date_from: Optional[date] = Query(None, description="Happened on or after this date (logged date if none was given)"),
+    date_to: Optional[date] = Query(None, description="Happened on or before this date (logged date if none was given)")
+) -> StreamingResponse:
+    """
+    Stream every matching interaction as CSV or NDJSON.
+    
+    Rows are read through a server-side cursor and written as they arrive,
+    so memory use stays flat regardless of export size.
     
-    return InteractionListResponse(
-        count=total_count,
-        interactions=interactions
+    - **format**: `csv` (default) or `ndjson`
+    - **interaction_type**: Only export this type
+    - **date_from** / **date_to**: Inclusive range of interaction dates (the day it was logged if no date was given)
+    """
+    _validate_interaction_type(interaction_type)
+    
+    query = apply_filters(
+        select(*Interaction.__table__.columns),
+        interaction_type, date_from, date_to
+    ).order_by(Interaction.created_at, Interaction.id)
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"interactions.{format}"
+    return StreamingResponse(
+        _stream_export(query, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+def _search_terms(q: str) -> List[str]:
+    """Split a user query into plain word terms (no FTS operators)"""
+    return re.findall(r"\w+", q)
+
+
+def _make_snippet(row: Dict[str, Any], terms: List[str], width: int = 80) -> Optional[str]:
+    """Python-side snippet for MySQL, which has no snippet() function"""
+    pattern = re.compile("|".join(re.escape(term) for term in terms), re.IGNORECASE)
+    for column_name in FULLTEXT_COLUMNS:
+        value = row.get(column_name) or ""
+        match = pattern.search(value)
+        if match:
+            start = max(0, match.start() - width // 2)
+            window = value[start:start + width]
+            highlighted = pattern.sub(lambda m: f"[{m.group(0)}]", window)
+            return ("..." if start else "") + highlighted + ("..." if start + width < len(value) else "")
+    return None
+
+
+@router.get("/search", response_model=InteractionSearchResponse)
+async def search_interactions(
+    q: str = Query(..., min_length=1, description="Words to search for in notes, topics, outcomes and follow-ups"),
+    interaction_type: Optional[str] = None,
+    date_from: Optional[date] = Query(None, description="Happened on or after this date (logged date if none was given)"),
+    date_to: Optional[date] = Query(None, description="Happened on or before this date (logged date if none was given)"),
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_db)
+) -> InteractionSearchResponse:
+    """
+    Full-text search over interaction free-text fields, best matches first.
+    
+    Backed by an FTS5 index on SQLite and a FULLTEXT index on MySQL, so it
+    never scans the table. All words must match (the last one as a prefix
+    on SQLite). Combine with the same filters as the export endpoint.
+    """
+    _validate_interaction_type(interaction_type)
+    limit = max(1, min(limit, 100))
+    
+    terms = _search_terms(q)
+    if not terms:
+        return InteractionSearchResponse(query=q, results=[])
+    
+    if is_sqlite:
+        fts = table(FTS_TABLE_NAME, column("rowid"))
+        # Quote every term so user input can never be parsed as FTS5 syntax
+        match = " ".join(f'"{term}"' for term in terms) + "*"
+        query = select(
+            Interaction.id,
+            Interaction.hcp_name,
+            Interaction.interaction_type,
+            Interaction.created_at,
+            literal_column(f"-bm25({FTS_TABLE_NAME})").label("score"),
+            literal_column(f"snippet({FTS_TABLE_NAME}, -1, '[', ']', '...', 12)").label("snippet"),
+        ).select_from(
+            fts.join(Interaction, Interaction.id == fts.c.rowid)
+        ).where(
+            text(f"{FTS_TABLE_NAME} MATCH :match").bindparams(match=match)
+        ).order_by(text(f"bm25({FTS_TABLE_NAME})"))
+    else:
+        fulltext_columns = [getattr(Interaction, column_name) for column_name in FULLTEXT_COLUMNS]
+        relevance = mysql_match(
+            *fulltext_columns,
+            against=" ".join(f"+{term}" for term in terms) + "*"
+        ).in_boolean_mode()
+        query = select(
+            Interaction.id,
+            Interaction.hcp_name,
+            Interaction.interaction_type,
+            Interaction.created_at,
+            *fulltext_columns,
+            relevance.label("score"),
+        ).where(relevance).order_by(desc("score"))
+    
+    query = apply_filters(query, interaction_type, date_from, date_to).limit(limit)
+    rows = (await db.execute(query)).mappings().all()
+    
+    return InteractionSearchResponse(
+        query=q,
+        results=[
+            InteractionSearchHit(
+                id=row["id"],
+                hcp_name=row["hcp_name"],
+                interaction_type=row["interaction_type"],
+                created_at=row["created_at"],
+                score=row["score"],
+                snippet=row["snippet"] if is_sqlite else _make_snippet(row, terms),
+            )
+            for row in rows
+        ]
     )
 
 
 @router.get("/{interaction_id}", response_model=InteractionResponse)
-def get_interaction(
+async def get_interaction(
     interaction_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ) -> InteractionResponse:
-    """Get a specific interaction by ID"""
-    interaction = db.query(Interaction).filter(
-        Interaction.id == interaction_id
-    ).first()
+    """Get a specific interaction by ID (ETag / If-None-Match supported)"""
+    cache = get_read_cache()
+    cache_key = ("item", interaction_id)
+    version = await _interactions_version(db)
+    cached = cache.get(cache_key, version)
+    if cached is not None:
+        return _cached_json_response(request, *cached)
+    
+    interaction = await db.get(Interaction, interaction_id)
     
     if not interaction:
         raise HTTPException(
@@ -90,18 +622,17 @@ def get_interaction(
             detail=f"Interaction with id {interaction_id} not found"
         )
     
-    return interaction
+    body = InteractionResponse.model_validate(interaction).model_dump_json().encode()
+    return _cached_json_response(request, cache.set(cache_key, version, body), body)
 
 
 @router.delete("/{interaction_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_interaction(
+async def delete_interaction(
     interaction_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_write_db)
 ):
     """Delete an interaction by ID"""
-    interaction = db.query(Interaction).filter(
-        Interaction.id == interaction_id
-    ).first()
+    interaction = await db.get(Interaction, interaction_id)
     
     if not interaction:
         raise HTTPException(
@@ -109,7 +640,9 @@ def delete_interaction(
             detail=f"Interaction with id {interaction_id} not found"
         )
     
-    db.delete(interaction)
-    db.commit()
+    await db.delete(interaction)
+    await db.commit()
+    get_read_cache().record_write()
+    get_hcp_index().remove(interaction.hcp_name)
     
     return None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from datetime import datetime
+from datetime import date as date_type, datetime, time as time_type
 from typing import Optional, List
 
 
@@ -22,6 +22,7 @@ class InteractionCreate(BaseModel):
 class InteractionResponse(InteractionCreate):
     """Schema for interaction response"""
     id: int
+    hcp_id: Optional[int] = Field(None, description="HCP entity this interaction belongs to (see /hcps/{id})")
     created_at: datetime
 
     class Config:
@@ -30,6 +31,7 @@ class InteractionResponse(InteractionCreate):
             "example": {
                 "id": 1,
                 "hcp_name": "Dr. John Smith",
+                "hcp_id": 7,
                 "interaction_type": "Visit",
                 "notes": "Discussed new product features",
                 "created_at": "2024-01-15T10:30:00"
@@ -37,10 +39,36 @@ class InteractionResponse(InteractionCreate):
         }
 
 
+class InteractionListItem(BaseModel):
+    """
+    Schema for a row in the interaction list
+    Which keys are present depends on fields=: by default the InteractionResponse
+    columns, with fields=summary or a column list only those (id and created_at
+    always), plus notes_truncated when notes are previewed.
+    """
+    id: int
+    created_at: datetime
+    hcp_name: Optional[str] = None
+    hcp_id: Optional[int] = None
+    interaction_type: Optional[str] = None
+    date: Optional[date_type] = None
+    time: Optional[time_type] = None
+    attendees: Optional[str] = None
+    topics_discussed: Optional[str] = None
+    materials_shared: Optional[str] = None
+    samples_distributed: Optional[str] = None
+    hcp_sentiment: Optional[str] = None
+    outcomes: Optional[str] = None
+    follow_up_actions: Optional[str] = None
+    notes: Optional[str] = None
+    notes_truncated: Optional[bool] = Field(None, description="Notes were cut to a preview (projections without full_notes=true)")
+
+
 class InteractionListResponse(BaseModel):
     """Schema for list of interactions"""
-    count: int
-    interactions: List[InteractionResponse]
+    count: Optional[int] = Field(None, description="Total matching interactions (omitted when include_count=false, and on filtered cursor pages)")
+    interactions: List[InteractionListItem]
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, null on the last page")
 
     class Config:
         json_schema_extra = {
@@ -54,6 +82,110 @@ class InteractionListResponse(BaseModel):
                         "notes": "Discussed new product features",
                         "created_at": "2024-01-15T10:30:00"
                     }
+                ],
+                "next_cursor": "MjAyNC0wMS0xNVQxMDozMDowMHwx"
+            }
+        }
+
+
+class BulkRowError(BaseModel):
+    """A rejected row in a bulk load"""
+    index: int = Field(..., description="Zero-based position of the row in the request body")
+    error: str
+
+
+class BulkInsertResponse(BaseModel):
+    """Schema for bulk ingestion results"""
+    received: int
+    inserted: int
+    failed: int
+    errors: List[BulkRowError] = []
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "received": 3,
+                "inserted": 2,
+                "failed": 1,
+                "errors": [
+                    {"index": 1, "error": "interaction_type: Invalid interaction_type 'Lunch'"}
+                ]
+            }
+        }
+
+
+class InteractionSearchHit(BaseModel):
+    """A ranked full-text search match"""
+    id: int
+    hcp_name: str
+    interaction_type: str
+    created_at: datetime
+    score: float = Field(..., description="Relevance, higher is better")
+    snippet: Optional[str] = Field(None, description="Matched text with terms wrapped in [ ]")
+
+
+class InteractionSearchResponse(BaseModel):
+    """Schema for full-text search results"""
+    query: str
+    results: List[InteractionSearchHit]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "query": "efficacy data",
+                "results": [
+                    {
+                        "id": 2,
+                        "hcp_name": "Dr. Sneha Patil",
+                        "interaction_type": "Visit",
+                        "created_at": "2024-01-15T10:30:00",
+                        "score": 4.21,
+                        "snippet": "...Dr. Patil requested further [efficacy] [data], follow-up visit..."
+                    }
                 ]
             }
         }
+
+
+class AnalyticsBucket(BaseModel):
+    """Interaction count for one bucket (an HCP, a type, a sentiment, a day or a week)"""
+    bucket: str
+    count: int
+    hcp_id: Optional[int] = Field(None, description="For group_by=hcp: the HCP entity (see /hcps/{id})")
+
+
+class AnalyticsResponse(BaseModel):
+    """Schema for rollup-backed interaction counts"""
+    group_by: str
+    total: int = Field(..., description="Sum of the returned buckets")
+    buckets: List[AnalyticsBucket]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "group_by": "week",
+                "total": 12,
+                "buckets": [
+                    {"bucket": "2024-01-08", "count": 5},
+                    {"bucket": "2024-01-15", "count": 7}
+                ]
+            }
+        }
+
+
+class HcpResponse(BaseModel):
+    """Schema for an HCP entity"""
+    id: int
+    canonical_name: str
+    aliases: List[str] = Field(..., description="Every spelling of the name seen in interactions")
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class HcpTimelineResponse(BaseModel):
+    """Schema for one HCP's interactions, newest first"""
+    hcp: HcpResponse
+    interactions: List[InteractionResponse]
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page, null on the last page")
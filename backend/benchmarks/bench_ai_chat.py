@@ -0,0 +1,188 @@
+"""
+End-to-end /ai/chat benchmark
+Drives the API at a fixed concurrency and reports throughput, latency
+percentiles and per-graph-node time.
+
+Run against a server using the local stand-in, e.g.:
+    python benchmarks/llm_standin.py --latency-ms 400 &
+    LLM_PROVIDER=local uvicorn app.main:app --port 8000 &
+    python benchmarks/bench_ai_chat.py --requests 200 --concurrency 16
+
+Per-node times come from a second pass over /ai/chat/stream (its node
+events carry elapsed_ms), so agent overhead can be read separately from
+model latency (process_with_llm).
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter, defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+
+DEFAULT_NOTES = [
+    "Visit with Dr. Sarah Johnson today, discussed Product X efficacy in elderly patients",
+    "Called Dr. Raj Patel about the new dosing guide and sample request",
+    "Video call with Dr. Emily Chen, went over the phase III trial results",
+    "Quick chat at the conference with the cardiology lead about formulary status",
+    "Dropped off brochures at the clinic; the nurse said the doctor will call back",
+]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "mean": round(statistics.fmean(values), 2) if values else 0.0,
+        "p50": round(_percentile(values, 50), 2),
+        "p95": round(_percentile(values, 95), 2),
+        "p99": round(_percentile(values, 99), 2),
+        "max": round(max(values), 2) if values else 0.0,
+    }
+
+
+def _note(notes: List[str], i: int, vary: bool) -> str:
+    note = notes[i % len(notes)]
+    # A unique suffix keeps the LLM response cache from answering repeats
+    return f"{note} (ref #{i})" if vary else note
+
+
+async def _run(concurrency: int, count: int, send: Callable[[int], Awaitable[Any]]) -> float:
+    """Run send(i) for i in range(count) with at most concurrency in flight"""
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(count):
+        queue.put_nowait(i)
+
+    async def worker() -> None:
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await send(i)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started
+
+
+async def bench_chat(client: httpx.AsyncClient, notes: List[str], args) -> Dict[str, Any]:
+    """Throughput and latency of POST /ai/chat"""
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    sources: Counter = Counter()
+
+    async def send(i: int) -> None:
+        started = time.perf_counter()
+        try:
+            response = await client.post("/ai/chat", json={"user_message": _note(notes, i, args.vary)})
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] += 1
+            return
+        latencies.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            statuses[str(response.status_code)] += 1
+            return
+        body = response.json()
+        statuses[body.get("status", "unknown")] += 1
+        sources[(body.get("extraction") or {}).get("source", "unknown")] += 1
+
+    elapsed = await _run(args.concurrency, args.requests, send)
+    return {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": _summary(latencies),
+        "statuses": dict(statuses),
+        "extraction_sources": dict(sources),
+    }
+
+
+async def bench_nodes(client: httpx.AsyncClient, notes: List[str], args, offset: int) -> Dict[str, Any]:
+    """Per-node elapsed time from /ai/chat/stream node events"""
+    node_times: Dict[str, List[float]] = defaultdict(list)
+
+    async def send(i: int) -> None:
+        payload = {"user_message": _note(notes, offset + i, args.vary)}
+        async with client.stream("POST", "/ai/chat/stream", json=payload) as response:
+            event = None
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: ") and event == "node":
+                    data = json.loads(line[len("data: "):])
+                    if data.get("status") == "end":
+                        node_times[data["node"]].append(data["elapsed_ms"])
+
+    await _run(args.concurrency, args.node_requests, send)
+    return {node: _summary(times) for node, times in node_times.items()}
+
+
+async def main_async(args) -> Dict[str, Any]:
+    notes = DEFAULT_NOTES
+    if args.notes:
+        with open(args.notes, encoding="utf-8") as f:
+            notes = [line.strip() for line in f if line.strip()]
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        if args.warmup:
+            await _run(min(args.concurrency, args.warmup), args.warmup,
+                       lambda i: client.post("/ai/chat", json={"user_message": _note(notes, -1 - i, args.vary)}))
+
+        report: Dict[str, Any] = {"chat": await bench_chat(client, notes, args)}
+        if args.node_requests:
+            report["nodes_ms"] = await bench_nodes(client, notes, args, offset=args.requests)
+    return report
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    chat = report["chat"]
+    latency = chat["latency_ms"]
+    print(f"/ai/chat  {chat['requests']} requests @ concurrency {chat['concurrency']} in {chat['elapsed_s']}s")
+    print(f"  throughput  {chat['throughput_rps']} req/s")
+    print(f"  latency ms  p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    print(f"  statuses    {chat['statuses']}")
+    print(f"  extraction  {chat['extraction_sources']}")
+    if report.get("nodes_ms"):
+        print("per-node ms (from /ai/chat/stream)")
+        for node, stats in report["nodes_ms"].items():
+            print(f"  {node:<18} n={stats['count']:<5} p50 {stats['p50']:<8} p95 {stats['p95']:<8} p99 {stats['p99']}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark POST /ai/chat end to end")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests sent first")
+    parser.add_argument("--node-requests", type=int, default=20,
+                        help="Requests for the per-node pass over /ai/chat/stream (0 to skip)")
+    parser.add_argument("--notes", help="File with one note per line (default: built-in samples)")
+    parser.add_argument("--no-vary", dest="vary", action="store_false",
+                        help="Send notes verbatim so repeats can hit the LLM cache")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
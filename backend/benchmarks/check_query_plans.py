@@ -0,0 +1,137 @@
+"""
+Query plan check for the filtered interactions list
+Compiles the list query for each common filter shape, asks the database
+for its plan and fails unless every shape reads one index in sort order:
+a sort step or a full table scan fails. Date ranges are read as the
+created_at range they imply (see app.pagination.created_at_range).
+
+Run from backend/ against the configured DATABASE_URL:
+    python benchmarks/check_query_plans.py
+    python benchmarks/check_query_plans.py --seed 1000000   # time them on a scratch DB
+
+--seed inserts synthetic rows first, so point DATABASE_URL at a scratch
+database when using it.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from sqlalchemy import insert, select, text  # noqa: E402
+
+from app.database import create_tables, engine  # noqa: E402
+from app.models import Interaction, InteractionDaySpread  # noqa: E402
+from app.pagination import LIST_SUMMARY_FIELDS, list_query  # noqa: E402
+
+# (label, filters) shapes the list endpoint serves
+FILTER_SHAPES: List[Tuple[str, Dict[str, Any]]] = [
+    ("unfiltered", {}),
+    ("hcp_id", {"hcp_id": 1}),
+    ("interaction_type", {"interaction_type": "Visit"}),
+    ("hcp_sentiment", {"hcp_sentiment": "Negative"}),
+    ("date range", {"date_from": date(2024, 1, 1), "date_to": date(2024, 3, 31)}),
+    ("hcp_id + date range", {"hcp_id": 1, "date_from": date(2024, 1, 1), "date_to": date(2024, 3, 31)}),
+    ("type + date range", {"interaction_type": "Call", "date_from": date(2024, 1, 1), "date_to": date(2024, 3, 31)}),
+    ("sentiment + date range", {"hcp_sentiment": "Positive", "date_from": date(2024, 1, 1)}),
+]
+
+PAGE_SIZE = 50
+
+
+def _compile(query) -> str:
+    return str(query.compile(engine, compile_kwargs={"literal_binds": True}))
+
+
+def _plan(connection, sql: str) -> List[str]:
+    if engine.dialect.name == "sqlite":
+        return [row[-1] for row in connection.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+    return [" | ".join(str(value) for value in row) for row in connection.execute(text(f"EXPLAIN {sql}"))]
+
+
+def _plan_problems(plan: List[str]) -> List[str]:
+    """Reasons a plan is not a single in-order index scan"""
+    problems = []
+    for line in plan:
+        upper = line.upper()
+        if engine.dialect.name == "sqlite":
+            if upper.startswith("SCAN") and "INDEX" not in upper:
+                problems.append(f"full table scan: {line}")
+            if "TEMP B-TREE" in upper:
+                problems.append(f"sort step: {line}")
+        else:
+            if "| ALL |" in upper:
+                problems.append(f"full table scan: {line}")
+            if "USING FILESORT" in upper:
+                problems.append(f"sort step: {line}")
+    return problems
+
+
+def seed(rows: int, hcps: int = 2000, batch: int = 10000) -> None:
+    """Insert synthetic interactions spread over three years"""
+    start = datetime(2022, 1, 1)
+    span = int(timedelta(days=3 * 365).total_seconds())
+    types = ["Visit", "Call", "Virtual", "Meeting"]
+    sentiments = ["Positive", "Neutral", "Negative", None]
+    with engine.begin() as connection:
+        for offset in range(0, rows, batch):
+            connection.execute(insert(Interaction.__table__), [
+                {
+                    "hcp_name": f"Dr. Synthetic {n % hcps}",
+                    "hcp_id": None,
+                    "interaction_type": random.choice(types),
+                    "hcp_sentiment": random.choice(sentiments),
+                    "notes": "Synthetic interaction for plan checks",
+                    "created_at": start + timedelta(seconds=random.randrange(span)),
+                }
+                for n in range(offset, min(rows, offset + batch))
+            ])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Check that filtered list queries use an index")
+    parser.add_argument("--seed", type=int, default=0, help="Insert this many synthetic rows first")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per shape")
+    args = parser.parse_args(argv)
+
+    create_tables()
+    if args.seed:
+        seed(args.seed)
+        from app.hcps import backfill_hcp_ids
+        backfill_hcp_ids()
+        # Planner statistics after the hcp_id backfill, so they see the linked rows
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+
+    failures = 0
+    with engine.connect() as connection:
+        spread = connection.execute(
+            select(InteractionDaySpread.days_before, InteractionDaySpread.days_after)
+        ).first()
+        for label, filters in FILTER_SHAPES:
+            day_spread = tuple(spread) if spread is not None and ("date_from" in filters or "date_to" in filters) else None
+            sql = _compile(list_query(LIST_SUMMARY_FIELDS, True, day_spread, **filters).limit(PAGE_SIZE + 1))
+            plan = _plan(connection, sql)
+            problems = _plan_problems(plan)
+
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                connection.execute(text(sql)).all()
+            elapsed_ms = (time.perf_counter() - started) / args.repeat * 1000
+
+            status = "FAIL" if problems else "ok"
+            print(f"{status:<5} {label:<24} {elapsed_ms:8.2f} ms  {'; '.join(plan)}")
+            for problem in problems:
+                print(f"      {problem}")
+            failures += bool(problems)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Local LLM stand-in server
+Speaks the Groq (OpenAI-compatible) chat completions protocol with a
+configurable latency distribution, token rate and canned JSON responses,
+so /ai/chat can be load-tested offline.
+
+Run:
+    python benchmarks/llm_standin.py --port 8001 --latency-ms 400 --tokens-per-second 250
+
+Then start the API with LLM_PROVIDER=local (LLM_BASE_URL=http://127.0.0.1:8001).
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+_TITLED_NAME = re.compile(r"\b(?:Dr|Doctor|Prof|Professor)\.?\s+[A-Z][\w'\-]*(?:\s+[A-Z][\w'\-]*)?")
+_TYPE_WORDS = (("Virtual", ("video", "zoom", "teams", "virtual")), ("Call", ("call", "phone")))
+
+
+class StandInConfig:
+    """Latency / throughput knobs for the stand-in"""
+
+    def __init__(
+        self,
+        latency_ms: float = 400.0,
+        latency_sigma: float = 0.5,
+        tokens_per_second: float = 250.0,
+        error_rate: float = 0.0,
+        responses: Optional[List[Any]] = None
+    ):
+        # Time to first token is lognormal around latency_ms (sigma 0 = fixed)
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self._responses = itertools.cycle(responses) if responses else None
+
+    def first_token_delay(self) -> float:
+        if self.latency_sigma <= 0:
+            return self.latency_ms / 1000
+        return random.lognormvariate(0, self.latency_sigma) * self.latency_ms / 1000
+
+    def next_canned(self) -> Optional[Any]:
+        return next(self._responses) if self._responses else None
+
+
+def _default_reply(user_text: str) -> str:
+    """Extraction JSON in the shape the agent's system prompt asks for"""
+    name = _TITLED_NAME.search(user_text)
+    lowered = user_text.lower()
+    interaction_type = next(
+        (label for label, words in _TYPE_WORDS if any(word in lowered for word in words)),
+        "Visit"
+    )
+    extracted = {
+        "hcp_name": name.group(0) if name else "Dr. Unknown",
+        "interaction_type": interaction_type,
+        "notes": user_text.strip()[:500],
+    }
+    return json.dumps({
+        "understanding": "Logged interaction",
+        "extracted_data": extracted,
+        "tools_to_call": [
+            {"name": "compliance_check", "input": {"text": extracted["notes"]}},
+            {"name": "next_best_action", "input": extracted},
+        ],
+    }, indent=2)
+
+
+def _tokens(text: str) -> List[str]:
+    """Split text into ~4-character pieces standing in for tokens"""
+    return [text[i:i + 4] for i in range(0, len(text), 4)] or [""]
+
+
+def _usage(messages: List[Dict[str, Any]], completion: str) -> Dict[str, int]:
+    prompt_tokens = sum(len(str(message.get("content", ""))) for message in messages) // 4
+    completion_tokens = len(_tokens(completion))
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+    }
+
+
+def create_app(config: StandInConfig) -> FastAPI:
+    """Stand-in app exposing /openai/v1/chat/completions"""
+    app = FastAPI(title="LLM stand-in")
+
+    @app.get("/openai/v1/models")
+    def models() -> Dict[str, Any]:
+        return {"object": "list", "data": [{"id": "stand-in", "object": "model"}]}
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        model = body.get("model", "stand-in")
+
+        if config.error_rate and random.random() < config.error_rate:
+            return JSONResponse(
+                status_code=429,
+                content={"error": {"message": "Rate limit reached (stand-in)", "type": "rate_limit"}},
+                headers={"retry-after": "1"}
+            )
+
+        canned = config.next_canned()
+        if canned is None:
+            user_text = next(
+                (str(m.get("content", "")) for m in reversed(messages) if m.get("role") == "user"), ""
+            )
+            completion = _default_reply(user_text)
+        else:
+            completion = canned if isinstance(canned, str) else json.dumps(canned)
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        usage = _usage(messages, completion)
+        token_delay = 1 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+        await asyncio.sleep(config.first_token_delay())
+
+        if not body.get("stream"):
+            await asyncio.sleep(usage["completion_tokens"] * token_delay)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": completion},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            }
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None, **extra) -> str:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                **extra,
+            }
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def stream() -> AsyncIterator[str]:
+            yield chunk({"role": "assistant", "content": ""})
+            for piece in _tokens(completion):
+                yield chunk({"content": piece})
+                if token_delay:
+                    await asyncio.sleep(token_delay)
+            yield chunk({}, "stop", x_groq={"usage": usage})
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local OpenAI/Groq-compatible LLM stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="Median time to first token")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Lognormal spread (0 = fixed)")
+    parser.add_argument("--tokens-per-second", type=float, default=250.0, help="Completion token rate (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--responses", help="JSON file with a list of canned replies (strings or objects), cycled")
+    args = parser.parse_args()
+
+    responses = None
+    if args.responses:
+        with open(args.responses, encoding="utf-8") as f:
+            responses = json.load(f)
+
+    config = StandInConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        responses=responses
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
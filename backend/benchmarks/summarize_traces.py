@@ -0,0 +1,55 @@
+"""
+Tail latency by span from exported agent traces
+Reads the OTLP/JSON file written when TRACE_EXPORT_FILE is set and prints
+count and p50/p95/p99/max per span name (graph nodes, llm.completion,
+tool.<name>), slowest p95 first.
+
+    TRACE_EXPORT_FILE=traces.jsonl uvicorn app.main:app --port 8000
+    python benchmarks/summarize_traces.py traces.jsonl
+"""
+
+import argparse
+import json
+from collections import defaultdict
+from typing import Dict, List
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def span_durations(path: str) -> Dict[str, List[float]]:
+    """Durations (ms) per span name across every trace in the file"""
+    durations: Dict[str, List[float]] = defaultdict(list)
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            for resource in json.loads(line).get("resourceSpans", []):
+                for scope in resource.get("scopeSpans", []):
+                    for span in scope.get("spans", []):
+                        elapsed = int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])
+                        durations[span["name"]].append(elapsed / 1e6)
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Latency percentiles per span from an OTLP/JSON trace file")
+    parser.add_argument("path", help="File written by the OTLP/JSON file exporter (TRACE_EXPORT_FILE)")
+    args = parser.parse_args()
+
+    rows = [
+        (name, len(values), *(_percentile(values, pct) for pct in (50, 95, 99)), max(values))
+        for name, values in span_durations(args.path).items()
+    ]
+    print(f"{'span':<32} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, count, p50, p95, p99, slowest in sorted(rows, key=lambda row: -row[3]):
+        print(f"{name:<32} {count:>7} {p50:>9.2f} {p95:>9.2f} {p99:>9.2f} {slowest:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
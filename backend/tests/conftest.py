@@ -0,0 +1,56 @@
+"""
+Shared fixtures for the backend tests
+The whole run uses a scratch SQLite database; DATABASE_URL has to point at
+it before app.database is imported, so it is set at the top of this file.
+"""
+
+import os
+import sys
+import tempfile
+
+_scratch_dir = tempfile.mkdtemp(prefix="hcp-crm-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_scratch_dir, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("LLM_CACHE_DB_PATH", None)
+os.environ.setdefault("SQLITE_SYNCHRONOUS", "NORMAL")
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import pytest  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+import app.models  # noqa: E402,F401 (registers the tables)
+from app.database import async_engine, async_write_engine, create_tables, engine  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    """Create the schema (tables, indexes, triggers) once per run"""
+    create_tables()
+    yield engine
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def clean_db():
+    """
+    Empty interactions and hcps; the triggers keep counters and rollups in
+    step, and the day spread (which only widens) is reset for the empty table
+    """
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM interactions"))
+        connection.execute(text("DELETE FROM hcps"))
+        connection.execute(text("UPDATE interaction_day_spread SET days_before = 0, days_after = 0"))
+    yield engine
+
+
+@pytest.fixture
+async def async_engines():
+    """Close the async pools after a test, since each test runs its own event loop"""
+    yield
+    await async_engine.dispose()
+    await async_write_engine.dispose()
@@ -0,0 +1,68 @@
+import pytest
+
+from app.ai import fast_path
+from app.ai.fast_path import (
+    DISCUSSION_WEIGHT,
+    KNOWN_HCP_WEIGHT,
+    TITLED_HCP_WEIGHT,
+    TYPE_WEIGHT,
+    FastPathExtractor,
+)
+from app.ai.hcp_index import HcpNameIndex
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    """Extractor over an index that knows one HCP"""
+    index = HcpNameIndex()
+    index.add("Dr. Sarah Johnson", 3)
+    monkeypatch.setattr(fast_path, "get_hcp_index", lambda: index)
+    return FastPathExtractor(min_confidence=0.8)
+
+
+def test_known_hcp_with_type_and_discussion_skips_the_llm(extractor):
+    note = "Visited Dr. Sarah Johnson today, discussed the new inhaler"
+
+    result = extractor.accept(note)
+
+    assert result["confidence"] == round(KNOWN_HCP_WEIGHT + TYPE_WEIGHT + DISCUSSION_WEIGHT, 2)
+    assert result["extracted_data"] == {"hcp_name": "Dr. Sarah Johnson", "interaction_type": "Visit", "notes": note}
+    assert [tool["name"] for tool in result["tools_to_call"]] == ["compliance_check", "next_best_action"]
+
+
+def test_untitled_known_name_counts_as_known(extractor):
+    result = extractor.extract("Call with Sarah Johnson, went over dosing")
+
+    assert result["extracted_data"]["hcp_name"] == "Dr. Sarah Johnson"
+    assert result["confidence"] == round(KNOWN_HCP_WEIGHT + TYPE_WEIGHT + DISCUSSION_WEIGHT, 2)
+
+
+def test_unknown_titled_name_stays_below_the_threshold(extractor):
+    result = extractor.extract("Visited Dr. Sarah Jonsen today, discussed the new inhaler")
+
+    assert result["confidence"] == round(TITLED_HCP_WEIGHT + TYPE_WEIGHT + DISCUSSION_WEIGHT, 2)
+    assert extractor.accept("Visited Dr. Sarah Jonsen today, discussed the new inhaler") is None
+
+
+@pytest.mark.parametrize("note", [
+    "Visited Dr. Sarah Johnson and Dr. Mark Lee, discussed trials",  # two doctors
+    "Dr. Sarah Johnson, discussed trials",                          # no interaction type
+    "Met Dr. Sarah Johnson, then called her back about trials",     # Visit and Call
+])
+def test_ambiguous_notes_go_to_the_llm(extractor, note):
+    result = extractor.extract(note)
+
+    assert result["extracted_data"] is None
+    assert extractor.accept(note) is None
+
+
+def test_video_call_is_virtual(extractor):
+    result = extractor.extract("Video call with Dr. Sarah Johnson, reviewed samples")
+
+    assert result["extracted_data"]["interaction_type"] == "Virtual"
+
+
+def test_threshold_above_one_disables_the_fast_path(extractor):
+    extractor.min_confidence = 1.01
+
+    assert extractor.accept("Visited Dr. Sarah Johnson today, discussed the new inhaler") is None
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from app.group_commit import GroupCommitWriter
+from app.models import Interaction
+
+pytestmark = pytest.mark.anyio
+
+
+def _row(n: int, interaction_type="Call"):
+    return {"hcp_name": f"Dr. Batch {n}", "interaction_type": interaction_type, "notes": f"note {n}"}
+
+
+def _stored(engine) -> int:
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(Interaction)).scalar()
+
+
+async def test_concurrent_inserts_share_one_commit(clean_db, async_engines):
+    writer = GroupCommitWriter(window_ms=50, max_batch=64)
+
+    saved = await asyncio.gather(*(writer.insert(_row(n)) for n in range(10)))
+
+    assert writer.batches == 1
+    assert writer.rows == 10
+    assert writer.largest_batch == 10
+    assert len({row["id"] for row in saved}) == 10
+    assert all(row["created_at"] is not None for row in saved)
+    assert [row["notes"] for row in saved] == [f"note {n}" for n in range(10)]
+    assert _stored(clean_db) == 10
+
+
+async def test_full_batches_flush_without_waiting_out_the_window(clean_db, async_engines):
+    writer = GroupCommitWriter(window_ms=10_000, max_batch=2)
+
+    await asyncio.wait_for(asyncio.gather(*(writer.insert(_row(n)) for n in range(5))), timeout=5)
+
+    assert writer.batches == 3
+    assert writer.largest_batch == 2
+    assert _stored(clean_db) == 5
+
+
+async def test_rejected_batch_falls_back_to_row_by_row(clean_db, async_engines):
+    writer = GroupCommitWriter(window_ms=50, max_batch=64)
+    rows = [_row(0), _row(1, interaction_type=None), _row(2)]
+
+    results = await asyncio.gather(*(writer.insert(row) for row in rows), return_exceptions=True)
+
+    assert writer.fallbacks == 1
+    assert isinstance(results[1], IntegrityError)
+    assert [result["notes"] for result in (results[0], results[2])] == ["note 0", "note 2"]
+    assert _stored(clean_db) == 2
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from app.ai.json_stream import IncrementalJSONParser, MalformedLLMOutput, parse_llm_json
+
+REPLY = {
+    "understanding": "Logged a call",
+    "extracted_data": {"hcp_name": "Dr. A \"Al\" Smith", "interaction_type": "Call", "samples": 3, "topics": ["x", "y"]},
+    "tools_to_call": [
+        {"name": "hcp_lookup", "input": {"search_term": "Smith, {A}"}},
+        {"name": "compliance_check", "input": {"text": "no [issues]"}},
+    ],
+    "response": "ok",
+}
+TEXT = "Here you go:\n```json\n" + json.dumps(REPLY, indent=2) + "\n```\nAnything else?"
+
+
+def _feed(chunks):
+    parser = IncrementalJSONParser()
+    events = [event for chunk in chunks for event in parser.feed(chunk)]
+    return parser, events
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64, len(TEXT)])
+def test_events_do_not_depend_on_chunking(size):
+    parser, events = _feed(TEXT[start:start + size] for start in range(0, len(TEXT), size))
+
+    assert events == [
+        ("field", "hcp_name", 'Dr. A "Al" Smith'),
+        ("field", "interaction_type", "Call"),
+        ("field", "samples", 3),
+        ("field", "topics", ["x", "y"]),
+        ("tool_call", 0, REPLY["tools_to_call"][0]),
+        ("tool_call", 1, REPLY["tools_to_call"][1]),
+    ]
+    assert parser.finish() == REPLY
+
+
+def test_tool_call_is_emitted_at_its_closing_brace():
+    parser = IncrementalJSONParser()
+    parser.feed('{"tools_to_call": [{"name": "hcp_lookup", "input": {"search_term": "A"}')
+
+    assert parser.feed("}") == [("tool_call", 0, {"name": "hcp_lookup", "input": {"search_term": "A"}})]
+    assert parser.feed(", ") == []
+
+
+def test_malformed_reply_keeps_entries_that_closed_before_the_error():
+    parsed, error = parse_llm_json(
+        '{"extracted_data": {"hcp_name": "Dr. B", "interaction_type": Visit}, '
+        '"tools_to_call": [{"name": "hcp_lookup", "input": {}}'
+    )
+
+    assert parsed == {
+        "extracted_data": {"hcp_name": "Dr. B"},
+        "tools_to_call": [{"name": "hcp_lookup", "input": {}}],
+    }
+    assert "truncated" in error
+
+
+@pytest.mark.parametrize("text, message", [
+    ("I could not find an interaction.", "no JSON object"),
+    ('{"extracted_data": {"hcp_name": "Dr. C"', "truncated"),
+    ('{"extracted_data": {"hcp_name": "Dr. C",}}', "invalid JSON"),
+])
+def test_finish_reports_what_was_wrong(text, message):
+    parser, _ = _feed([text])
+
+    with pytest.raises(MalformedLLMOutput, match=message):
+        parser.finish()
@@ -0,0 +1,57 @@
+import pytest
+
+from app.ai import llm_cache
+from app.ai.llm_cache import LLMResponseCache, make_cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the cache module"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LLMResponseCache(ttl_seconds=10)
+    cache.set("key", "reply")
+
+    clock[0] += 9.9
+    assert cache.get("key") == "reply"
+    clock[0] += 0.2
+    assert cache.get("key") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = LLMResponseCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # b is now the least recently used
+
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_persistent_tier_serves_a_new_instance(tmp_path, clock):
+    path = str(tmp_path / "llm_cache.db")
+    LLMResponseCache(ttl_seconds=10, persist_path=path).set("key", "reply")
+
+    cache = LLMResponseCache(ttl_seconds=10, persist_path=path)
+    assert cache.get("key") == "reply"
+    assert cache.stats()["persistent_hits"] == 1
+
+    clock[0] += 11
+    assert LLMResponseCache(ttl_seconds=10, persist_path=path).get("key") is None
+
+
+def test_cache_key_ignores_whitespace_but_not_content():
+    system = {"role": "system", "content": "Extract"}
+    key = make_cache_key("model", [system, {"role": "user", "content": "Met  Dr. A\n today"}])
+
+    assert key == make_cache_key("model", [system, {"role": "user", "content": "Met Dr. A today"}])
+    assert key != make_cache_key("model", [system, {"role": "user", "content": "Met Dr. B today"}])
+    assert key != make_cache_key("other-model", [system, {"role": "user", "content": "Met Dr. A today"}])
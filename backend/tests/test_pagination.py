@@ -0,0 +1,102 @@
+from datetime import date, datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+
+from app.models import Interaction, InteractionDaySpread
+from app.pagination import after_cursor, apply_filters, decode_cursor, encode_cursor, list_query
+
+PAGE_SIZE = 3
+
+
+def _insert(engine, rows):
+    with engine.begin() as connection:
+        connection.execute(insert(Interaction.__table__), [
+            # Same keys in every row: executemany takes its columns from the first
+            {"hcp_name": "Dr. Page", "interaction_type": "Call", "notes": "n", "date": None, **row} for row in rows
+        ])
+
+
+def _all_pages(engine, **filters):
+    """Ids of every page, following next_cursor the way the list route does"""
+    ids, cursor = [], None
+    with engine.connect() as connection:
+        while True:
+            query = list_query(("id", "created_at"), **filters)
+            if cursor:
+                query = after_cursor(query, cursor)
+            rows = connection.execute(query.limit(PAGE_SIZE + 1)).all()
+            ids.extend(row.id for row in rows[:PAGE_SIZE])
+            if len(rows) <= PAGE_SIZE:
+                return ids
+            cursor = encode_cursor(rows[PAGE_SIZE - 1])
+
+
+def _newest_first(engine, **filters):
+    with engine.connect() as connection:
+        rows = connection.execute(
+            apply_filters(
+                select(Interaction.id, Interaction.created_at),
+                filters.get("interaction_type"),
+                filters.get("date_from"),
+                filters.get("date_to")
+            )
+        ).all()
+    return [row.id for row in sorted(rows, key=lambda row: (row.created_at, row.id), reverse=True)]
+
+
+def test_cursor_pages_cover_every_row_once_across_created_at_ties(clean_db):
+    # Pairs of rows share a created_at, so page edges fall inside ties
+    _insert(clean_db, [{"created_at": datetime(2024, 1, 1, 10, 0, n // 2)} for n in range(8)])
+
+    ids = _all_pages(clean_db)
+
+    assert ids == _newest_first(clean_db)
+    assert len(ids) == 8
+
+
+def test_cursor_pages_keep_filters(clean_db):
+    _insert(clean_db, [
+        {"created_at": datetime(2024, 1, 1, 10, n), "interaction_type": "Visit" if n % 2 else "Call"}
+        for n in range(9)
+    ])
+
+    ids = _all_pages(clean_db, interaction_type="Visit")
+
+    assert ids == _newest_first(clean_db, interaction_type="Visit")
+    assert len(ids) == 4
+
+
+def test_cursor_round_trip():
+    row = Interaction(id=42, created_at=datetime(2024, 5, 6, 7, 8, 9))
+    assert decode_cursor(encode_cursor(row)) == (datetime(2024, 5, 6, 7, 8, 9), 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "bm90LWEtY3Vyc29y"])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as raised:
+        decode_cursor(cursor)
+    assert raised.value.status_code == 400
+
+
+def test_date_range_created_at_bounds_keep_backdated_and_future_dated_rows(clean_db):
+    _insert(clean_db, [
+        {"created_at": datetime(2024, 3, 3, 9)},                           # logged in range
+        {"created_at": datetime(2024, 3, 20, 9), "date": date(2024, 3, 2)},  # backdated into range
+        {"created_at": datetime(2024, 2, 26, 9), "date": date(2024, 3, 4)},  # future-dated into range
+        {"created_at": datetime(2024, 3, 4, 9), "date": date(2024, 2, 1)},   # logged in range, dated before it
+        {"created_at": datetime(2024, 3, 9, 9)},                           # outside
+    ])
+    with clean_db.connect() as connection:
+        spread = connection.execute(
+            select(InteractionDaySpread.days_before, InteractionDaySpread.days_after)
+        ).one()
+    filters = {"date_from": date(2024, 3, 1), "date_to": date(2024, 3, 5)}
+
+    with clean_db.connect() as connection:
+        ids = [row.id for row in connection.execute(list_query(("id", "created_at"), False, tuple(spread), **filters))]
+
+    assert tuple(spread) == (32, 7)
+    assert ids == _newest_first(clean_db, **filters)
+    assert len(ids) == 3
@@ -0,0 +1,44 @@
+import asyncio
+import time
+
+import pytest
+
+from app.ai.scheduler import TokenBucket
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_waiters_are_served_in_arrival_order():
+    bucket = TokenBucket(per_minute=60_000)  # refills 1000 tokens/s
+    await bucket.acquire(60_000)
+    served = []
+
+    async def take(name, amount):
+        await bucket.acquire(amount)
+        served.append(name)
+
+    # The small later requests must not overtake the large first one
+    tasks = [asyncio.create_task(take(name, amount)) for name, amount in (("large", 300), ("medium", 100), ("small", 10))]
+    await asyncio.wait_for(asyncio.gather(*tasks), timeout=5)
+
+    assert served == ["large", "medium", "small"]
+
+
+async def test_debt_from_adjust_delays_the_next_caller():
+    bucket = TokenBucket(per_minute=60_000)
+    await bucket.acquire(60_000)
+    await asyncio.sleep(0.1)
+    bucket.adjust(100)  # the call cost ~100 tokens more than reserved
+
+    started = time.monotonic()
+    await bucket.acquire(50)
+
+    assert time.monotonic() - started >= 0.04
+
+
+async def test_requests_larger_than_the_bucket_are_capped():
+    bucket = TokenBucket(per_minute=600)
+
+    await asyncio.wait_for(bucket.acquire(10_000), timeout=1)
+
+    assert bucket.tokens < 1
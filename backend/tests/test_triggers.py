@@ -0,0 +1,94 @@
+from datetime import date, datetime
+
+from sqlalchemy import delete, func, insert, select, text, update
+
+from app.models import Interaction, InteractionDaySpread, TableRowCount, TableVersion, rebuild_interaction_rollups
+
+
+def _counters(engine):
+    """(trigger row count, COUNT(*), table version)"""
+    with engine.connect() as connection:
+        return (
+            connection.execute(select(TableRowCount.row_count).where(TableRowCount.table_name == "interactions")).scalar(),
+            connection.execute(select(func.count()).select_from(Interaction)).scalar(),
+            connection.execute(select(TableVersion.version).where(TableVersion.table_name == "interactions")).scalar(),
+        )
+
+
+def _rollups(connection):
+    rows = connection.execute(text("SELECT dimension, bucket, interaction_count FROM interaction_rollups"))
+    return {(dimension, bucket): count for dimension, bucket, count in rows if count}
+
+
+def _assert_rollups_match_rebuild(engine):
+    """Trigger-kept rollups equal a full recompute (rolled back afterwards)"""
+    with engine.connect() as connection:
+        live = _rollups(connection)
+        rebuild_interaction_rollups(connection)
+        rebuilt = _rollups(connection)
+        connection.rollback()
+    assert live == rebuilt
+    return live
+
+
+def test_counters_and_rollups_follow_insert_update_delete(clean_db):
+    row_count, total, version = _counters(clean_db)
+    assert row_count == total == 0
+
+    with clean_db.begin() as connection:
+        connection.execute(insert(Interaction.__table__), [
+            {"hcp_name": "Dr. A", "interaction_type": "Call", "hcp_sentiment": "Positive",
+             "date": None, "created_at": datetime(2024, 1, 3, 9)},
+            {"hcp_name": "Dr. B", "interaction_type": "Visit", "hcp_sentiment": None,
+             "date": date(2024, 1, 1), "created_at": datetime(2024, 1, 9, 9)},
+            {"hcp_name": "Dr. A", "interaction_type": "Visit", "hcp_sentiment": "Negative",
+             "date": None, "created_at": datetime(2024, 1, 9, 10)},
+        ])
+    row_count, total, inserted_version = _counters(clean_db)
+    assert row_count == total == 3
+    assert inserted_version == version + 3
+    rollups = _assert_rollups_match_rebuild(clean_db)
+    assert rollups[("interaction_type", "Visit")] == 2
+    assert rollups[("day", "2024-01-01")] == 1
+    assert rollups[("week", "2024-01-08")] == 1
+    assert rollups[("hcp_sentiment", "Unspecified")] == 1
+
+    with clean_db.begin() as connection:
+        connection.execute(
+            update(Interaction.__table__)
+            .where(Interaction.hcp_name == "Dr. A")
+            .values(hcp_sentiment="Neutral", date=date(2023, 12, 31))
+        )
+    row_count, total, updated_version = _counters(clean_db)
+    assert row_count == total == 3
+    assert updated_version == inserted_version + 2
+    rollups = _assert_rollups_match_rebuild(clean_db)
+    assert rollups[("hcp_sentiment", "Neutral")] == 2
+    assert rollups[("day", "2023-12-31")] == 2
+
+    with clean_db.begin() as connection:
+        connection.execute(delete(Interaction.__table__).where(Interaction.interaction_type == "Visit"))
+    row_count, total, deleted_version = _counters(clean_db)
+    assert row_count == total == 1
+    assert deleted_version == updated_version + 2
+    assert _assert_rollups_match_rebuild(clean_db)[("interaction_type", "Call")] == 1
+
+
+def test_day_spread_widens_and_never_narrows(clean_db):
+    with clean_db.begin() as connection:
+        connection.execute(insert(Interaction.__table__), [
+            {"hcp_name": "Dr. S", "interaction_type": "Call", "date": date(2024, 5, 1), "created_at": datetime(2024, 5, 11, 8)},
+            {"hcp_name": "Dr. S", "interaction_type": "Call", "date": date(2024, 5, 4), "created_at": datetime(2024, 5, 2, 8)},
+        ])
+        connection.execute(
+            update(Interaction.__table__)
+            .where(Interaction.date == date(2024, 5, 4))
+            .values(date=date(2024, 5, 7))
+        )
+        connection.execute(delete(Interaction.__table__))
+
+    with clean_db.connect() as connection:
+        spread = connection.execute(
+            select(InteractionDaySpread.days_before, InteractionDaySpread.days_after)
+        ).one()
+    assert tuple(spread) == (10, 5)
@@ -17,7 +17,7 @@ const InteractionList = ({ refreshTrigger, isDrawer = false }) => {
     setErrorMessage("");
 
     try {
-      const response = await fetchInteractions(100, 0);
+      const response = await fetchInteractions(100, 0, "summary");
       const allInteractions = response.interactions || [];
       
       // Aggregate interactions: keep only latest per HCP name
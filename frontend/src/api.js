@@ -40,12 +40,23 @@ export const createInteraction = async (interactionData) => {
  * Fetch all HCP interactions
  * @param {number} limit - Number of records to fetch (default 50)
  * @param {number} offset - Number of records to skip (default 0)
+ * @param {string} [fields] - "summary" or comma-separated columns (notes come back as a preview)
+ * @param {Object} [filters] - Server-side filters: hcp_id, hcp_name, interaction_type, hcp_sentiment, date_from, date_to
  * @returns {Promise<Object>} List of interactions with count
  */
-export const fetchInteractions = async (limit = 50, offset = 0) => {
+export const fetchInteractions = async (limit = 50, offset = 0, fields, filters = {}) => {
   try {
+    const params = new URLSearchParams({ limit, offset });
+    if (fields) {
+      params.set("fields", fields);
+    }
+    Object.entries(filters).forEach(([name, value]) => {
+      if (value !== undefined && value !== null && value !== "") {
+        params.set(name, value);
+      }
+    });
     const response = await fetch(
-      `${API_BASE_URL}/interactions?limit=${limit}&offset=${offset}`,
+      `${API_BASE_URL}/interactions?${params.toString()}`,
       {
         method: "GET",
         headers: {